@@ -0,0 +1,184 @@
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+import puremvc.core
+import puremvc.patterns.command
+import puremvc.patterns.observer
+
+class BenchCommand(puremvc.patterns.command.SimpleCommand):
+
+    instances = 0
+
+    def __init__(self):
+        puremvc.patterns.command.SimpleCommand.__init__(self)
+        BenchCommand.instances += 1
+
+    def execute(self, notification):
+        pass
+
+class BenchStatelessCommand(BenchCommand):
+    stateless = True
+
+class BenchPooledCommand(BenchCommand):
+    poolSize = 4
+
+class BenchMacroCommand(puremvc.patterns.command.MacroCommand):
+
+    cachePlan = True
+
+    def __init__(self):
+        puremvc.patterns.command.MacroCommand.__init__(self)
+        BenchCommand.instances += 1
+
+    def initializeMacroCommand(self):
+        for i in range(5):
+            self.addSubCommand(BenchStatelessCommand)
+
+class BenchStatelessMacroCommand(BenchMacroCommand):
+    stateless = True
+
+def benchCommandPooling():
+    """Controller: executeCommand() with a new instance per notification vs stateless vs pooled commands"""
+    controller = puremvc.core.Controller.getInstance()
+    note = puremvc.patterns.observer.Notification('bench.pooling')
+
+    for label, commandClassRef in (('new', BenchCommand),
+                                   ('stateless', BenchStatelessCommand),
+                                   ('pooled', BenchPooledCommand),
+                                   ('macro new', BenchMacroCommand),
+                                   ('macro stateless', BenchStatelessMacroCommand)):
+        controller.registerCommand('bench.pooling', commandClassRef)
+        controller.executeCommand(note)
+
+        # command objects constructed (MacroCommand sub-commands included)
+        number = 10000
+        BenchCommand.instances = 0
+        for i in range(number):
+            controller.executeCommand(note)
+        instances = BenchCommand.instances
+
+        # bytes allocated, and freed again, while executing one notification
+        tracemalloc.start()
+        peak = 0
+        for i in range(100):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            controller.executeCommand(note)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+        tracemalloc.stop()
+
+        best = min(timeit.repeat(lambda: controller.executeCommand(note), number=number, repeat=5))
+        print("  %-16s %6d commands per %d notes %6d peak bytes %8.3f us per note" %
+              (label, instances, number, peak, best / number * 1e6))
+        controller.removeCommand('bench.pooling')
+
+class BenchLeafCommand(puremvc.patterns.command.SimpleCommand):
+    def execute(self, notification):
+        pass
+
+class BenchInnerMacroCommand(puremvc.patterns.command.MacroCommand):
+
+    cachePlan = True
+
+    def initializeMacroCommand(self):
+        for i in range(4):
+            self.addSubCommand(BenchLeafCommand)
+
+class BenchMiddleMacroCommand(puremvc.patterns.command.MacroCommand):
+
+    cachePlan = True
+
+    def initializeMacroCommand(self):
+        for i in range(3):
+            self.addSubCommand(BenchInnerMacroCommand)
+
+class BenchOuterMacroCommand(puremvc.patterns.command.MacroCommand):
+
+    cachePlan = True
+
+    def initializeMacroCommand(self):
+        for i in range(3):
+            self.addSubCommand(BenchMiddleMacroCommand)
+
+def benchMacroCommand():
+    """Controller: executeCommand() for a 3-level MacroCommand tree with 36 leaf commands"""
+    controller = puremvc.core.Controller.getInstance()
+    controller.registerCommand('bench.macro', BenchOuterMacroCommand)
+    note = puremvc.patterns.observer.Notification('bench.macro')
+
+    number = 2000
+    best = min(timeit.repeat(lambda: controller.executeCommand(note), number=number, repeat=5))
+    print("  %8.2f us per executeCommand" % (best / number * 1e6))
+    controller.removeCommand('bench.macro')
+
+def benchCommandChain():
+    """Controller: notifyObservers() for 5 stateless commands, as a MacroCommand vs added to the same name"""
+    controller = puremvc.core.Controller.getInstance()
+    controller.registerCommand('bench.chain.macro', BenchStatelessMacroCommand)
+    controller.addCommand('bench.chain.added', BenchStatelessCommand)
+    for i in range(4):
+        controller.addCommand('bench.chain.added', type('BenchChainCommand%d' % i, (BenchStatelessCommand,), {}))
+    controller.registerCommand('bench.chain.single', BenchStatelessCommand)
+
+    number = 20000
+    for label, name in (("single command", 'bench.chain.single'), ("MacroCommand", 'bench.chain.macro'),
+                        ("addCommand x5", 'bench.chain.added')):
+        note = puremvc.patterns.observer.Notification(name)
+        best = min(timeit.repeat(lambda: controller.view.notifyObservers(note), number=number, repeat=5))
+        print("  %-16s %6.2f us" % (label, best / number * 1e6))
+    for name in ('bench.chain.macro', 'bench.chain.added', 'bench.chain.single'):
+        controller.removeCommand(name)
+
+def benchLazyRegistration():
+    """Controller: startup registering 300 commands from their own modules, by class vs by import path"""
+    controller = puremvc.core.Controller.getInstance()
+    count = 300
+    directory = tempfile.mkdtemp()
+    package = os.path.join(directory, 'benchcommands')
+    os.mkdir(package)
+    open(os.path.join(package, '__init__.py'), 'w').close()
+    for i in range(count):
+        with open(os.path.join(package, 'command%d.py' % i), 'w') as module:
+            module.write("import puremvc.patterns.command\n\n"
+                         "class BenchCommand%d(puremvc.patterns.command.SimpleCommand):\n"
+                         "    def execute(self, note):\n"
+                         "        pass\n" % i)
+    sys.path.insert(0, directory)
+
+    def eager():
+        for i in range(count):
+            module = importlib.import_module('benchcommands.command%d' % i)
+            controller.registerCommand('bench.lazy.%d' % i, getattr(module, 'BenchCommand%d' % i))
+
+    def lazy():
+        for i in range(count):
+            controller.registerCommand('bench.lazy.%d' % i, 'benchcommands.command%d:BenchCommand%d' % (i, i))
+
+    try:
+        for label, startup in (('by class', eager), ('by import path', lazy)):
+            times = []
+            for run in range(5):
+                for name in [name for name in sys.modules if name.startswith('benchcommands.')]:
+                    del sys.modules[name]
+                start = time.perf_counter()
+                startup()
+                times.append(time.perf_counter() - start)
+                for i in range(count):
+                    controller.removeCommand('bench.lazy.%d' % i)
+            print("  %-15s %8.2f ms" % (label, min(times) * 1e3))
+
+        controller.registerCommand('bench.lazy.0', 'benchcommands.command0:BenchCommand0')
+        note = puremvc.patterns.observer.Notification('bench.lazy.0')
+        start = time.perf_counter()
+        controller.executeCommand(note)
+        print("  first executeCommand by import path %8.3f ms" % ((time.perf_counter() - start) * 1e3))
+        controller.removeCommand('bench.lazy.0')
+    finally:
+        sys.path.remove(directory)
+        shutil.rmtree(directory)
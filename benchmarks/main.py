@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+# Add src folder to Python search paths
+import sys
+
+sys.path.insert(1, "src")
+
+# Normal imports
+import controller
+import proxy
+import view
+
+
+if __name__ == '__main__':
+    # List of benchmarks to run
+    benchmarks = (view.benchRemoveMediator,
+                  view.benchDispatch,
+                  view.benchWildcardDispatch,
+                  controller.benchCommandPooling,
+                  controller.benchMacroCommand,
+                  controller.benchCommandChain,
+                  controller.benchLazyRegistration,
+                  proxy.benchColumnarQuery,
+                  proxy.benchIndexedLookup)
+
+    for benchmark in benchmarks:
+        print(benchmark.__doc__)
+        benchmark()
+        print("")
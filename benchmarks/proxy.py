@@ -0,0 +1,82 @@
+import random
+import time
+
+import puremvc.patterns.proxy
+
+def timeBest(function, repeat=3):
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def benchColumnarQuery():
+    """Proxy: queries over 1M records, list of dicts in Python loops vs ColumnarProxy"""
+    if puremvc.patterns.proxy.numpy is None:
+        print("  skipped: NumPy is not installed")
+        return
+
+    size = 1000000
+    generator = random.Random(42)
+    regions = ('north', 'south', 'east', 'west')
+    records = [{'id': i, 'region': regions[generator.randrange(4)], 'price': generator.random() * 100}
+               for i in range(size)]
+
+    start = time.perf_counter()
+    prxy = puremvc.patterns.proxy.ColumnarProxy('BenchColumnarProxy', records)
+    print("  building columns from the list        %8.1f ms" % ((time.perf_counter() - start) * 1e3))
+
+    def listFilter():
+        return [record for record in records if record['region'] == 'east' and record['price'] > 50]
+
+    def listGroupBy():
+        totals = {}
+        for record in records:
+            totals[record['region']] = totals.get(record['region'], 0.0) + record['price']
+        return totals
+
+    def listTopK():
+        return sorted(records, key=lambda record: record['price'], reverse=True)[:10]
+
+    cases = (
+        ("filter", listFilter, lambda: prxy.query(where=[('region', '==', 'east'), ('price', '>', 50)])),
+        ("group-by sum", listGroupBy, lambda: prxy.aggregate('region', {'total': ('price', 'sum')})),
+        ("top-10", listTopK, lambda: prxy.topK('price', 10)),
+    )
+    for label, listQuery, columnarQuery in cases:
+        listTime = timeBest(listQuery)
+        columnarTime = timeBest(columnarQuery)
+        print("  %-14s list %8.1f ms   columnar %7.1f ms   x%.0f" % (
+            label, listTime * 1e3, columnarTime * 1e3, listTime / columnarTime))
+
+class BenchIndexedProxy(puremvc.patterns.proxy.IndexedProxy):
+
+    hashIndexes = ('customer',)
+    sortedIndexes = ('price',)
+
+def benchIndexedLookup():
+    """Proxy: lookups in 100k records, linear scan vs IndexedProxy"""
+    size = 100000
+    generator = random.Random(42)
+    records = [{'id': i, 'customer': generator.randrange(10000), 'price': generator.random() * 100}
+               for i in range(size)]
+    prxy = BenchIndexedProxy('BenchIndexedProxy', records)
+
+    cases = (
+        ("equality", lambda: [record for record in records if record['customer'] == 42],
+         lambda: prxy.find('customer', 42)),
+        ("range", lambda: [record for record in records if 50 <= record['price'] <= 50.1],
+         lambda: prxy.findRange('price', 50, 50.1)),
+    )
+    for label, scan, lookup in cases:
+        scanTime = timeBest(scan)
+        lookupTime = timeBest(lookup)
+        print("  %-10s scan %8.3f ms   indexed %7.3f ms" % (label, scanTime * 1e3, lookupTime * 1e3))
+
+    number = 10000
+    start = time.perf_counter()
+    for i in range(number):
+        prxy.update(i, {'price': i % 100})
+    print("  update of an indexed field       %7.2f us" % ((time.perf_counter() - start) / number * 1e6))
@@ -0,0 +1,83 @@
+import timeit
+
+import puremvc.core
+import puremvc.patterns.command
+import puremvc.patterns.facade
+import puremvc.patterns.mediator
+import puremvc.patterns.observer
+
+class BenchMediator(puremvc.patterns.mediator.Mediator):
+
+    NAME = 'BenchMediator'
+
+    def __init__(self, interests, mediatorName=None):
+        puremvc.patterns.mediator.Mediator.__init__(self, mediatorName or BenchMediator.NAME)
+        self.interests = interests
+
+    def listNotificationInterests(self):
+        return self.interests
+
+def benchRemoveMediator():
+    """View: registerMediator() + removeMediator() as the registry grows"""
+    view = puremvc.core.View.getInstance()
+    interests = ['bench.interest.%d' % i for i in range(5)]
+
+    for size in (100, 1000, 10000, 100000):
+        # unrelated names and observers; the Mediator's own lists stay the same size
+        contexts = [object() for i in range(size)]
+        for i, context in enumerate(contexts):
+            view.registerObserver('bench.filler.%d' % i, puremvc.patterns.observer.Observer(None, context))
+
+        def cycle():
+            view.registerMediator(BenchMediator(interests))
+            view.removeMediator(BenchMediator.NAME)
+
+        number = 1000
+        best = min(timeit.repeat(cycle, number=number, repeat=3))
+        print("  %7d names: %8.2f us per cycle" % (size, best / number * 1e6))
+
+        for i, context in enumerate(contexts):
+            view.removeObserver('bench.filler.%d' % i, context)
+
+class BenchCommand(puremvc.patterns.command.SimpleCommand):
+    def execute(self, notification):
+        pass
+
+def benchDispatch():
+    """View: Facade.sendNotification() overhead, interpreted vs compiled dispatch"""
+    fcde = puremvc.patterns.facade.Facade.getInstance()
+    view = puremvc.core.View.getInstance()
+
+    fcde.registerCommand('bench.command', BenchCommand)
+    for i in range(10):
+        fcde.registerMediator(BenchMediator(['bench.mediators'], 'BenchMediator%d' % i))
+
+    for label, compiled in (('interpreted', False), ('compiled', True)):
+        view.setCompiled(compiled)
+        for name, description in (('bench.command', '1 command'), ('bench.mediators', '10 mediators')):
+            number = 20000
+            best = min(timeit.repeat(lambda: fcde.sendNotification(name), number=number, repeat=5))
+            print("  %-12s %-13s %8.3f us per notification" % (label, description, best / number * 1e6))
+
+    view.setCompiled(False)
+    fcde.removeCommand('bench.command')
+    for i in range(10):
+        fcde.removeMediator('BenchMediator%d' % i)
+
+def benchWildcardDispatch():
+    """View: exact-match vs wildcard subscriptions for a family of 500 names"""
+    view = puremvc.core.View.getInstance()
+    names = ['order.event%d' % i for i in range(500)]
+    note = puremvc.patterns.observer.Notification('order.event250')
+
+    for label, interests in (('exact', names), ('wildcard', ['order.*'])):
+        number = 200
+        best = min(timeit.repeat(lambda: (view.registerMediator(BenchMediator(interests)),
+                                          view.removeMediator(BenchMediator.NAME)), number=number, repeat=3))
+        print("  %-9s registerMediator + removeMediator %8.2f us" % (label, best / number * 1e6))
+
+        view.registerMediator(BenchMediator(interests))
+        number = 100000
+        best = min(timeit.repeat(lambda: view.notifyObservers(note), number=number, repeat=5))
+        print("  %-9s notifyObservers                   %8.3f us" % (label, best / number * 1e6))
+        view.removeMediator(BenchMediator.NAME)
@@ -23,3 +23,8 @@ def docs():
 def test():
     'Run unit tests'
     local("python ./tests/main.py")
+
+
+def bench():
+    'Run benchmarks'
+    local("python ./benchmarks/main.py")
@@ -4,9 +4,24 @@
  Your reuse is governed by the Creative Commons Attribution 3.0 License
 """
 
+import asyncio
+import collections
+import concurrent.futures
+import heapq
+import importlib
+import inspect
+import itertools
+import json
+import logging
+import threading
+import time
+import tracemalloc
+
 import puremvc.interfaces
 import puremvc.patterns.observer
 
+logger = logging.getLogger(__name__)
+
 class Controller(puremvc.interfaces.IController):
     """
     A Singleton C{IController} implementation.
@@ -18,18 +33,47 @@ class Controller(puremvc.interfaces.IController):
     Remembering which C{ICommand}s
     are intended to handle which C{INotifications}.
 
-    Registering itself as an C{IObserver} with
-    the C{View} for each C{INotification}
-    that it has an C{ICommand} mapping for.
+    Installing a pre-bound command route with the C{View} for each
+    C{INotification} that it has an C{ICommand} mapping for (or, for
+    wildcard patterns, registering itself as an C{IObserver} bound to the pattern).
 
     Creating a new instance of the proper C{ICommand}
     to handle a given C{INotification} when notified by the C{View}.
+    C{ICommand} classes declaring themselves C{stateless} are
+    instantiated once and that instance is reused, and those with a
+    C{poolSize} are drawn from a pool of up to that many instances,
+    C{reset} after each use (see C{CommandPool}). The results of those
+    declaring C{memoize} are cached by C{INotification} (see
+    C{CommandMemo}).
+
+    C{ICommand} classes declaring C{runInProcess} are executed on the
+    process pool set with C{setProcessPool}, if any: the C{INotification}
+    is shipped to a worker process, and the value C{execute} returns
+    there comes back as the C{ICommand}'s C{resultNotification}.
 
     Calling the C{ICommand}'s C{execute}
     method, passing in the C{INotification}.
 
+    Keeping track of the executions of C{AsyncCommand}s in progress,
+    cancelling those taking longer than their C{timeout} (see
+    C{CommandWatchdog}) and sending their outcome once they complete.
+
+    Calling the execution hooks, if any, around each C{ICommand}'s
+    C{execute}, including the I{SubCommands} of C{MacroCommand}s (see
+    C{addExecutionHook} and C{CommandProfiler}).
+
     Your application must register C{ICommands} with the
-    Controller.
+    Controller. An C{ICommand} may be registered by the import path of
+    its class, C{"package.module:ClassName"}, in which case its module
+    is only imported when the C{ICommand} is first executed. Several
+    C{ICommand}s may handle the same C{INotification} when added with
+    C{addCommand}: they are kept in the C{commandMap} as a tuple,
+    ordered by priority, and executed in turn.
+
+    The C{Controller} may be used from several threads: C{executeCommand}
+    and C{hasCommand} read the C{commandMap} without locking, while
+    registering and removing C{ICommand}s is serialized by the
+    C{commandLock}.
 
     The simplest way is to subclass C{Facade},
     and use its C{initializeController} method to add your
@@ -42,18 +86,35 @@ class Controller(puremvc.interfaces.IController):
     @see: L{MacroCommand<puremvc.patterns.command.MacroCommand>}
     """
     instance = None
+    instanceLock = threading.RLock()
+    initialized = False
     view = None
     commandMap = None
+    commandLock = None
+    commandPools = None
+    commandPriorities = None
+    processPool = None
+    processNotifyMethod = None
+    executionHooks = None
+    pendingCommands = None
+    pendingLock = None
+    watchdog = None
 
     def __new__(cls, *args, **kwargs):
         """
         This C{IController} implementation is a Singleton, so you should not call the constructor
         directly, but instead call the static Singleton method C{Controller.getInstance()}
         """
-        if not cls.instance or not isinstance(cls.instance, cls):
-            cls.instance = super(Controller, cls).__new__(cls, *args, **kwargs)
-            cls.instance.initializeController()
-        return cls.instance
+        instance = cls.instance
+        if instance is not None and isinstance(instance, cls) and instance.initialized:
+            return instance
+
+        with cls.instanceLock:
+            if not cls.instance or not isinstance(cls.instance, cls):
+                cls.instance = super(Controller, cls).__new__(cls, *args, **kwargs)
+                cls.instance.initializeController()
+                cls.instance.initialized = True
+            return cls.instance
 
     @staticmethod
     def getInstance():
@@ -74,21 +135,187 @@ class Controller(puremvc.interfaces.IController):
         in your application, you will need to initialize the view property
         """
         self.view = View.getInstance()
-        self.commandMap = {}
+        self.initializeCommandState()
+
+    def initializeCommandState(self):
+        """
+        Initialize the C{ICommand} registrations and executions, leaving the view property alone.
 
-    def executeCommand(self, note):
+        Called by C{initializeController}.
+        """
+        self.commandMap = {}
+        self.commandLock = threading.RLock()
+        self.commandPools = {}
+        self.commandPriorities = {}
+        self.pendingCommands = {}
+        self.pendingLock = threading.Lock()
+        self.watchdog = CommandWatchdog()
+
+    def executeCommand(self, note, notificationName=None):
         """
         If an C{ICommand} has previously been registered
         to handle a the given C{INotification}, then it is executed.
 
         @param note: an C{INotification}
+        @param notificationName: the name, or wildcard pattern, the C{ICommand} is registered for; the C{INotification}'s name by default (optional)
+        @return: for a C{memoize} or C{runInProcess} C{ICommand}, its result (or the C{Future} of it), otherwise
+            C{None}; for several C{ICommand}s, the list of their results
+        """
+        if notificationName is None:
+            notificationName = note.getName()
+        commandClassRef = self.commandMap.get(notificationName)
+        if commandClassRef is None:
+            return
+        if commandClassRef.__class__ is str:
+            commandClassRef = self.resolveCommand(notificationName)
+        elif commandClassRef.__class__ is tuple:
+            return self.executeCommandChain(commandClassRef, note, notificationName)
+
+        hooks = self.executionHooks
+        if hooks is not None:
+            return executeWithHooks(hooks, commandClassRef, note,
+                                    lambda note: self.executeCommandClass(commandClassRef, note))
+        return self.executeCommandClass(commandClassRef, note)
+
+    def executeCommandChain(self, commandClassRefs, note, notificationName=None):
+        """
+        Execute the C{ICommand}s added for the same C{INotification} name, in turn.
+
+        @param commandClassRefs: the tuple of C{ICommand} classes, or import paths
+        @param note: an C{INotification}
+        @param notificationName: the name, or wildcard pattern, the C{ICommand}s are registered for; the C{INotification}'s name by default (optional)
+        @return: the list of their results
+        """
+        for commandClassRef in commandClassRefs:
+            if commandClassRef.__class__ is str:
+                commandClassRefs = self.resolveCommand(note.getName() if notificationName is None else notificationName)
+                break
+
+        hooks = self.executionHooks
+        if hooks is None:
+            return [self.executeCommandClass(commandClassRef, note) for commandClassRef in commandClassRefs]
+        return [executeWithHooks(hooks, commandClassRef, note,
+                                 lambda note, commandClassRef=commandClassRef: self.executeCommandClass(commandClassRef, note))
+                for commandClassRef in commandClassRefs]
+
+    def executeCommandClass(self, commandClassRef, note):
+        """
+        Execute an C{ICommand} class, drawing the instance from its C{CommandPool} if it has one.
+
+        @param commandClassRef: the C{Class} of the C{ICommand}
+        @param note: an C{INotification}
+        @return: for a C{memoize} or C{runInProcess} C{ICommand}, its result (or the C{Future} of it), otherwise C{None}
+        """
+        pool = self.commandPools.get(commandClassRef)
+        if pool is None:
+            commandClassRef().execute(note)
+            return
+
+        if pool.asyncCommand:
+            return self.executeAsyncCommand(pool, note)
+
+        if pool.memo is not None:
+            return self.executeMemoized(pool, note)
+
+        if pool.runInProcess:
+            return self.executeInProcess(pool, note)
+
+        commandInstance = pool.acquire()
+        try:
+            commandInstance.execute(note)
+        finally:
+            pool.release(commandInstance)
+
+    def executeCommandBatch(self, notes, notificationName=None):
+        """
+        Execute the C{ICommand} registered for a batch of C{INotification}s sharing the same name.
+
+        If the C{ICommand} class has an C{executeBatch} method (see
+        C{SimpleCommand.executeBatch}) one instance is created and handed
+        the whole batch; otherwise each C{INotification} is handed to
+        C{executeCommand} in turn.
+
+        @param notes: the list of C{INotification}s
+        @param notificationName: the name, or wildcard pattern, the C{ICommand} is registered for; the C{INotification}s' name by default (optional)
         """
-        commandClassRef = self.commandMap.get(note.getName())
+        if notificationName is None:
+            notificationName = notes[0].getName()
+        commandClassRef = self.commandMap.get(notificationName)
         if commandClassRef is None:
             return
+        if commandClassRef.__class__ is str:
+            commandClassRef = self.resolveCommand(notificationName)
+
+        pool = self.commandPools.get(commandClassRef)
+        if commandClassRef.__class__ is tuple or \
+                getattr(commandClassRef, 'executeBatch', None) is None or self.executionHooks is not None or \
+                (pool is not None and (pool.runInProcess or pool.memo is not None or pool.asyncCommand)):
+            for note in notes:
+                self.executeCommand(note, notificationName)
+            return
+
+        if pool is None:
+            commandClassRef().executeBatch(notes)
+            return
+
+        commandInstance = pool.acquire()
+        try:
+            commandInstance.executeBatch(notes)
+        finally:
+            pool.release(commandInstance)
+
+    def compileCommand(self, notificationName):
+        """
+        Build the dispatch callable for the C{ICommand} registered for a
+        particular C{INotification} name.
 
-        commandInstance = commandClassRef()
-        commandInstance.execute(note)
+        Used by a compiled C{View} in place of C{executeCommand}: the
+        C{ICommand} class is looked up once, when the plan is built,
+        instead of on every notification. For several C{ICommand}s, it
+        calls the callable of each in turn. While execution hooks are
+        installed, it is C{executeCommand} itself.
+
+        @param notificationName: the name of the C{INotification}
+        @return: a callable taking the C{INotification} to execute the C{ICommand}s with
+        """
+        commandClassRef = self.commandMap.get(notificationName)
+        if commandClassRef is None or commandClassRef.__class__ is str or self.executionHooks is not None:
+            return self.executeCommand
+        if commandClassRef.__class__ is not tuple:
+            return self.compileCommandClass(commandClassRef)
+        if str in [registered.__class__ for registered in commandClassRef]:
+            return self.executeCommand
+
+        executes = tuple(self.compileCommandClass(registered) for registered in commandClassRef)
+        def execute(note):
+            for executeOne in executes:
+                executeOne(note)
+        return execute
+
+    def compileCommandClass(self, commandClassRef):
+        """
+        Build the dispatch callable for an C{ICommand} class.
+
+        @param commandClassRef: the C{Class} of the C{ICommand}
+        @return: a callable taking the C{INotification} to execute the C{ICommand} with
+        """
+        pool = self.commandPools.get(commandClassRef)
+        if pool is None:
+            def execute(note):
+                commandClassRef().execute(note)
+        elif pool.runInProcess or pool.memo is not None or pool.asyncCommand:
+            def execute(note):
+                return self.executeCommandClass(commandClassRef, note)
+        elif pool.shared is not None:
+            execute = pool.shared.execute
+        else:
+            def execute(note):
+                commandInstance = pool.acquire()
+                try:
+                    commandInstance.execute(note)
+                finally:
+                    pool.release(commandInstance)
+        return execute
 
     def registerCommand(self, notificationName, commandClassRef):
         """
@@ -97,18 +324,225 @@ class Controller(puremvc.interfaces.IController):
 
         If an C{ICommand} has already been registered to
         handle C{INotification}s with this name, it is no longer
-        used, the new C{ICommand} is used instead.
+        used, the new C{ICommand} is used instead; so are those added
+        with C{addCommand}. Their C{CommandPool}s are dropped, unless
+        they are still registered for other names.
 
         The Observer for the new ICommand is only created if this the
         first time an ICommand has been registered for this Notification name.
 
         @param notificationName: the name of the C{INotification}
+        @param commandClassRef: the C{Class} of the C{ICommand}, or its C{"package.module:ClassName"} import path
+        @raise ValueError: if the import path is malformed, or the C{ICommand} is an C{AsyncCommand} declaring C{memoize}
+        """
+        if commandClassRef.__class__ is str and not commandClassRef.partition(':')[2]:
+            raise ValueError("Command import path %r is not of the form 'package.module:ClassName'" % commandClassRef)
+
+        with self.commandLock:
+            if commandClassRef.__class__ is not str:
+                self.registerCommandPool(commandClassRef)
+
+            entries = self.getCommandEntries(notificationName)
+            self.commandMap[notificationName] = commandClassRef
+            self.commandPriorities.pop(notificationName, None)
+            self.installCommand(notificationName, len(entries) > 0)
+            for priority, replaced in entries:
+                if replaced != commandClassRef:
+                    self.removeCommandPool(replaced)
+
+    def addCommand(self, notificationName, commandClassRef, priority=0):
+        """
+        Add a particular C{ICommand} class to the handlers of a particular C{INotification}.
+
+        Unlike C{registerCommand}, the C{ICommand}s already registered
+        or added for the name are kept: they are executed in order of
+        decreasing priority, those of the same priority in the order
+        they were added (one registered with C{registerCommand} has
+        priority 0). The order is computed here, once, not on each
+        C{INotification}. Adding an C{ICommand} class again only
+        changes its priority.
+
+        @param notificationName: the name of the C{INotification}
+        @param commandClassRef: the C{Class} of the C{ICommand}, or its C{"package.module:ClassName"} import path
+        @param priority: the priority of the C{ICommand} (optional)
+        @raise ValueError: if the import path is malformed, or the C{ICommand} is an C{AsyncCommand} declaring C{memoize}
+        """
+        if commandClassRef.__class__ is str and not commandClassRef.partition(':')[2]:
+            raise ValueError("Command import path %r is not of the form 'package.module:ClassName'" % commandClassRef)
+
+        with self.commandLock:
+            if commandClassRef.__class__ is not str:
+                self.registerCommandPool(commandClassRef)
+
+            registered = self.commandMap.get(notificationName)
+            entries = self.getCommandEntries(notificationName)
+            entries = tuple(entry for entry in entries if entry[1] != commandClassRef)
+            index = 0
+            while index < len(entries) and entries[index][0] >= priority:
+                index += 1
+            self.setCommandEntries(notificationName, entries[:index] + ((priority, commandClassRef),) + entries[index:])
+            self.installCommand(notificationName, registered is not None)
+
+    def getCommandEntries(self, notificationName):
+        """
+        Get the C{ICommand}s registered for a name, with their priority.
+
+        @param notificationName: the name of the C{INotification}
+        @return: the tuple of C{(priority, commandClassRef)} pairs, in execution order
+        """
+        entries = self.commandPriorities.get(notificationName)
+        if entries is not None:
+            return entries
+        registered = self.commandMap.get(notificationName)
+        if registered is None:
+            return ()
+        return tuple((0, commandClassRef) for commandClassRef in (registered if registered.__class__ is tuple else (registered,)))
+
+    def setCommandEntries(self, notificationName, entries):
+        """
+        Store the C{ICommand}s registered for a name, a single one as is and several as a tuple.
+
+        The caller must hold the C{commandLock}.
+
+        @param notificationName: the name of the C{INotification}
+        @param entries: the non-empty tuple of C{(priority, commandClassRef)} pairs, in execution order
+        """
+        self.commandPriorities[notificationName] = entries
+        if len(entries) == 1:
+            self.commandMap[notificationName] = entries[0][1]
+        else:
+            self.commandMap[notificationName] = tuple(commandClassRef for priority, commandClassRef in entries)
+
+    def installCommand(self, notificationName, registered):
+        """
+        Install, or rebuild, the way the C{View} reaches the C{ICommand}s registered for a name.
+
+        The caller must hold the C{commandLock}.
+
+        @param notificationName: the name of the C{INotification}
+        @param registered: whether C{ICommand}s were already registered for the name
+        """
+        if not self.view.isPattern(notificationName):
+            self.view.registerCommandRoute(notificationName, self.compileRoute(notificationName),
+                                           self, self.executeCommandBatch)
+        elif not registered:
+            self.view.registerObserver(notificationName, puremvc.patterns.observer.Observer(
+                lambda note: self.executeCommand(note, notificationName), self,
+                lambda notes: self.executeCommandBatch(notes, notificationName)))
+        else:
+            self.view.invalidateDispatchPlans()
+
+    def compileRoute(self, notificationName):
+        """
+        Build the command route the C{View} calls for a particular C{INotification} name.
+
+        The C{ICommand} class is bound into the route (see
+        C{compileCommand}), except while it is registered by import
+        path: the route then goes through C{executeCommand}, and is
+        rebuilt once the class is imported.
+
+        @param notificationName: the name of the C{INotification}
+        @return: a callable taking the C{INotification} to execute the C{ICommand} with
+        """
+        return self.compileCommand(notificationName)
+
+    def registerCommandPool(self, commandClassRef):
+        """
+        Create the C{CommandPool} of an C{ICommand} class, if it is stateless, pooled, run in a process, memoized or asynchronous.
+
+        The C{CommandMemo} of a memoized class is registered as an
+        C{IObserver} of the names invalidating it. The caller must hold
+        the C{commandLock}.
+
+        @param commandClassRef: the C{Class} of the C{ICommand}
+        """
+        if commandClassRef not in self.commandPools and \
+                (getattr(commandClassRef, 'stateless', False) or getattr(commandClassRef, 'poolSize', 0) or
+                 getattr(commandClassRef, 'runInProcess', False) or getattr(commandClassRef, 'memoize', False) or
+                 getattr(commandClassRef, 'asyncCommand', False)):
+            pool = CommandPool(commandClassRef)
+            if pool.memo is not None:
+                for notificationName in pool.memo.invalidatedBy:
+                    self.view.registerObserver(notificationName, puremvc.patterns.observer.Observer(pool.memo.invalidate, pool.memo))
+
+            commandPools = dict(self.commandPools)
+            commandPools[commandClassRef] = pool
+            self.commandPools = commandPools
+
+    def removeCommandPool(self, commandClassRef):
+        """
+        Drop the C{CommandPool} of an C{ICommand} class no longer registered for any name.
+
+        The caller must hold the C{commandLock}.
+
         @param commandClassRef: the C{Class} of the C{ICommand}
         """
-        if self.commandMap.get(notificationName) is None:
-            self.view.registerObserver(notificationName, puremvc.patterns.observer.Observer(self.executeCommand, self))
+        pool = self.commandPools.get(commandClassRef)
+        if pool is None:
+            return
+        for registered in self.commandMap.values():
+            if registered is commandClassRef or (registered.__class__ is tuple and commandClassRef in registered):
+                return
+
+        if pool.memo is not None:
+            for notificationName in pool.memo.invalidatedBy:
+                self.view.removeObserver(notificationName, pool.memo)
+
+        commandPools = dict(self.commandPools)
+        del commandPools[commandClassRef]
+        self.commandPools = commandPools
+
+    def resolveCommand(self, notificationName):
+        """
+        Import the C{ICommand} classes registered by import path for a notification name.
+
+        The classes replace the paths in the C{commandMap}, so they are
+        only imported once.
+
+        @param notificationName: the name of the C{INotification}
+        @return: the C{Class} of the C{ICommand}, or the tuple of them
+        @raise ImportError: if a module or class cannot be found
+        """
+        with self.commandLock:
+            registered = self.commandMap.get(notificationName)
+            if registered.__class__ is str:
+                resolved = self.importCommand(notificationName, registered)
+                self.commandMap[notificationName] = resolved
+                if notificationName in self.commandPriorities:
+                    self.commandPriorities[notificationName] = ((self.commandPriorities[notificationName][0][0], resolved),)
+            elif registered.__class__ is tuple and str in [commandClassRef.__class__ for commandClassRef in registered]:
+                self.setCommandEntries(notificationName, tuple(
+                    (priority, self.importCommand(notificationName, commandClassRef) if commandClassRef.__class__ is str else commandClassRef)
+                    for priority, commandClassRef in self.getCommandEntries(notificationName)))
+            else:
+                return registered
+
+            if self.view.commandRoutes.get(notificationName) is not None:
+                self.view.registerCommandRoute(notificationName, self.compileRoute(notificationName),
+                                               self, self.executeCommandBatch)
+            return self.commandMap[notificationName]
+
+    def importCommand(self, notificationName, commandPath):
+        """
+        Import an C{ICommand} class by its import path, and create its C{CommandPool}.
 
-        self.commandMap[notificationName] = commandClassRef
+        The caller must hold the C{commandLock}.
+
+        @param notificationName: the name of the C{INotification} it is registered for
+        @param commandPath: the C{"package.module:ClassName"} import path
+        @return: the C{Class} of the C{ICommand}
+        @raise ImportError: if the module or class cannot be found
+        """
+        moduleName, separator, className = commandPath.partition(':')
+        try:
+            resolved = importlib.import_module(moduleName)
+            for attributeName in className.split('.'):
+                resolved = getattr(resolved, attributeName)
+        except AttributeError:
+            raise ImportError("Cannot import command %r registered for %r" % (commandPath, notificationName))
+
+        self.registerCommandPool(resolved)
+        return resolved
 
     def hasCommand(self, notificationName):
         """
@@ -119,15 +553,424 @@ class Controller(puremvc.interfaces.IController):
         """
         return self.commandMap.get(notificationName) is not None
 
-    def removeCommand(self, notificationName):
+    def removeCommand(self, notificationName, commandClassRef=None):
         """
         Remove a previously registered C{ICommand} to C{INotification} mapping.
 
         @param notificationName: the name of the C{INotification} to remove the C{ICommand} mapping for
+        @param commandClassRef: the C{ICommand} class (or import path) to remove of those added for the name; all of them by default (optional)
         """
-        if self.hasCommand(notificationName):
-            self.view.removeObserver(notificationName, self)
+        with self.commandLock:
+            if not self.hasCommand(notificationName):
+                return
+
+            entries = self.getCommandEntries(notificationName)
+            if commandClassRef is not None:
+                remaining = tuple(entry for entry in entries if entry[1] != commandClassRef)
+                if len(remaining) == len(entries):
+                    return
+                if remaining:
+                    self.setCommandEntries(notificationName, remaining)
+                    self.installCommand(notificationName, True)
+                    self.removeCommandPool(commandClassRef)
+                    return
+
+            if self.view.isPattern(notificationName):
+                self.view.removeObserver(notificationName, self)
+            else:
+                self.view.removeCommandRoute(notificationName)
             del self.commandMap[notificationName]
+            self.commandPriorities.pop(notificationName, None)
+            for priority, removed in entries:
+                self.removeCommandPool(removed)
+
+    def addExecutionHook(self, hook):
+        """
+        Install an execution hook, called around the execution of every C{ICommand}.
+
+        The hook is an object with two methods:
+        C{beforeExecute(commandClassRef, notification)}, whose return
+        value is handed back as the C{token} to
+        C{afterExecute(commandClassRef, notification, token, error)},
+        called once C{execute} has returned or raised C{error} (else
+        C{None}). Hooks are called in the order they were added before,
+        and in reverse order after. The I{SubCommands} of
+        C{MacroCommand}s are executed within the hooks of their
+        C{MacroCommand}, so they can be told apart from it.
+
+        Without hooks, C{ICommand}s are executed through the routes
+        compiled for them and pay nothing for this; while any is
+        installed, through C{executeCommand}. The C{AsyncController}
+        does not call hooks.
+
+        @param hook: the execution hook
+        """
+        with self.commandLock:
+            self.executionHooks = (self.executionHooks or ()) + (hook,)
+            self.recompileRoutes()
+
+    def removeExecutionHook(self, hook):
+        """
+        Remove an execution hook installed with C{addExecutionHook}.
+
+        @param hook: the execution hook
+        """
+        with self.commandLock:
+            hooks = tuple(installed for installed in (self.executionHooks or ()) if installed is not hook)
+            self.executionHooks = hooks or None
+            self.recompileRoutes()
+
+    def recompileRoutes(self):
+        """
+        Rebuild the command route of every registered name, after the way C{ICommand}s are executed changed.
+
+        The caller must hold the C{commandLock}.
+        """
+        for notificationName in self.commandMap:
+            if not self.view.isPattern(notificationName):
+                self.view.registerCommandRoute(notificationName, self.compileRoute(notificationName),
+                                               self, self.executeCommandBatch)
+        self.view.invalidateDispatchPlans()
+
+    def getCommandPool(self, commandClassRef):
+        """
+        Get the C{CommandPool} a registered C{ICommand} class is drawn from.
+
+        @param commandClassRef: the C{Class} of the C{ICommand}
+        @return: the C{CommandPool}, or C{None} if the class is neither stateless nor pooled
+        """
+        return self.commandPools.get(commandClassRef)
+
+    def setProcessPool(self, executor, notifyMethod=None):
+        """
+        Set the executor to run C{runInProcess} C{ICommand}s on.
+
+        Usually a C{concurrent.futures.ProcessPoolExecutor}, so CPU-bound
+        C{ICommand}s escape the GIL. The C{ICommand} class, and the name,
+        body and type of the C{INotification}, must be picklable; so
+        must the value C{execute} returns. Result (and error)
+        C{INotification}s are sent from the thread completing the
+        future, with C{notifyMethod}; exceptions of C{ICommand}s without
+        an C{errorNotification} are logged to the C{puremvc.core} logger.
+
+        Without an executor, C{runInProcess} C{ICommand}s are executed
+        in this process, and their results sent right away; their
+        exceptions propagate to the caller.
+
+        @param executor: the C{concurrent.futures.Executor}, or C{None}
+        @param notifyMethod: the method to send result C{INotification}s with; the C{View}'s C{notifyObservers} by default
+        """
+        self.processPool = executor
+        self.processNotifyMethod = notifyMethod
+
+    def executeInProcess(self, pool, note):
+        """
+        Execute a C{runInProcess} C{ICommand}.
+
+        @param pool: the C{CommandPool} of the C{ICommand} class
+        @param note: an C{INotification}
+        @return: the C{Future} of the result when executed on the process pool, otherwise the result
+        """
+        executor = self.processPool
+        if executor is None:
+            commandInstance = pool.acquire()
+            try:
+                result = commandInstance.execute(note)
+            finally:
+                pool.release(commandInstance)
+            self.sendProcessResult(pool.commandClassRef, note, result, None)
+            return result
+
+        future = executor.submit(executeCommandInProcess, pool.commandClassRef,
+                                 note.getName(), note.getBody(), note.getType())
+        future.add_done_callback(lambda future: self.commandDone(pool.commandClassRef, note, future))
+        return future
+
+    def commandDone(self, commandClassRef, note, future):
+        """
+        Send the outcome of a C{runInProcess} C{ICommand} executed on the process pool, or of an C{AsyncCommand}.
+
+        Nothing is sent if the C{Future} was cancelled. An exception
+        the C{ICommand} has no C{errorNotification} for is logged, since
+        the C{Future} is usually dropped by whoever sent the
+        C{INotification}, and would otherwise go unnoticed.
+
+        @param commandClassRef: the C{Class} of the C{ICommand}
+        @param note: the C{INotification} it was executed with
+        @param future: the C{Future} of the result
+        """
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None and getattr(commandClassRef, 'errorNotification', None) is None:
+            logger.error("Command %s failed handling %r", commandClassRef.__name__, note.getName(), exc_info=error)
+            return
+        self.sendProcessResult(commandClassRef, note, None if error is not None else future.result(), error)
+
+    def executeMemoized(self, pool, note):
+        """
+        Execute a C{memoize} C{ICommand}, or reuse its cached result.
+
+        Either way, the result is sent as the C{ICommand}'s
+        C{resultNotification}, if set, so observers get it even when
+        C{execute} is skipped.
+
+        @param pool: the C{CommandPool} of the C{ICommand} class
+        @param note: an C{INotification}
+        @return: the result, or its C{Future} when executed on the process pool
+        """
+        memo = pool.memo
+        key = memo.makeKey(note)
+        hit, result = memo.lookup(key)
+        if hit:
+            self.sendProcessResult(pool.commandClassRef, note, result, None)
+            return result
+
+        generation = memo.generation
+        if pool.runInProcess:
+            result = self.executeInProcess(pool, note)
+            if isinstance(result, concurrent.futures.Future):
+                def storeResult(future):
+                    if not future.cancelled() and future.exception() is None:
+                        memo.store(key, future.result(), generation)
+                result.add_done_callback(storeResult)
+                return result
+        else:
+            commandInstance = pool.acquire()
+            try:
+                result = commandInstance.execute(note)
+            finally:
+                pool.release(commandInstance)
+            self.sendProcessResult(pool.commandClassRef, note, result, None)
+
+        memo.store(key, result, generation)
+        return result
+
+    def executeAsyncCommand(self, pool, note):
+        """
+        Execute an C{AsyncCommand}, keeping track of it until it completes.
+
+        @param pool: the C{CommandPool} of the C{ICommand} class
+        @param note: an C{INotification}
+        @return: the C{Future} of the result
+        """
+        commandInstance = pool.commandClassRef()
+        future = commandInstance.execute(note)
+        self.watchCommand(commandInstance, future)
+        future.add_done_callback(lambda future: self.commandDone(pool.commandClassRef, note, future))
+        return future
+
+    def watchCommand(self, commandInstance, future):
+        """
+        Keep track of an C{AsyncCommand} execution until its C{Future} is done.
+
+        If the C{AsyncCommand} has a C{timeout}, it is handed to the
+        C{watchdog}, which calls its C{expire} method once that many
+        seconds have elapsed.
+
+        @param commandInstance: the C{AsyncCommand}
+        @param future: the C{Future} its C{execute} returned
+        """
+        with self.pendingLock:
+            self.pendingCommands[commandInstance] = future
+        future.add_done_callback(lambda future: self.unwatchCommand(commandInstance))
+        timeout = getattr(commandInstance, 'timeout', None)
+        if timeout is not None and not future.done():
+            self.watchdog.watch(commandInstance, future, timeout)
+
+    def unwatchCommand(self, commandInstance):
+        """
+        Stop keeping track of a completed C{AsyncCommand} execution.
+
+        @param commandInstance: the C{AsyncCommand}
+        """
+        with self.pendingLock:
+            self.pendingCommands.pop(commandInstance, None)
+
+    def getPendingCommands(self, commandClassRef=None):
+        """
+        Get the C{AsyncCommand} executions in progress.
+
+        @param commandClassRef: the C{Class} of the C{AsyncCommand}s to get; all of them by default (optional)
+        @return: the list of C{AsyncCommand} instances, whose C{future} and C{token} are those of the execution
+        """
+        with self.pendingLock:
+            return [commandInstance for commandInstance in self.pendingCommands
+                    if commandClassRef is None or commandInstance.__class__ is commandClassRef]
+
+    def cancelPendingCommands(self, commandClassRef=None):
+        """
+        Cancel the C{AsyncCommand} executions in progress.
+
+        @param commandClassRef: the C{Class} of the C{AsyncCommand}s to cancel; all of them by default (optional)
+        @return: the number of executions cancelled
+        """
+        cancelled = 0
+        for commandInstance in self.getPendingCommands(commandClassRef):
+            if commandInstance.cancel():
+                cancelled += 1
+        return cancelled
+
+    def sendProcessResult(self, commandClassRef, note, result, error):
+        """
+        Send the outcome of a C{runInProcess}, C{memoize} or C{AsyncCommand} C{ICommand}.
+
+        On success, the C{ICommand}'s C{resultNotification} is sent with
+        the result as its body; on failure, its C{errorNotification}
+        with the exception. Either has the name of the original
+        C{INotification} as its type, and is not sent if not set.
+
+        @param commandClassRef: the C{Class} of the C{ICommand}
+        @param note: the C{INotification} it was executed with
+        @param result: the value C{execute} returned
+        @param error: the exception C{execute} raised, or C{None}
+        @return: whatever the notify method returns
+        """
+        if error is None:
+            notificationName, body = getattr(commandClassRef, 'resultNotification', None), result
+        else:
+            notificationName, body = getattr(commandClassRef, 'errorNotification', None), error
+        if notificationName is None:
+            return None
+
+        notifyMethod = self.processNotifyMethod or self.view.notifyObservers
+        return notifyMethod(puremvc.patterns.observer.Notification(notificationName, body, note.getName()))
+
+
+class AsyncController(Controller):
+    """
+    A Singleton C{IController} implementation for asyncio applications.
+
+    Works like the C{Controller}, except that C{executeCommand} is a
+    coroutine: an C{ICommand}'s C{execute} method may itself be a
+    coroutine, in which case it is awaited.
+
+    The C{AsyncController} is a separate Singleton from the
+    C{Controller}, and registers its C{ICommand}s with the C{AsyncView}.
+
+    @see: L{AsyncView<puremvc.core.AsyncView>}
+    @see: L{AsyncFacade<puremvc.patterns.facade.AsyncFacade>}
+    """
+    instance = None
+
+    @staticmethod
+    def getInstance():
+        """
+        C{AsyncController} Singleton Static method.
+
+        @return: the Singleton instance of C{AsyncController}
+        """
+        return AsyncController()
+
+    def initializeController(self):
+        """
+        Initialize the Singleton C{AsyncController} instance.
+
+        Called automatically by the constructor.
+        """
+        self.view = AsyncView.getInstance()
+        self.initializeCommandState()
+
+    def compileRoute(self, notificationName):
+        """
+        Build the command route the C{AsyncView} calls for a particular C{INotification} name.
+
+        @param notificationName: the name of the C{INotification}
+        @return: the C{executeCommand} coroutine function
+        """
+        return self.executeCommand
+
+    async def executeCommand(self, note, notificationName=None):
+        """
+        If an C{ICommand} has previously been registered
+        to handle a the given C{INotification}, then it is executed,
+        and awaited if its C{execute} method is a coroutine or, for an
+        C{AsyncCommand}, until the C{Future} it returns is done. Several
+        C{ICommand}s added for the name are awaited one after the other.
+
+        @param note: an C{INotification}
+        @param notificationName: the name, or wildcard pattern, the C{ICommand} is registered for; the C{INotification}'s name by default (optional)
+        """
+        if notificationName is None:
+            notificationName = note.getName()
+        commandClassRef = self.commandMap.get(notificationName)
+        if commandClassRef is None:
+            return
+        if commandClassRef.__class__ is str or \
+                (commandClassRef.__class__ is tuple and str in [registered.__class__ for registered in commandClassRef]):
+            commandClassRef = self.resolveCommand(notificationName)
+
+        if commandClassRef.__class__ is tuple:
+            return [await self.executeCommandClass(registered, note) for registered in commandClassRef]
+        return await self.executeCommandClass(commandClassRef, note)
+
+    async def executeCommandClass(self, commandClassRef, note):
+        """
+        Execute an C{ICommand} class, and await it.
+
+        @param commandClassRef: the C{Class} of the C{ICommand}
+        @param note: an C{INotification}
+        """
+        pool = self.commandPools.get(commandClassRef)
+        memo = pool.memo if pool is not None else None
+        if memo is not None:
+            key = memo.makeKey(note)
+            hit, result = memo.lookup(key)
+            if hit:
+                sent = self.sendProcessResult(commandClassRef, note, result, None)
+                if inspect.isawaitable(sent):
+                    await sent
+                return result
+            generation = memo.generation
+
+        if pool is not None and pool.asyncCommand:
+            commandInstance = pool.commandClassRef()
+            future = commandInstance.execute(note)
+            self.watchCommand(commandInstance, future)
+            try:
+                result, error = await asyncio.wrap_future(future), None
+            except asyncio.CancelledError:
+                commandInstance.cancel()
+                raise
+            except Exception as e:
+                result, error = None, e
+            if error is not None and getattr(commandClassRef, 'errorNotification', None) is None:
+                raise error
+            sent = self.sendProcessResult(commandClassRef, note, result, error)
+            if inspect.isawaitable(sent):
+                await sent
+            return result
+
+        if pool is not None and pool.runInProcess and self.processPool is not None:
+            try:
+                result, error = await asyncio.wrap_future(self.processPool.submit(
+                    executeCommandInProcess, commandClassRef, note.getName(), note.getBody(), note.getType())), None
+            except Exception as e:
+                result, error = None, e
+            if error is not None and getattr(commandClassRef, 'errorNotification', None) is None:
+                raise error
+            if error is None and memo is not None:
+                memo.store(key, result, generation)
+            sent = self.sendProcessResult(commandClassRef, note, result, error)
+            if inspect.isawaitable(sent):
+                await sent
+            return result
+
+        commandInstance = commandClassRef() if pool is None else pool.acquire()
+        try:
+            result = commandInstance.execute(note)
+            if inspect.isawaitable(result):
+                result = await result
+        finally:
+            if pool is not None:
+                pool.release(commandInstance)
+
+        if memo is not None:
+            memo.store(key, result, generation)
+        if pool is not None and (pool.runInProcess or memo is not None):
+            sent = self.sendProcessResult(commandClassRef, note, result, None)
+            if inspect.isawaitable(sent):
+                await sent
 
 
 class Model(puremvc.interfaces.IModel):
@@ -149,21 +992,43 @@ class Model(puremvc.interfaces.IModel):
     instances once the C{Facade} has initialized the Core
     actors.
 
+    An C{IProxy} may also be registered as a factory, with
+    C{registerProxyFactory}: it is only constructed, and registered,
+    when first retrieved, and may be unloaded again once idle for a
+    while (see C{ProxyFactory}).
+
+    The C{Model} may be used from several threads: C{retrieveProxy} and
+    C{hasProxy} read the C{proxyMap} without locking, while registering
+    and removing C{IProxy} instances is serialized by the C{proxyLock}.
+
     @see: L{Proxy<puremvc.patterns.proxy.Proxy>}
     @see: L{IProxy<puremvc.interfaces.IProxy>}
     """
     instance = None
+    instanceLock = threading.RLock()
+    initialized = False
     proxyMap = None
+    proxyLock = None
+    proxyFactories = None
+    nextEviction = 0.0
+
+    EVICTION_INTERVAL = 1.0
 
     def __new__(cls, *args, **kwargs):
         """
         This C{IModel} implementation is a Singleton, so you should not call the constructor
         directly, but instead call the static Singleton method C{Model.getInstance()}
         """
-        if not cls.instance or not isinstance(cls.instance, cls):
-            cls.instance = super(Model, cls).__new__(cls, *args, **kwargs)
-            cls.instance.initializeModel()
-        return cls.instance
+        instance = cls.instance
+        if instance is not None and isinstance(instance, cls) and instance.initialized:
+            return instance
+
+        with cls.instanceLock:
+            if not cls.instance or not isinstance(cls.instance, cls):
+                cls.instance = super(Model, cls).__new__(cls, *args, **kwargs)
+                cls.instance.initializeModel()
+                cls.instance.initialized = True
+            return cls.instance
 
     @staticmethod
     def getInstance():
@@ -181,24 +1046,91 @@ class Model(puremvc.interfaces.IModel):
         Called automatically by the constructor.
         """
         self.proxyMap = {}
+        self.proxyLock = threading.RLock()
+        self.proxyFactories = {}
 
     def registerProxy(self, proxy):
         """
         Register an C{IProxy} with the C{Model}.
 
+        Replaces the C{ProxyFactory} registered with the same name, if any.
+
         @param proxy: an C{IProxy} to be held by the C{Model}.
         """
-        self.proxyMap[proxy.getProxyName()] = proxy
+        with self.proxyLock:
+            self.proxyMap[proxy.getProxyName()] = proxy
+            if proxy.getProxyName() in self.proxyFactories:
+                self.removeProxyFactory(proxy.getProxyName())
         proxy.onRegister()
 
+    def registerProxyFactory(self, proxyName, factory, idleTimeout=None):
+        """
+        Register a factory building an C{IProxy} on first retrieval.
+
+        The C{IProxy} is constructed, by calling C{factory} with no
+        argument, and its C{onRegister} called, the first time it is
+        retrieved; C{hasProxy} is true as soon as the factory is
+        registered. With an C{idleTimeout}, the C{IProxy} is removed
+        again, its C{onRemove} called, by C{evictIdleProxies} once it has
+        not been retrieved for that many seconds, and is constructed
+        anew when next retrieved.
+
+        Replaces the C{IProxy} or C{ProxyFactory} registered with the
+        same name, if any, without removing it.
+
+        @param proxyName: the name of the C{IProxy}
+        @param factory: the callable returning the C{IProxy}, usually its C{Class}
+        @param idleTimeout: the time after which an unused C{IProxy} may be evicted, in seconds (optional)
+        """
+        with self.proxyLock:
+            self.proxyMap.pop(proxyName, None)
+            proxyFactories = dict(self.proxyFactories)
+            proxyFactories[proxyName] = ProxyFactory(proxyName, factory, idleTimeout)
+            self.proxyFactories = proxyFactories
+
+    def removeProxyFactory(self, proxyName):
+        """
+        Drop the C{ProxyFactory} registered with a name.
+
+        The caller must hold the C{proxyLock}.
+
+        @param proxyName: the name of the C{IProxy}
+        @return: the C{ProxyFactory}, or C{None}
+        """
+        proxyFactories = dict(self.proxyFactories)
+        factory = proxyFactories.pop(proxyName, None)
+        self.proxyFactories = proxyFactories
+        return factory
+
+    def getProxyFactory(self, proxyName):
+        """
+        Get the C{ProxyFactory} registered with a name.
+
+        @param proxyName: the name of the C{IProxy}
+        @return: the C{ProxyFactory}, or C{None}
+        """
+        return self.proxyFactories.get(proxyName)
+
     def retrieveProxy(self, proxyName):
         """
         Retrieve an C{IProxy} from the C{Model}.
 
+        An C{IProxy} registered with C{registerProxyFactory} is
+        constructed and registered if it is not yet. While factories
+        are registered, idle C{IProxy}s are evicted from here too, at
+        most once every C{EVICTION_INTERVAL} seconds.
+
         @param proxyName: the name of the C{IProxy}
         @return: the C{IProxy} instance previously registered with the given C{proxyName}.
         """
-        return self.proxyMap.get(proxyName)
+        factories = self.proxyFactories
+        if not factories:
+            return self.proxyMap.get(proxyName)
+        factory = factories.get(proxyName)
+        proxy = self.proxyMap.get(proxyName) if factory is None else factory.retrieve(self)
+        if time.monotonic() >= self.nextEviction:
+            self.evictIdleProxies()
+        return proxy
 
     def hasProxy(self, proxyName):
         """
@@ -207,21 +1139,47 @@ class Model(puremvc.interfaces.IModel):
         @param proxyName: the name of the C{IProxy}
         @return: whether a Proxy is currently registered with the given C{proxyName}.
         """
-        return self.proxyMap.get(proxyName) is not None
+        return self.proxyMap.get(proxyName) is not None or proxyName in self.proxyFactories
 
     def removeProxy(self, proxyName):
         """
         Remove an C{IProxy} from the C{Model}.
 
+        Removes its C{ProxyFactory} as well, if any.
+
         @param proxyName: name of the C{IProxy} instance to be removed.
-        @return: the C{IProxy} that was removed from the C{Model}
+        @return: the C{IProxy} that was removed from the C{Model}, or C{None} if it was not constructed
         """
-        proxy = self.proxyMap.get(proxyName)
+        with self.proxyLock:
+            factory = self.removeProxyFactory(proxyName) if proxyName in self.proxyFactories else None
+            proxy = self.proxyMap.get(proxyName) if factory is None else None
+            if proxy:
+                del self.proxyMap[proxyName]
+        if factory is not None:
+            return factory.unload(self)
         if proxy:
-            del self.proxyMap[proxyName]
             proxy.onRemove()
         return proxy
 
+    def evictIdleProxies(self):
+        """
+        Remove the C{IProxy}s built by factories with an C{idleTimeout} and not retrieved for that long.
+
+        Called whenever a factory builds an C{IProxy}, and by
+        C{retrieveProxy} every C{EVICTION_INTERVAL} seconds; an
+        application that may go without retrieving any C{IProxy} for
+        long should call it periodically as well.
+
+        @return: the list of the names of the C{IProxy}s removed
+        """
+        now = time.monotonic()
+        self.nextEviction = now + self.EVICTION_INTERVAL
+        evicted = []
+        for proxyName, factory in list(self.proxyFactories.items()):
+            if factory.isIdle(now) and factory.unload(self, now) is not None:
+                evicted.append(proxyName)
+        return evicted
+
 class View(puremvc.interfaces.IView):
     """
     A Singleton C{IView} implementation.
@@ -235,6 +1193,32 @@ class View(puremvc.interfaces.IView):
     Notifiying C{IMediators} when they are registered or removed.
 
     Managing the observer lists for each C{INotification} in the application.
+    Each list is stored as an immutable tuple which is swapped on every
+    registration change, so broadcasting never has to copy it.
+
+    Indexing every subscription by its notify context, so that removing
+    an observer or a C{IMediator} only touches the lists it is actually in.
+
+    Optionally compiling each observer list into a single dispatch
+    callable (see C{setCompiled}).
+
+    Matching notification names against wildcard subscriptions, kept in
+    a segment trie next to the exact-match lists (see C{registerObserver}).
+
+    Optionally fanning the observers of chosen C{INotification}s out
+    onto an executor, so they are notified in parallel (see
+    C{setFanOutExecutor}).
+
+    Routing C{INotification}s to their C{ICommand}s directly: the
+    C{Controller} installs one pre-bound command route per name, which
+    is called before (or, see C{setCommandOrder}, after) the observers.
+
+    The C{View} may be used from several threads. Broadcasting and
+    retrieving C{IMediator}s read immutable snapshots without locking;
+    changes to the observer lists are serialized by the C{observerLock}
+    and changes to the C{mediatorMap} by the C{mediatorLock}, which is
+    always acquired first when both are needed. C{onRegister} and
+    C{onRemove} are called with neither held.
 
     Providing a method for attaching C{IObservers} to an C{INotification}'s observer list.
 
@@ -248,18 +1232,46 @@ class View(puremvc.interfaces.IView):
     @see: L{Notification<puremvc.patterns.observer.Notification>}
     """
     instance = None
+    instanceLock = threading.RLock()
+    initialized = False
     observerMap = None
+    subscriptionMap = None
+    contextMap = None
     mediatorMap = None
+    dispatchPlans = None
+    patternTrie = None
+    resolvedMap = None
+    observerLock = None
+    mediatorLock = None
+    fanOutMap = None
+    commandRoutes = None
+    routeObservers = None
+    commandsFirst = True
+
+    SEPARATOR = "."
+    WILDCARD = "*"
+    MULTI_WILDCARD = "**"
+    RESOLVED_CACHE_SIZE = 10000
+    DISPATCH_CACHE_SIZE = 10000
+
+    COMMANDS_FIRST = "first"
+    COMMANDS_LAST = "last"
 
     def __new__(cls, *args, **kwargs):
         """
         This C{iView} implementation is a Singleton, so you should not call the constructor
         directly, but instead call the static Singleton method C{View.getInstance()}
         """
-        if not cls.instance or not isinstance(cls.instance, cls):
-            cls.instance = super(View, cls).__new__(cls, *args, **kwargs)
-            cls.instance.initializeView()
-        return cls.instance
+        instance = cls.instance
+        if instance is not None and isinstance(instance, cls) and instance.initialized:
+            return instance
+
+        with cls.instanceLock:
+            if not cls.instance or not isinstance(cls.instance, cls):
+                cls.instance = super(View, cls).__new__(cls, *args, **kwargs)
+                cls.instance.initializeView()
+                cls.instance.initialized = True
+            return cls.instance
 
     @staticmethod
     def getInstance():
@@ -275,21 +1287,72 @@ class View(puremvc.interfaces.IView):
         Initialize the Singleton C{View} instance.
 
         Called automatically by the constructor.
+
+        The C{observerMap} holds the observer tuple broadcast for each
+        notification name. It is derived from the C{subscriptionMap}, an
+        insertion-ordered dict of subscription id to C{IObserver} per
+        notification name. The C{contextMap} is the reverse index: for
+        the C{id} of each notify context, the subscription ids it holds
+        per notification name.
+
+        Wildcard patterns have their subscriptions in the C{subscriptionMap}
+        too, but not in the C{observerMap}; they are indexed segment by
+        segment in the C{patternTrie} instead. While there are any, the
+        C{resolvedMap} caches the merged observer tuple for each
+        notification name that has been broadcast.
+
+        The C{commandRoutes} hold the command route for each notification
+        name, and the C{routeObservers} the same routes wrapped in
+        C{IObserver}s, for the ways of notifying that work on observers.
         """
         self.observerMap = {}
+        self.subscriptionMap = {}
+        self.contextMap = {}
         self.mediatorMap = {}
+        self.subscriptionIds = itertools.count()
+        self.dispatchPlans = None
+        self.patternTrie = {}
+        self.resolvedMap = {}
+        self.observerLock = threading.RLock()
+        self.mediatorLock = threading.RLock()
+        self.fanOutMap = {}
+        self.commandRoutes = {}
+        self.routeObservers = {}
+        self.commandsFirst = True
 
     def registerObserver(self, notificationName, observer):
         """
         Register an C{IObserver} to be notified
         of C{INotifications} with a given name.
 
+        The name may also be a wildcard pattern of C{SEPARATOR} delimited
+        segments, where a C{WILDCARD} segment matches any one segment and
+        a C{MULTI_WILDCARD} segment matches any number of segments,
+        including none: C{"order.*"} matches C{"order.created"} but not
+        C{"order.line.added"}, C{"order.**"} matches both, as well as
+        C{"order"}. An C{IObserver} registered under several names or
+        patterns matching the same notification is notified once.
+
         @param notificationName: the name of the C{INotifications} to notify this C{IObserver} of
         @param observer: the C{IObserver} to register
         """
-        if not notificationName in self.observerMap:
-            self.observerMap[notificationName] = []
-        self.observerMap[notificationName].append(observer)
+        with self.observerLock:
+            subscriptionId = next(self.subscriptionIds)
+            subscriptions = self.subscriptionMap.get(notificationName)
+            if subscriptions is None:
+                subscriptions = self.subscriptionMap[notificationName] = {}
+                if self.isPattern(notificationName):
+                    self.addPattern(notificationName)
+            subscriptions[subscriptionId] = observer
+
+            contextNames = self.contextMap.setdefault(id(observer.getNotifyContext()), {})
+            contextNames.setdefault(notificationName, []).append(subscriptionId)
+
+            if self.isPattern(notificationName):
+                self.invalidateDispatchPlans()
+            else:
+                self.observerMap[notificationName] = self.observerMap.get(notificationName, ()) + (observer,)
+                self.invalidateDispatchPlan(notificationName)
 
     def notifyObservers(self, notification):
         """
@@ -299,28 +1362,480 @@ class View(puremvc.interfaces.IView):
         list are notified and are passed a reference to the C{INotification} in
         the order in which they were registered.
 
+        Observer lists are immutable tuples that are replaced, never modified,
+        when observers are registered or removed, so the list being iterated
+        here is a stable snapshot: an observer removed during the broadcast
+        (e.g. a C{Mediator} removing itself) is still notified this time, and
+        one added during the broadcast is not.
+
+        The command route for the C{INotification}'s name, if any, is
+        called before the observers, or after them (see C{setCommandOrder}).
+
+        If a fan-out executor is set for the C{INotification}'s name, the
+        observers are notified on it instead (see C{setFanOutExecutor}).
+
         @param notification: the C{INotification} to notify C{IObservers} of.
+        @return: a C{FanOutReport}, or a C{Future} of one, when the observers were fanned out
         """
-        observers = self.observerMap.get(notification.getName(), [])[:]
+        if self.fanOutMap:
+            fanOut = self.fanOutMap.get(notification.getName())
+            if fanOut is not None:
+                return self.fanOutObservers(notification, *fanOut)
+
+        plans = self.dispatchPlans
+        if plans is not None:
+            plan = plans.get(notification.getName())
+            if plan is None:
+                plan = self.compileDispatchPlan(notification.getName())
+            plan(notification)
+            return
+
+        route = self.commandRoutes.get(notification.getName())
+        if self.patternTrie:
+            observers = self.resolvedMap.get(notification.getName())
+            if observers is None:
+                observers = self.resolveObservers(notification.getName())
+        else:
+            observers = self.observerMap.get(notification.getName(), ())
+
+        if route is not None and self.commandsFirst:
+            route(notification)
+            route = None
+
         for obsvr in observers:
             obsvr.notifyObserver(notification)
 
-    def removeObserver(self, notificationName, notifyContext):
+        if route is not None:
+            route(notification)
+
+    def registerCommandRoute(self, notificationName, route, context, batchRoute=None):
         """
-        Remove the observer for a given notifyContext from an observer list for a given Notification name.
+        Install the command route for a given Notification name, replacing any previous one.
 
-        @param notificationName: which observer list to remove from
-        @param notifyContext: remove the observer with this object as its notifyContext
+        @param notificationName: the name of the C{INotification}s to route
+        @param route: the callable taking the C{INotification}
+        @param context: the object installing the route, usually the C{Controller}
+        @param batchRoute: the callable taking a list of C{INotification}s, for C{notifyObserversBatch} (optional)
+        """
+        with self.observerLock:
+            commandRoutes = dict(self.commandRoutes)
+            commandRoutes[notificationName] = route
+            self.routeObservers[notificationName] = puremvc.patterns.observer.Observer(route, context, batchRoute)
+            self.commandRoutes = commandRoutes
+            self.invalidateDispatchPlan(notificationName)
+
+    def removeCommandRoute(self, notificationName):
         """
-        observers = self.observerMap[notificationName]
+        Remove the command route for a given Notification name.
 
-        for i in range(len(observers)-1, -1, -1):
-            if observers[i].compareNotifyContext(notifyContext):
-                observers.pop(i)
-                break
+        @param notificationName: the name of the C{INotification}s to stop routing
+        """
+        with self.observerLock:
+            if notificationName not in self.commandRoutes:
+                return
+            commandRoutes = dict(self.commandRoutes)
+            del commandRoutes[notificationName]
+            del self.routeObservers[notificationName]
+            self.commandRoutes = commandRoutes
+            self.invalidateDispatchPlan(notificationName)
+
+    def setCommandOrder(self, order):
+        """
+        Choose whether command routes are called before or after the observers.
 
-        if len(observers) == 0:
-            del self.observerMap[notificationName]
+        @param order: C{COMMANDS_FIRST} (the default) or C{COMMANDS_LAST}
+        """
+        if order not in (self.COMMANDS_FIRST, self.COMMANDS_LAST):
+            raise ValueError("Unknown command order %r" % (order,))
+        with self.observerLock:
+            self.commandsFirst = order == self.COMMANDS_FIRST
+            self.invalidateDispatchPlans()
+
+    def routedObservers(self, notificationName):
+        """
+        Collect the C{IObservers} of a given Notification name, with its command route as one of them.
+
+        @param notificationName: the name of the C{INotification}
+        @return: the tuple of C{IObservers} to notify, in order
+        """
+        observers = self.resolveObservers(notificationName)
+        routeObserver = self.routeObservers.get(notificationName)
+        if routeObserver is None:
+            return observers
+        if self.commandsFirst:
+            return (routeObserver,) + observers
+        return observers + (routeObserver,)
+
+    def setFanOutExecutor(self, notificationName, executor, wait=True):
+        """
+        Fan the observers of a given Notification name out onto an executor.
+
+        Instead of being notified one after the other, every C{IObserver}
+        of the name is submitted to the C{executor} (typically a
+        C{concurrent.futures.ThreadPoolExecutor}) at once, which pays off
+        when there are many of them and their handlers release the GIL.
+        C{notifyObservers} then returns a C{FanOutReport} with the time
+        taken by, and any exception raised from, each observer; it
+        waits for all of them to complete first, or with C{wait} set to
+        C{False} immediately returns a C{Future} of the report instead.
+
+        Observers may be notified in any order and on any thread, so only
+        fan out the names whose observers are independent and thread-safe.
+
+        @param notificationName: the name of the C{INotification}s to fan out
+        @param executor: the C{concurrent.futures.Executor} to notify observers on
+        @param wait: whether C{notifyObservers} waits for the observers to complete (optional)
+        """
+        with self.observerLock:
+            fanOutMap = dict(self.fanOutMap)
+            fanOutMap[notificationName] = (executor, wait)
+            self.fanOutMap = fanOutMap
+
+    def removeFanOutExecutor(self, notificationName):
+        """
+        Go back to notifying the observers of a given Notification name one after the other.
+
+        @param notificationName: the name of the C{INotification}s to stop fanning out
+        """
+        with self.observerLock:
+            fanOutMap = dict(self.fanOutMap)
+            fanOutMap.pop(notificationName, None)
+            self.fanOutMap = fanOutMap
+
+    def fanOutObservers(self, notification, executor, wait):
+        """
+        Notify the C{IObservers} for a particular C{INotification} on an executor.
+
+        @param notification: the C{INotification} to notify C{IObservers} of.
+        @param executor: the C{concurrent.futures.Executor} to notify observers on
+        @param wait: whether to wait for the observers to complete
+        @return: the C{FanOutReport}, or a C{Future} of it when not waiting
+        """
+        report = FanOutReport(notification)
+        futures = [executor.submit(report.notifyObserver, obsvr)
+                   for obsvr in self.routedObservers(notification.getName())]
+
+        if wait:
+            concurrent.futures.wait(futures)
+            return report
+
+        reported = concurrent.futures.Future()
+        if len(futures) == 0:
+            reported.set_result(report)
+            return reported
+
+        remaining = [len(futures)]
+        lock = threading.Lock()
+        def observerDone(future):
+            with lock:
+                remaining[0] -= 1
+                done = remaining[0] == 0
+            if done:
+                reported.set_result(report)
+
+        for future in futures:
+            future.add_done_callback(observerDone)
+        return reported
+
+    def notifyObserversBatch(self, notifications):
+        """
+        Notify the C{IObservers} of a batch of C{INotification}s.
+
+        The batch is split into runs of consecutive notifications with the
+        same name. The observers of each run are resolved once, and each
+        is handed the whole run with C{notifyObserverBatch}, so that the
+        ones with a batch notification method get it in one call; others
+        are notified of each C{INotification} in turn. Runs are delivered
+        in order, so notifications of different names keep their relative
+        order, while within a run every observer handles the whole run
+        before the next observer starts.
+
+        @param notifications: the list of C{INotification}s to notify C{IObservers} of.
+        """
+        start = 0
+        while start < len(notifications):
+            notificationName = notifications[start].getName()
+            end = start + 1
+            while end < len(notifications) and notifications[end].getName() == notificationName:
+                end += 1
+            run = notifications[start:end]
+            start = end
+
+            for obsvr in self.routedObservers(notificationName):
+                notifyBatch = getattr(obsvr, 'notifyObserverBatch', None)
+                if notifyBatch is not None:
+                    notifyBatch(run)
+                else:
+                    for notification in run:
+                        obsvr.notifyObserver(notification)
+
+    def resolveObservers(self, notificationName):
+        """
+        Collect the C{IObservers} of a given Notification name.
+
+        Merges the exact-match observer list with the subscriptions of
+        every wildcard pattern matching the name, in the order in which
+        they were registered, and caches the result in the C{resolvedMap}
+        until the subscriptions change. An C{IObserver} subscribed
+        through several of these names or patterns is only kept for the
+        first one; one subscribed several times through the same one
+        is kept as often, as it is when no pattern is registered.
+
+        @param notificationName: the name of the C{INotification}
+        @return: the tuple of C{IObservers} to notify
+        """
+        if not self.patternTrie:
+            return self.observerMap.get(notificationName, ())
+
+        observers = self.resolvedMap.get(notificationName)
+        if observers is not None:
+            return observers
+
+        with self.observerLock:
+            subscriptions = [(subscriptionId, obsvr, notificationName) for subscriptionId, obsvr
+                             in self.subscriptionMap.get(notificationName, {}).items()]
+            for pattern in self.matchPatterns(notificationName):
+                subscriptions.extend((subscriptionId, obsvr, pattern) for subscriptionId, obsvr
+                                     in self.subscriptionMap[pattern].items())
+            subscriptions.sort(key=lambda subscription: subscription[0])
+
+            observers = []
+            sources = {}
+            for subscriptionId, obsvr, source in subscriptions:
+                if sources.setdefault(id(obsvr), source) == source:
+                    observers.append(obsvr)
+            observers = tuple(observers)
+
+            if len(self.resolvedMap) >= self.RESOLVED_CACHE_SIZE:
+                self.resolvedMap.clear()
+            self.resolvedMap[notificationName] = observers
+            return observers
+
+    def isPattern(self, notificationName):
+        """
+        Check if a Notification name is a wildcard pattern.
+
+        @param notificationName: the name to check
+        @return: whether any segment of the name is a C{WILDCARD} or C{MULTI_WILDCARD}
+        """
+        if not isinstance(notificationName, str) or self.WILDCARD not in notificationName:
+            return False
+        for segment in notificationName.split(self.SEPARATOR):
+            if segment == self.WILDCARD or segment == self.MULTI_WILDCARD:
+                return True
+        return False
+
+    def addPattern(self, pattern):
+        """
+        Index a wildcard pattern in the C{patternTrie}.
+
+        Each trie node is a dict of segment to child node; the node for
+        the last segment of the pattern holds the pattern itself under
+        the C{None} key.
+
+        @param pattern: the wildcard pattern
+        """
+        node = self.patternTrie
+        for segment in pattern.split(self.SEPARATOR):
+            node = node.setdefault(segment, {})
+        node[None] = pattern
+
+    def removePattern(self, pattern):
+        """
+        Remove a wildcard pattern from the C{patternTrie}, pruning nodes left empty.
+
+        @param pattern: the wildcard pattern
+        """
+        path = [self.patternTrie]
+        segments = pattern.split(self.SEPARATOR)
+        for segment in segments:
+            path.append(path[-1][segment])
+        del path[-1][None]
+
+        for i in range(len(segments)-1, -1, -1):
+            if path[i+1]:
+                break
+            del path[i][segments[i]]
+
+    def matchPatterns(self, notificationName):
+        """
+        Find the wildcard patterns matching a Notification name.
+
+        @param notificationName: the name of the C{INotification}
+        @return: the set of matching patterns
+        """
+        matches = set()
+        if isinstance(notificationName, str):
+            self.matchNode(self.patternTrie, notificationName.split(self.SEPARATOR), 0, matches)
+        return matches
+
+    def matchNode(self, node, segments, index, matches):
+        """
+        Collect the patterns below a C{patternTrie} node matching C{segments[index:]}.
+
+        @param node: the trie node to match from
+        @param segments: the segments of the Notification name
+        @param index: the first segment not matched yet
+        @param matches: the set the matching patterns are added to
+        """
+        if self.MULTI_WILDCARD in node:
+            for i in range(index, len(segments)+1):
+                self.matchNode(node[self.MULTI_WILDCARD], segments, i, matches)
+
+        if index == len(segments):
+            if None in node:
+                matches.add(node[None])
+            return
+
+        if segments[index] in node:
+            self.matchNode(node[segments[index]], segments, index+1, matches)
+        if self.WILDCARD in node:
+            self.matchNode(node[self.WILDCARD], segments, index+1, matches)
+
+    def setCompiled(self, compiled):
+        """
+        Turn compiled dispatch on or off.
+
+        In compiled mode the observer list for each C{INotification}
+        name is turned, on its first broadcast, into one prebuilt
+        dispatch callable holding the observers' notification methods
+        (and, for C{ICommand}s, the C{Controller}'s pre-bound command
+        factories), which skips C{Observer.notifyObserver} and
+        C{Controller.executeCommand} on every broadcast. A name's plan
+        is thrown away whenever its observer list changes, and all of
+        them once plans for C{DISPATCH_CACHE_SIZE} names are cached.
+
+        @param compiled: whether C{notifyObservers} should use compiled dispatch plans
+        """
+        with self.observerLock:
+            if compiled:
+                if self.dispatchPlans is None:
+                    self.dispatchPlans = {}
+            else:
+                self.dispatchPlans = None
+
+    def isCompiled(self):
+        """
+        Check if compiled dispatch is turned on.
+
+        @return: whether C{notifyObservers} uses compiled dispatch plans
+        """
+        return self.dispatchPlans is not None
+
+    def compileDispatchPlan(self, notificationName):
+        """
+        Build and cache the dispatch plan for a given Notification name.
+
+        @param notificationName: the name of the C{INotification} to build the plan for
+        @return: a callable taking the C{INotification} to broadcast
+        """
+        with self.observerLock:
+            handlers = tuple(self.compileObserver(notificationName, obsvr)
+                             for obsvr in self.routedObservers(notificationName))
+
+            if len(handlers) == 0:
+                def plan(notification):
+                    pass
+            elif len(handlers) == 1:
+                plan = handlers[0]
+            else:
+                def plan(notification):
+                    for handler in handlers:
+                        handler(notification)
+
+            if self.dispatchPlans is not None:
+                if len(self.dispatchPlans) >= self.DISPATCH_CACHE_SIZE:
+                    self.dispatchPlans.clear()
+                self.dispatchPlans[notificationName] = plan
+            return plan
+
+    def compileObserver(self, notificationName, observer):
+        """
+        Resolve an C{IObserver} to the callable a dispatch plan invokes.
+
+        @param notificationName: the name of the C{INotification} the plan is built for
+        @param observer: the C{IObserver} to resolve
+        @return: a callable taking the C{INotification}
+        """
+        if type(observer).notifyObserver is not puremvc.patterns.observer.Observer.notifyObserver:
+            return observer.notifyObserver
+
+        context = observer.getNotifyContext()
+        if isinstance(context, Controller) and observer.getNotifyMethod() == context.executeCommand:
+            return context.compileCommand(notificationName)
+        return observer.getNotifyMethod()
+
+    def invalidateDispatchPlan(self, notificationName):
+        """
+        Throw away the compiled dispatch plan and resolved observers for a given Notification name, if any.
+
+        @param notificationName: the name of the C{INotification} whose plan is outdated
+        """
+        with self.observerLock:
+            self.resolvedMap.pop(notificationName, None)
+            if self.dispatchPlans is not None:
+                self.dispatchPlans.pop(notificationName, None)
+
+    def invalidateDispatchPlans(self):
+        """
+        Throw away all compiled dispatch plans and resolved observers.
+
+        Called when a wildcard subscription changes, since it may affect any name.
+        """
+        with self.observerLock:
+            self.resolvedMap.clear()
+            if self.dispatchPlans is not None:
+                self.dispatchPlans.clear()
+
+    def removeObserver(self, notificationName, notifyContext):
+        """
+        Remove the observer for a given notifyContext from an observer list for a given Notification name.
+
+        @param notificationName: which observer list to remove from
+        @param notifyContext: remove the observer with this object as its notifyContext
+        """
+        with self.observerLock:
+            contextNames = self.contextMap.get(id(notifyContext))
+            if contextNames is None or notificationName not in contextNames:
+                return
+
+            subscriptionIds = contextNames[notificationName]
+            self.removeSubscriptions(notificationName, (subscriptionIds.pop(),))
+
+            if len(subscriptionIds) == 0:
+                del contextNames[notificationName]
+                if len(contextNames) == 0:
+                    del self.contextMap[id(notifyContext)]
+
+    def removeSubscriptions(self, notificationName, subscriptionIds):
+        """
+        Remove subscriptions from the observer list for a given Notification name.
+
+        Rebuilds the observer tuple for C{notificationName} from the
+        subscriptions that remain, or drops the name altogether when
+        none are left. The C{contextMap} is left to the caller, which
+        must hold the C{observerLock}.
+
+        @param notificationName: which observer list to remove from
+        @param subscriptionIds: the ids assigned to the subscriptions by C{registerObserver}
+        """
+        subscriptions = self.subscriptionMap[notificationName]
+        for subscriptionId in subscriptionIds:
+            del subscriptions[subscriptionId]
+
+        if self.isPattern(notificationName):
+            if len(subscriptions) == 0:
+                del self.subscriptionMap[notificationName]
+                self.removePattern(notificationName)
+            self.invalidateDispatchPlans()
+            return
+
+        if len(subscriptions) == 0:
+            del self.subscriptionMap[notificationName]
+            del self.observerMap[notificationName]
+        else:
+            self.observerMap[notificationName] = tuple(subscriptions.values())
+        self.invalidateDispatchPlan(notificationName)
 
     def registerMediator(self, mediator):
         """
@@ -338,17 +1853,19 @@ class View(puremvc.interfaces.IView):
 
         @param mediator: a reference to the C{IMediator} instance
         """
-        # do not allow re-registration (you must to removeMediator fist)
-        if mediator.getMediatorName() in self.mediatorMap:
-            return
+        with self.mediatorLock:
+            # do not allow re-registration (you must to removeMediator fist)
+            if mediator.getMediatorName() in self.mediatorMap:
+                return
 
-        self.mediatorMap[mediator.getMediatorName()] = mediator
-        interests = mediator.listNotificationInterests()
-        if len(interests) > 0:
-            obsvr = puremvc.patterns.observer.Observer(mediator.handleNotification, mediator)
+            self.mediatorMap[mediator.getMediatorName()] = mediator
+            interests = mediator.listNotificationInterests()
+            if len(interests) > 0:
+                obsvr = puremvc.patterns.observer.Observer(mediator.handleNotification, mediator,
+                                                           getattr(mediator, 'handleNotificationBatch', None))
 
-            for i in range(0,len(interests)):
-                self.registerObserver(interests[i], obsvr)
+                for i in range(0,len(interests)):
+                    self.registerObserver(interests[i], obsvr)
 
         mediator.onRegister()
 
@@ -369,20 +1886,17 @@ class View(puremvc.interfaces.IView):
         @param mediatorName: name of the C{IMediator} instance to be removed.
         @return: the C{IMediator} that was removed from the C{View}
         """
-        for notificationName in self.observerMap.keys():
-            observers = self.observerMap[notificationName]
-            for i in range(len(observers)-1, -1, -1):
-                if observers[i].compareNotifyContext(self.retrieveMediator(mediatorName)) == True:
-                    observers.pop(i)
+        with self.mediatorLock:
+            mediator = self.mediatorMap.get(mediatorName)
+            if mediator is None:
+                return None
 
-            if len(observers) == 0:
-                del self.observerMap[notificationName]
+            with self.observerLock:
+                for notificationName, subscriptionIds in self.contextMap.pop(id(mediator), {}).items():
+                    self.removeSubscriptions(notificationName, subscriptionIds)
 
-        mediator = self.mediatorMap.get(mediatorName)
-
-        if mediator is not None:
             del self.mediatorMap[mediatorName]
-            mediator.onRemove()
+        mediator.onRemove()
         return mediator
 
     def hasMediator(self, mediatorName):
@@ -393,3 +1907,659 @@ class View(puremvc.interfaces.IView):
         @return: whether a Mediator is registered with the given C{mediatorName}.
         """
         return self.mediatorMap.get(mediatorName) is not None
+
+
+class AsyncView(View):
+    """
+    A Singleton C{IView} implementation for asyncio applications.
+
+    Works like the C{View}, except that C{notifyObservers} is a
+    coroutine: C{IMediator}s' C{handleNotification} methods (and the
+    C{AsyncController}'s C{executeCommand}) may be coroutines, in which
+    case they are awaited. Observers are notified either one after the
+    other, each awaited before the next one is notified, or
+    concurrently, all of them awaited together with C{asyncio.gather}.
+
+    The C{AsyncView} is a separate Singleton from the C{View}. It does
+    not use compiled dispatch plans.
+
+    @see: L{AsyncController<puremvc.core.AsyncController>}
+    @see: L{AsyncFacade<puremvc.patterns.facade.AsyncFacade>}
+    """
+    instance = None
+
+    @staticmethod
+    def getInstance():
+        """
+        C{AsyncView} Singleton Static method.
+
+        @return: the Singleton instance of C{AsyncView}
+        """
+        return AsyncView()
+
+    async def notifyObservers(self, notification, concurrent=False):
+        """
+        Notify the C{IObservers} for a particular C{INotification}.
+
+        Observers are notified in the order in which they were registered.
+        Sequentially, the result of each one is awaited before the next is
+        notified. Concurrently, every observer is notified first, then
+        all of the results that are awaitable are awaited together; if
+        any of them raises, the first exception is propagated once all
+        have completed.
+
+        @param notification: the C{INotification} to notify C{IObservers} of.
+        @param concurrent: whether to await the C{IObservers} concurrently (optional)
+        """
+        observers = self.routedObservers(notification.getName())
+
+        if not concurrent:
+            for obsvr in observers:
+                result = obsvr.notifyObserver(notification)
+                if inspect.isawaitable(result):
+                    await result
+            return
+
+        pending = []
+        for obsvr in observers:
+            result = obsvr.notifyObserver(notification)
+            if inspect.isawaitable(result):
+                pending.append(result)
+
+        if pending:
+            results = await asyncio.gather(*pending, return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+    async def notifyObserversBatch(self, notifications, concurrent=False):
+        """
+        Notify the C{IObservers} of a batch of C{INotification}s.
+
+        The C{INotification}s are broadcast one after the other with
+        C{notifyObservers}; batch notification methods are not used.
+
+        @param notifications: the list of C{INotification}s to notify C{IObservers} of.
+        @param concurrent: whether to await the C{IObservers} of each C{INotification} concurrently (optional)
+        """
+        for notification in notifications:
+            await self.notifyObservers(notification, concurrent)
+
+
+class FanOutReport(object):
+    """
+    The outcome of notifying the C{IObservers} of an C{INotification} on an executor.
+
+    C{timings} and C{errors} are lists of C{(observer, value)} pairs:
+    the wall time in seconds each C{IObserver} took to handle the
+    C{INotification}, and the exception raised by each that failed,
+    each in the order the observers completed.
+
+    @see: L{View.setFanOutExecutor<puremvc.core.View.setFanOutExecutor>}
+    """
+
+    def __init__(self, notification):
+        """
+        Constructor.
+
+        @param notification: the C{INotification} the observers were notified of
+        """
+        self.notification = notification
+        self.timings = []
+        self.errors = []
+
+    def notifyObserver(self, observer):
+        """
+        Notify an C{IObserver}, recording its timing and any exception it raises.
+
+        @param observer: the C{IObserver} to notify
+        """
+        start = time.perf_counter()
+        try:
+            observer.notifyObserver(self.notification)
+        except Exception as e:
+            self.errors.append((observer, e))
+        finally:
+            self.timings.append((observer, time.perf_counter() - start))
+
+    def hasErrors(self):
+        """
+        Check if any observer raised an exception.
+
+        @return: whether any C{IObserver} failed
+        """
+        return len(self.errors) > 0
+
+
+def executeWithHooks(hooks, commandClassRef, note, execute):
+    """
+    Execute an C{ICommand} within execution hooks.
+
+    @param hooks: the tuple of execution hooks (see C{Controller.addExecutionHook})
+    @param commandClassRef: the C{Class} of the C{ICommand}
+    @param note: the C{INotification} to execute it with
+    @param execute: the callable executing it, taking the C{INotification}
+    @return: the value C{execute} returns
+    """
+    tokens = [hook.beforeExecute(commandClassRef, note) for hook in hooks]
+    error = None
+    try:
+        return execute(note)
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        for hook, token in zip(reversed(hooks), reversed(tokens)):
+            hook.afterExecute(commandClassRef, note, token, error)
+
+
+def executeCommandInProcess(commandClassRef, notificationName, body, noteType):
+    """
+    Execute an C{ICommand} in a worker process of the C{Controller}'s process pool.
+
+    @param commandClassRef: the C{Class} of the C{ICommand}
+    @param notificationName: the name of the C{INotification}
+    @param body: the body of the C{INotification}
+    @param noteType: the type of the C{INotification}
+    @return: the value the C{ICommand}'s C{execute} returns
+    """
+    return commandClassRef().execute(puremvc.patterns.observer.Notification(notificationName, body, noteType))
+
+
+class CommandPool(object):
+    """
+    The reusable instances of an C{ICommand} class.
+
+    An C{ICommand} class opts in with one of two class attributes:
+
+    C{stateless = True}: its C{execute} keeps no state on the instance
+    between or during calls, so a single C{shared} instance is created
+    when the class is registered and handles every C{INotification},
+    even several at once from different threads or nested sends.
+
+    C{poolSize = n}: each C{INotification} is handled by an instance
+    C{acquire}d from the pool, or a new one when the pool is empty,
+    which is C{release}d afterwards. Releasing calls the instance's
+    C{reset} method, which must return it to the state of a new
+    instance, and keeps up to C{n} idle instances; an instance whose
+    C{reset} raises is dropped.
+
+    @see: L{Controller<puremvc.core.Controller>}
+    @see: L{SimpleCommand.reset<puremvc.patterns.command.SimpleCommand.reset>}
+    """
+
+    def __init__(self, commandClassRef):
+        """
+        Constructor.
+
+        @param commandClassRef: the C{Class} of the C{ICommand}
+        @raise ValueError: if the C{ICommand} is an C{AsyncCommand} declaring C{memoize}
+        """
+        if getattr(commandClassRef, 'asyncCommand', False) and getattr(commandClassRef, 'memoize', False):
+            raise ValueError("AsyncCommand %s cannot be memoized" % (commandClassRef.__name__,))
+        self.commandClassRef = commandClassRef
+        self.shared = None
+        self.created = 0
+        self.reused = 0
+        self.runInProcess = getattr(commandClassRef, 'runInProcess', False)
+        self.asyncCommand = getattr(commandClassRef, 'asyncCommand', False)
+        self.memo = CommandMemo(commandClassRef) if getattr(commandClassRef, 'memoize', False) else None
+        if getattr(commandClassRef, 'stateless', False):
+            self.shared = commandClassRef()
+            self.created = 1
+        self.instances = collections.deque(maxlen=getattr(commandClassRef, 'poolSize', 0) or 0)
+
+    def acquire(self):
+        """
+        Get an instance to execute.
+
+        @return: the shared instance, an idle pooled one or a new one
+        """
+        if self.shared is not None:
+            self.reused += 1
+            return self.shared
+        try:
+            commandInstance = self.instances.pop()
+        except IndexError:
+            self.created += 1
+            return self.commandClassRef()
+        self.reused += 1
+        return commandInstance
+
+    def release(self, commandInstance):
+        """
+        Give back an instance obtained from C{acquire}.
+
+        @param commandInstance: the C{ICommand} instance
+        """
+        if commandInstance is self.shared:
+            return
+        reset = getattr(commandInstance, 'reset', None)
+        if reset is not None:
+            try:
+                reset()
+            except Exception:
+                return
+        self.instances.append(commandInstance)
+
+
+class CommandMemo(object):
+    """
+    The cached results of a memoized C{ICommand} class.
+
+    An C{ICommand} class opts in with C{memoize = True}, declaring its
+    C{execute} a pure function of the C{INotification}: the value it
+    returns is cached under a key computed from the name, body and type
+    of the C{INotification}, and an C{INotification} with the same key
+    gets the cached value instead of executing the C{ICommand} again.
+    The class attributes tuning the cache are:
+
+    C{memoKey}: a function of C{(name, body, noteType)} returning the
+    key; by default the three of them, which must then be hashable.
+    An C{INotification} whose key is not hashable is never cached.
+
+    C{memoSize}: the number of results kept, the least recently used
+    ones being evicted first.
+
+    C{memoTTL}: the number of seconds a result stays valid, if set.
+
+    C{memoInvalidatedBy}: the names of the C{INotification}s, such as a
+    C{Proxy}'s "changed" notification, on which every cached result is
+    dropped.
+
+    An C{AsyncCommand} cannot be memoized.
+
+    @see: L{Controller<puremvc.core.Controller>}
+    """
+
+    def __init__(self, commandClassRef):
+        """
+        Constructor.
+
+        @param commandClassRef: the C{Class} of the C{ICommand}
+        """
+        self.keyFunction = getattr(commandClassRef, 'memoKey', None)
+        self.maxSize = getattr(commandClassRef, 'memoSize', 128)
+        self.ttl = getattr(commandClassRef, 'memoTTL', None)
+        self.invalidatedBy = tuple(getattr(commandClassRef, 'memoInvalidatedBy', ()))
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def makeKey(self, note):
+        """
+        Compute the cache key of an C{INotification}.
+
+        @param note: the C{INotification}
+        @return: the key, or C{None} if it is not hashable
+        """
+        if self.keyFunction is None:
+            key = (note.getName(), note.getBody(), note.getType())
+        else:
+            key = self.keyFunction(note.getName(), note.getBody(), note.getType())
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def lookup(self, key):
+        """
+        Look up a cached result, counting the hit or miss.
+
+        @param key: the key from C{makeKey}
+        @return: a C{(hit, result)} pair
+        """
+        with self.lock:
+            entry = self.entries.get(key) if key is not None else None
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def store(self, key, result, generation):
+        """
+        Cache a result, unless the cache was invalidated since the C{ICommand} started.
+
+        @param key: the key from C{makeKey}
+        @param result: the value C{execute} returned
+        @param generation: the C{generation} when the C{ICommand} started
+        """
+        with self.lock:
+            if key is None or generation != self.generation:
+                return
+            self.entries[key] = (result, time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxSize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, notification=None):
+        """
+        Drop every cached result.
+
+        Registered as the notify method for the C{memoInvalidatedBy} names.
+
+        @param notification: the invalidating C{INotification} (optional)
+        """
+        with self.lock:
+            self.entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def getStats(self):
+        """
+        Get the cache counters.
+
+        @return: a dict with the number of C{hits}, C{misses}, C{evictions} and C{invalidations}, and the current C{size}
+        """
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'invalidations': self.invalidations, 'size': len(self.entries)}
+
+
+class CommandProfiler(object):
+    """
+    An execution hook recording how long each C{ICommand} class takes.
+
+    For each C{ICommand} class, keyed by its qualified name, the report
+    holds the number of C{calls} and of C{errors}, the C{totalTime},
+    C{maxTime} and C{selfTime} in seconds, and, when allocations are
+    tracked, the C{allocatedBytes}: the growth of the memory traced by
+    C{tracemalloc} over its executions. The self time excludes the time
+    spent in the I{SubCommands} of a C{MacroCommand}, which are reported
+    under their own classes, as are those executed by C{ICommand}s
+    sending C{INotification}s. I{SubCommands} of a
+    C{ParallelMacroCommand} run on other threads, so its self time
+    includes waiting for them.
+
+    @see: L{Controller.addExecutionHook<puremvc.core.Controller.addExecutionHook>}
+    @see: L{Facade.startProfiling<puremvc.patterns.facade.Facade.startProfiling>}
+    """
+
+    def __init__(self, trackAllocations=False):
+        """
+        Constructor.
+
+        @param trackAllocations: whether to record allocation deltas, starting C{tracemalloc} if needed (optional)
+        """
+        self.trackAllocations = trackAllocations
+        self.startedTracing = False
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.frames = threading.local()
+
+    def start(self):
+        """
+        Start tracing allocations, if tracked and not traced already.
+        """
+        if self.trackAllocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.startedTracing = True
+
+    def stop(self):
+        """
+        Stop tracing allocations, if C{start} started it.
+        """
+        if self.startedTracing:
+            tracemalloc.stop()
+            self.startedTracing = False
+
+    def beforeExecute(self, commandClassRef, notification):
+        """
+        Open a frame for an C{ICommand} about to be executed.
+
+        @param commandClassRef: the C{Class} of the C{ICommand}
+        @param notification: the C{INotification} it is executed with
+        @return: the frame, a list of start time, time spent in nested C{ICommand}s and traced memory
+        """
+        stack = getattr(self.frames, 'stack', None)
+        if stack is None:
+            stack = self.frames.stack = []
+        memory = tracemalloc.get_traced_memory()[0] if self.trackAllocations and tracemalloc.is_tracing() else None
+        frame = [time.perf_counter(), 0.0, memory]
+        stack.append(frame)
+        return frame
+
+    def afterExecute(self, commandClassRef, notification, frame, error):
+        """
+        Close the frame of an executed C{ICommand} and record it.
+
+        @param commandClassRef: the C{Class} of the C{ICommand}
+        @param notification: the C{INotification} it was executed with
+        @param frame: the frame returned by C{beforeExecute}
+        @param error: the exception it raised, or C{None}
+        """
+        elapsed = time.perf_counter() - frame[0]
+        stack = self.frames.stack
+        stack.pop()
+        if stack:
+            stack[-1][1] += elapsed
+
+        allocated = 0
+        if frame[2] is not None and tracemalloc.is_tracing():
+            allocated = tracemalloc.get_traced_memory()[0] - frame[2]
+
+        name = "%s.%s" % (commandClassRef.__module__, commandClassRef.__qualname__)
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = {'calls': 0, 'errors': 0, 'totalTime': 0.0, 'selfTime': 0.0,
+                                            'maxTime': 0.0, 'allocatedBytes': 0}
+            stats['calls'] += 1
+            if error is not None:
+                stats['errors'] += 1
+            stats['totalTime'] += elapsed
+            stats['selfTime'] += elapsed - frame[1]
+            stats['maxTime'] = max(stats['maxTime'], elapsed)
+            stats['allocatedBytes'] += allocated
+
+    def getReport(self):
+        """
+        Get the statistics recorded so far.
+
+        @return: a dict of C{ICommand} class name to a dict of statistics
+        """
+        with self.lock:
+            return dict((name, dict(stats)) for name, stats in self.stats.items())
+
+    def reset(self):
+        """
+        Forget the statistics recorded so far.
+        """
+        with self.lock:
+            self.stats = {}
+
+    def toJSON(self, indent=None):
+        """
+        Serialize the report as JSON.
+
+        @param indent: the indentation, as for C{json.dumps} (optional)
+        @return: the JSON string
+        """
+        return json.dumps(self.getReport(), indent=indent, sort_keys=True)
+
+    def dumpJSON(self, fp, indent=2):
+        """
+        Write the report as JSON to a file.
+
+        @param fp: the file object to write to
+        @param indent: the indentation, as for C{json.dump} (optional)
+        """
+        json.dump(self.getReport(), fp, indent=indent, sort_keys=True)
+
+
+class CommandWatchdog(object):
+    """
+    Expires the C{AsyncCommand} executions taking longer than their C{timeout}.
+
+    A single daemon thread waits for the earliest deadline, whatever
+    the number of executions watched, and exits when none is left; it
+    calls the C{expire} method of an C{AsyncCommand} whose C{Future}
+    is not done by its deadline.
+
+    @see: L{Controller.watchCommand<puremvc.core.Controller.watchCommand>}
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self.deadlines = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def watch(self, commandInstance, future, timeout):
+        """
+        Expire an C{AsyncCommand} execution if not done within a timeout.
+
+        @param commandInstance: the C{AsyncCommand}
+        @param future: the C{Future} of its execution
+        @param timeout: the time it may take, in seconds
+        """
+        with self.condition:
+            heapq.heappush(self.deadlines, (time.monotonic() + timeout, next(self.sequence), commandInstance, future))
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="CommandWatchdog", daemon=True)
+                self.thread.start()
+            else:
+                self.condition.notify()
+
+    def run(self):
+        """
+        Wait for the deadlines and expire the executions not done by then.
+        """
+        while True:
+            expired = []
+            with self.condition:
+                now = time.monotonic()
+                while self.deadlines and (self.deadlines[0][3].done() or self.deadlines[0][0] <= now):
+                    deadline, sequence, commandInstance, future = heapq.heappop(self.deadlines)
+                    if not future.done():
+                        expired.append(commandInstance)
+                if not expired:
+                    if not self.deadlines:
+                        self.thread = None
+                        return
+                    self.condition.wait(self.deadlines[0][0] - now)
+                    continue
+
+            for commandInstance in expired:
+                try:
+                    commandInstance.expire()
+                except Exception:
+                    pass
+
+
+class ProxyFactory(object):
+    """
+    An C{IProxy} registered with the C{Model} to be built on first retrieval.
+
+    The C{IProxy}, once built, is held in the C{Model}'s C{proxyMap}
+    like any other, and also as C{proxy} here; C{lastUsed} is the
+    C{time.monotonic()} of its last retrieval. C{loads} and
+    C{evictions} count how many times it was built and evicted.
+
+    @see: L{Model.registerProxyFactory<puremvc.core.Model.registerProxyFactory>}
+    """
+
+    def __init__(self, proxyName, factory, idleTimeout=None):
+        """
+        Constructor.
+
+        @param proxyName: the name of the C{IProxy}
+        @param factory: the callable returning the C{IProxy}
+        @param idleTimeout: the time after which an unused C{IProxy} may be evicted, in seconds (optional)
+        """
+        self.proxyName = proxyName
+        self.factory = factory
+        self.idleTimeout = idleTimeout
+        self.proxy = None
+        self.ready = False
+        self.lastUsed = 0.0
+        self.loads = 0
+        self.evictions = 0
+        self.lock = threading.RLock()
+
+    def retrieve(self, model):
+        """
+        Get the C{IProxy}, building and registering it with the C{Model} if needed.
+
+        Other threads retrieving the C{IProxy} while it is built wait
+        until its C{onRegister} has returned.
+
+        @param model: the C{Model}
+        @return: the C{IProxy}
+        @raise ValueError: if the C{IProxy} built does not have the registered name
+        """
+        proxy = self.proxy
+        if proxy is not None and self.ready:
+            if self.idleTimeout is not None:
+                self.lastUsed = time.monotonic()
+            return proxy
+
+        with self.lock:
+            if self.proxy is not None:
+                self.lastUsed = time.monotonic()
+                return self.proxy
+
+            proxy = self.factory()
+            if proxy.getProxyName() != self.proxyName:
+                raise ValueError("Proxy factory for %r built a proxy named %r" % (self.proxyName, proxy.getProxyName()))
+            with model.proxyLock:
+                if model.proxyFactories.get(self.proxyName) is not self:
+                    return model.retrieveProxy(self.proxyName)
+                model.proxyMap[self.proxyName] = proxy
+            self.proxy = proxy
+            self.lastUsed = time.monotonic()
+            self.loads += 1
+            try:
+                proxy.onRegister()
+            finally:
+                self.ready = True
+
+        model.evictIdleProxies()
+        return proxy
+
+    def isIdle(self, now):
+        """
+        Check whether the C{IProxy} is built and has not been retrieved for C{idleTimeout} seconds.
+
+        @param now: the current C{time.monotonic()}
+        @return: C{True} if it may be evicted
+        """
+        return self.ready and self.idleTimeout is not None and now - self.lastUsed >= self.idleTimeout
+
+    def unload(self, model, now=None):
+        """
+        Remove the C{IProxy} from the C{Model}, if built, calling its C{onRemove}.
+
+        The factory stays registered, so the C{IProxy} is built again when next retrieved.
+
+        @param model: the C{Model}
+        @param now: if given, only unload if still idle at this C{time.monotonic()} (optional)
+        @return: the C{IProxy} removed, or C{None}
+        """
+        with self.lock:
+            proxy = self.proxy
+            if proxy is None or (now is not None and not self.isIdle(now)):
+                return None
+            with model.proxyLock:
+                if model.proxyMap.get(self.proxyName) is proxy:
+                    del model.proxyMap[self.proxyName]
+            self.proxy = None
+            self.ready = False
+            if now is not None:
+                self.evictions += 1
+        proxy.onRemove()
+        return proxy
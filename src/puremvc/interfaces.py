@@ -39,6 +39,14 @@ class INotifier(object):
         """
         raise NotImplementedError(self)
 
+    def sendNotifications(self, notifications):
+        """
+        Send a batch of C{INotification}s.
+
+        @param notifications: an iterable of C{(name, body, type)} tuples; body and type may be left out
+        """
+        raise NotImplementedError(self)
+
 
 class ICommand(INotifier):
     """
@@ -87,7 +95,7 @@ class IController(object):
         Register a particular C{ICommand} class as the handler for a particular C{INotification}.
 
         @param notificationName: the name of the C{INotification}
-        @param commandClassRef: the Class of the C{ICommand}
+        @param commandClassRef: the Class of the C{ICommand}, or its C{"package.module:ClassName"} import path
         """
         raise NotImplementedError(self)
 
@@ -149,6 +157,17 @@ class IFacade(INotifier):
         """
         raise NotImplementedError(self)
 
+    def notifyObserversBatch(self, notes):
+        """
+        Notify the C{IObserver}s of a batch of C{INotification}s.
+
+        NOTE: Use this method only if you are sending custom Notifications. Otherwise use the
+        sendNotifications method which does not require you to create the Notification instances.
+
+        @param notes: the list of C{INotification}s to notify C{IObserver}s of.
+        """
+        raise NotImplementedError(self)
+
     def registerProxy(self, proxy):
         """
         Register an C{IProxy} with the C{Model} by name.
@@ -628,6 +647,14 @@ class IView(object):
         """
         raise NotImplementedError(self)
 
+    def notifyObserversBatch(self, notifications):
+        """
+        Notify the C{IObservers} of a batch of C{INotification}s.
+
+        @param notifications: the list of C{INotification}s to notify C{IObservers} of.
+        """
+        raise NotImplementedError(self)
+
     def removeObserver(self, notificationName, notifyContext):
         """
         Remove a group of observers from the observer list for a given
@@ -4,6 +4,12 @@
  Your reuse is governed by the Creative Commons Attribution 3.0 License
 """
 
+import asyncio
+import concurrent.futures
+import inspect
+import threading
+
+import puremvc.core
 import puremvc.interfaces
 import puremvc.patterns.observer
 
@@ -25,11 +31,32 @@ class MacroCommand(puremvc.patterns.observer.Notifier, puremvc.interfaces.IComma
     calling C{addSubCommand} once for each I{SubCommand}
     to be executed.
 
+    A subclass may set C{cachePlan = True} to have its I{SubCommand}
+    list only built the first time the class is instantiated: it is
+    then resolved into an execution I{plan} shared by every instance of
+    the class, a tuple of factories in which the I{SubCommands} of
+    nested C{MacroCommand}s (caching their plan too) are inlined and
+    C{stateless} I{SubCommands} are instantiated once. Later instances
+    skip C{initializeMacroCommand} altogether, so it must only call
+    C{addSubCommand}, with the same I{SubCommands} every time, and set
+    no other state on the instance. Calling C{addSubCommand} on an
+    instance after construction gives that instance a list of its own,
+    executed as before.
+
+    The execution hooks of the controller of the C{MacroCommand}'s
+    C{facade}, if any, are called around each I{SubCommand}.
+
     @see: L{Controller<puremvc.core.controller.Controller>}
     @see: L{Notification<puremvc.patterns.observer.Notification>}
     @see: L{SimpleCommand<puremvc.patterns.command.SimpleCommand>}
     """
 
+    stateless = False
+    poolSize = 0
+    cachePlan = False
+
+    plans = {}
+
     def __init__(self):
         """
         MacroCommand Constructor
@@ -38,8 +65,59 @@ class MacroCommand(puremvc.patterns.observer.Notifier, puremvc.interfaces.IComma
         instead, override the C{initializeMacroCommand}
         method.
         """
+        puremvc.patterns.observer.Notifier.__init__(self)
+        self.plan = MacroCommand.plans.get(self.__class__) if self.cachePlan else None
+        if self.plan is not None:
+            self.subCommands = self.plan[0]
+            return
+
         self.subCommands = []
         self.initializeMacroCommand()
+        if self.cachePlan:
+            self.plan = (tuple(self.subCommands), MacroCommand.flattenSubCommands(self.subCommands))
+            self.subCommands = self.plan[0]
+            MacroCommand.plans[self.__class__] = self.plan
+
+    @staticmethod
+    def flattenSubCommands(subCommands):
+        """
+        Resolve a list of I{SubCommands} into a tuple of factories.
+
+        Calling each factory returns the C{ICommand} to C{execute}:
+        the class itself, or a function returning the single instance
+        of a C{stateless} class. The plans of nested C{MacroCommand}s
+        that cache their plan and keep the default constructor and
+        C{execute} are inlined.
+
+        @param subCommands: the C{ICommand} class references
+        @return: the tuple of factories
+        """
+        factories = []
+        for commandClassRef in subCommands:
+            if isinstance(commandClassRef, type) and issubclass(commandClassRef, MacroCommand) and \
+                    commandClassRef.cachePlan and commandClassRef.__init__ is MacroCommand.__init__ and \
+                    commandClassRef.execute is MacroCommand.execute:
+                plan = MacroCommand.plans.get(commandClassRef)
+                if plan is None:
+                    plan = commandClassRef().plan
+                factories.extend(plan[1])
+            elif getattr(commandClassRef, 'stateless', False):
+                factories.append(MacroCommand.sharedFactory(commandClassRef()))
+            else:
+                factories.append(commandClassRef)
+        return tuple(factories)
+
+    @staticmethod
+    def sharedFactory(commandInstance):
+        """
+        Make a factory returning the given instance.
+
+        @param commandInstance: the instance of a C{stateless} C{ICommand}
+        @return: the factory
+        """
+        def factory():
+            return commandInstance
+        return factory
 
     def initializeMacroCommand(self):
         """
@@ -64,6 +142,8 @@ class MacroCommand(puremvc.patterns.observer.Notifier, puremvc.interfaces.IComma
 
         @param commandClassRef: a reference to the C{Class} of the C{ICommand}.
         """
+        if isinstance(self.subCommands, tuple):
+            self.subCommands = list(self.subCommands)
         self.subCommands.append(commandClassRef)
 
 
@@ -76,9 +156,31 @@ class MacroCommand(puremvc.patterns.observer.Notifier, puremvc.interfaces.IComma
 
         @param notification: the C{INotification} object to be passed to each I{SubCommand}.
         """
+        hooks = getattr(getattr(self.facade, 'controller', None), 'executionHooks', None)
+        if hooks is not None:
+            # no inlining, so that each (nested) SubCommand is seen by the hooks
+            for commandClassRef in self.subCommands[:]:
+                puremvc.core.executeWithHooks(hooks, commandClassRef, notification,
+                                              lambda notification: commandClassRef().execute(notification))
+            return
+
+        plan = self.plan
+        if plan is not None and self.subCommands is plan[0]:
+            for factory in plan[1]:
+                factory().execute(notification)
+            return
+
         for commandClassRef in self.subCommands[:]:
             commandClassRef().execute(notification)
 
+    def reset(self):
+        """
+        Return a pooled instance to the state of a new one.
+
+        The I{SubCommand} list is kept. See C{SimpleCommand.reset}.
+        """
+        pass
+
 
 class SimpleCommand(puremvc.patterns.observer.Notifier, puremvc.interfaces.ICommand, puremvc.interfaces.INotifier):
     """
@@ -87,11 +189,45 @@ class SimpleCommand(puremvc.patterns.observer.Notifier, puremvc.interfaces.IComm
     Your subclass should override the C{execute}
     method where your business logic will handle the C{INotification}.
 
+    By default the C{Controller} creates a new instance for every
+    C{INotification}. A subclass whose C{execute} keeps no state on
+    the instance may set C{stateless = True} to have a single instance
+    reused for all of them; one that does may set C{poolSize} to have
+    instances reused from a pool of up to that many, overriding
+    C{reset} to clear that state between uses.
+
+    A CPU-bound subclass may set C{runInProcess = True} to be executed
+    in a worker process of the C{Controller}'s process pool: the value
+    its C{execute} returns is sent back as the C{resultNotification},
+    and an exception it raises as the C{errorNotification} (see
+    C{Controller.setProcessPool}). Its C{execute} must then only rely on
+    the C{INotification}, not on the C{Facade}, which in the worker is
+    a separate, empty one.
+
+    A subclass whose C{execute} is a pure function of the
+    C{INotification}, such as a query, may set C{memoize = True} to
+    have its results cached: the C{Controller} then skips C{execute}
+    for an C{INotification} it has seen before and sends the cached
+    result as the C{resultNotification}. C{memoKey}, C{memoSize},
+    C{memoTTL} and C{memoInvalidatedBy} tune the cache (see
+    L{CommandMemo<puremvc.core.CommandMemo>}).
+
     @see: L{Controller<puremvc.core.controller.Controller>}
     @see: L{Notification<puremvc.patterns.observer.Notification>}
     @see: L{MacroCommand<puremvc.patterns.command.MacroCommand>}
     """
 
+    stateless = False
+    poolSize = 0
+    runInProcess = False
+    resultNotification = None
+    errorNotification = None
+    memoize = False
+    memoKey = None
+    memoSize = 128
+    memoTTL = None
+    memoInvalidatedBy = ()
+
     def execute(self, notification):
         """
         Fulfill the use-case initiated by the given C{INotification}.
@@ -104,3 +240,625 @@ class SimpleCommand(puremvc.patterns.observer.Notifier, puremvc.interfaces.IComm
         @param notification: the C{INotification} to handle.
         """
         pass
+
+    def executeBatch(self, notifications):
+        """
+        Fulfill the use-case for a batch of C{INotification}s sharing the same name.
+
+        The C{Controller} creates a single instance and hands it the
+        whole batch. Override this method to handle the batch in one go;
+        by default this instance C{execute}s the first C{INotification}
+        and a new instance of the same class is created to C{execute}
+        each of the others, just as if they had been sent one by one.
+
+        @param notifications: the list of C{INotification}s to handle.
+        """
+        self.execute(notifications[0])
+        for notification in notifications[1:]:
+            (self if self.stateless else self.__class__()).execute(notification)
+
+    def reset(self):
+        """
+        Return a pooled instance to the state of a new one.
+
+        Called by the C{Controller} after each use of an instance of a
+        class with a C{poolSize}, before it goes back to the pool.
+        Override to clear whatever C{execute} leaves on the instance.
+        """
+        pass
+
+
+class ParallelMacroCommand(MacroCommand):
+    """
+    A C{MacroCommand} that executes independent I{SubCommands} concurrently.
+
+    Each I{SubCommand} may be added with the I{SubCommands} it depends
+    on, which must have been added before it, so they form a directed
+    acyclic graph. A I{SubCommand} starts as soon as all of its
+    dependencies have completed, on a thread of the C{executor} or, with
+    C{useAsyncio}, as an asyncio task: C{execute} then returns a
+    coroutine, to be awaited (the C{AsyncController} does) and a
+    I{SubCommand}'s C{execute} may itself be a coroutine. Called with no
+    event loop running, as by the C{Controller} or a C{MacroCommand},
+    C{execute} instead runs that coroutine to completion on an event
+    loop of its own.
+
+    A failing I{SubCommand} does not stop the independent ones, but the
+    ones depending on it, directly or not, are skipped. Once all are
+    done, the C{completeNotification} is sent, if set, with the list of
+    C{(commandClassRef, exception)} failures as its body and the name of
+    the original C{INotification} as its type; then, if any failed, a
+    C{ParallelCommandError} aggregating them is raised.
+
+    By default each execution runs on a thread pool of its own, of up
+    to C{maxWorkers} threads. A shared C{executor} may be set instead;
+    it must then have enough threads for nested C{ParallelMacroCommand}s,
+    which wait for their I{SubCommands} on one of them.
+
+    @see: L{MacroCommand<puremvc.patterns.command.MacroCommand>}
+    """
+
+    cachePlan = False
+    executor = None
+    maxWorkers = None
+    useAsyncio = False
+    completeNotification = None
+
+    def __init__(self):
+        """
+        ParallelMacroCommand Constructor
+
+        You should not need to define a constructor,
+        instead, override the C{initializeMacroCommand}
+        method.
+        """
+        self.dependencies = []
+        MacroCommand.__init__(self)
+
+    def addSubCommand(self, commandClassRef, dependsOn=()):
+        """
+        Add a I{SubCommand}.
+
+        @param commandClassRef: a reference to the C{Class} of the C{ICommand}.
+        @param dependsOn: the C{Class}es of I{SubCommands} already added that must complete before this one starts (optional)
+        """
+        for dependency in dependsOn:
+            if dependency not in self.subCommands:
+                raise ValueError("%r depends on %r, which has not been added" % (commandClassRef, dependency))
+        MacroCommand.addSubCommand(self, commandClassRef)
+        self.dependencies.append(tuple(dependsOn))
+
+    def execute(self, notification):
+        """
+        Execute this C{ParallelMacroCommand}'s I{SubCommands}.
+
+        @param notification: the C{INotification} object to be passed to each I{SubCommand}.
+        @return: a coroutine to await if C{useAsyncio} is set and an event loop is running, otherwise C{None}
+        @raise ParallelCommandError: if any I{SubCommand} failed
+        """
+        if self.useAsyncio:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                # nothing would await the coroutine
+                return asyncio.run(self.executeTasks(notification))
+            return self.executeTasks(notification)
+
+        waiting, dependents = self.resolveDependencies()
+        executor = self.executor
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(self.maxWorkers)
+
+        errors = []
+        running = {}
+        try:
+            while True:
+                for index in [index for index, dependencies in waiting.items() if not dependencies]:
+                    del waiting[index]
+                    running[executor.submit(self.executeSubCommand, index, notification)] = index
+                if not running:
+                    break
+
+                done, pending = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    if future.exception() is not None:
+                        errors.append((self.subCommands[index], future.exception()))
+                        continue
+                    for dependent in dependents[index]:
+                        waiting[dependent].discard(index)
+        finally:
+            if self.executor is None:
+                executor.shutdown()
+
+        self.completeExecution(notification, errors, waiting)
+
+    async def executeTasks(self, notification):
+        """
+        Execute this C{ParallelMacroCommand}'s I{SubCommands} as asyncio tasks.
+
+        @param notification: the C{INotification} object to be passed to each I{SubCommand}.
+        @raise ParallelCommandError: if any I{SubCommand} failed
+        """
+        waiting, dependents = self.resolveDependencies()
+
+        errors = []
+        running = {}
+        while True:
+            for index in [index for index, dependencies in waiting.items() if not dependencies]:
+                del waiting[index]
+                running[asyncio.ensure_future(self.executeSubCommandTask(index, notification))] = index
+            if not running:
+                break
+
+            done, pending = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = running.pop(task)
+                if task.exception() is not None:
+                    errors.append((self.subCommands[index], task.exception()))
+                    continue
+                for dependent in dependents[index]:
+                    waiting[dependent].discard(index)
+
+        self.completeExecution(notification, errors, waiting)
+
+    def resolveDependencies(self):
+        """
+        Resolve the dependencies between I{SubCommands} by position.
+
+        @return: a dict mapping each I{SubCommand}'s index to the set of indexes it waits for, and a list of the indexes depending on each one
+        """
+        waiting = {}
+        dependents = [[] for commandClassRef in self.subCommands]
+        for index, dependsOn in enumerate(self.dependencies):
+            waiting[index] = set(dependency for dependency in range(index)
+                                 if self.subCommands[dependency] in dependsOn)
+            for dependency in waiting[index]:
+                dependents[dependency].append(index)
+        return waiting, dependents
+
+    def executeSubCommand(self, index, notification):
+        """
+        Execute one I{SubCommand}.
+
+        @param index: the position of the I{SubCommand}
+        @param notification: the C{INotification} object to be passed to it
+        """
+        commandClassRef = self.subCommands[index]
+        hooks = getattr(getattr(self.facade, 'controller', None), 'executionHooks', None)
+        if hooks is not None:
+            puremvc.core.executeWithHooks(hooks, commandClassRef, notification,
+                                          lambda notification: commandClassRef().execute(notification))
+            return
+        commandClassRef().execute(notification)
+
+    async def executeSubCommandTask(self, index, notification):
+        """
+        Execute one I{SubCommand}, awaiting it if its C{execute} is a coroutine.
+
+        @param index: the position of the I{SubCommand}
+        @param notification: the C{INotification} object to be passed to it
+        """
+        result = self.subCommands[index]().execute(notification)
+        if inspect.isawaitable(result):
+            await result
+
+    def completeExecution(self, notification, errors, skipped):
+        """
+        Send the C{completeNotification} and raise the failures.
+
+        @param notification: the C{INotification} the I{SubCommands} were executed with
+        @param errors: the list of C{(commandClassRef, exception)} failures
+        @param skipped: the indexes of the I{SubCommands} skipped because a dependency failed
+        @raise ParallelCommandError: if any I{SubCommand} failed
+        """
+        if self.completeNotification is not None:
+            self.sendNotification(self.completeNotification, errors, notification.getName())
+        if errors:
+            raise ParallelCommandError(errors, [self.subCommands[index] for index in sorted(skipped)])
+
+
+class AsyncCommand(SimpleCommand):
+    """
+    A C{SimpleCommand} whose work completes after C{execute} returns.
+
+    C{execute} returns a C{concurrent.futures.Future} of the result:
+    the sender may wait for it, add a completion callback to it with
+    C{add_done_callback}, or cancel it. The work is started by C{start},
+    which by default submits C{run} to the C{executor}, a thread pool
+    shared by all C{AsyncCommand}s of up to C{maxWorkers} threads unless
+    one is set; a subclass may instead override C{start} to kick off the
+    work some other way, and call C{complete} or C{fail} when it is done.
+
+    While it runs, the work should check C{token}, the
+    C{CancellationToken} of the execution, and stop once it is
+    cancelled: by C{cancel}, by cancelling the C{Future}, or by the
+    C{Controller} when the execution takes longer than C{timeout}
+    seconds, in which case the C{Future} fails with a
+    C{CommandTimeoutError}.
+
+    The C{Controller} keeps track of the executions in progress (see
+    C{Controller.getPendingCommands}) and, once the C{Future} is done,
+    sends the result as the C{resultNotification} or the exception as
+    the C{errorNotification}, if set. An C{AsyncCommand} must not be
+    C{stateless} or pooled.
+
+    @see: L{AsyncMacroCommand<puremvc.patterns.command.AsyncMacroCommand>}
+    @see: L{CancellationToken<puremvc.patterns.command.CancellationToken>}
+    """
+
+    asyncCommand = True
+    timeout = None
+    executor = None
+    maxWorkers = None
+
+    sharedExecutor = None
+    sharedExecutorLock = threading.Lock()
+
+    future = None
+    token = None
+
+    def execute(self, notification):
+        """
+        Start the work for the given C{INotification}.
+
+        @param notification: the C{INotification} to handle.
+        @return: the C{concurrent.futures.Future} of the result
+        """
+        self.future = concurrent.futures.Future()
+        self.token = CancellationToken()
+        self.future.add_done_callback(self.futureDone)
+        try:
+            self.start(notification)
+        except Exception as e:
+            self.fail(e)
+        return self.future
+
+    def start(self, notification):
+        """
+        Kick off the work, which must end with C{complete} or C{fail}.
+
+        By default submits C{run} to the C{executor}; a task still
+        queued when the execution is cancelled is dropped.
+
+        @param notification: the C{INotification} to handle.
+        """
+        executor = self.executor
+        if executor is None:
+            executor = AsyncCommand.getSharedExecutor(self.maxWorkers)
+        task = executor.submit(self.runTask, notification)
+        self.token.addCallback(task.cancel)
+
+    def run(self, notification):
+        """
+        Do the work, on a thread of the C{executor}.
+
+        Override to fulfill the use-case; long-running work should check
+        C{token} and return early once it is cancelled.
+
+        @param notification: the C{INotification} to handle.
+        @return: the result
+        """
+        return None
+
+    def runTask(self, notification):
+        """
+        Call C{run} and complete the C{Future} with its outcome.
+
+        @param notification: the C{INotification} to handle.
+        """
+        if self.token.isCancelled():
+            return
+        try:
+            result = self.run(notification)
+        except Exception as e:
+            self.fail(e)
+        else:
+            self.complete(result)
+
+    def complete(self, result=None):
+        """
+        Complete the execution with a result.
+
+        @param result: the result
+        @return: C{False} if the execution was already done, cancelled or timed out
+        """
+        try:
+            self.future.set_result(result)
+        except concurrent.futures.InvalidStateError:
+            return False
+        return True
+
+    def fail(self, error):
+        """
+        Complete the execution with an exception.
+
+        @param error: the exception
+        @return: C{False} if the execution was already done, cancelled or timed out
+        """
+        try:
+            self.future.set_exception(error)
+        except concurrent.futures.InvalidStateError:
+            return False
+        return True
+
+    def cancel(self):
+        """
+        Cancel the execution.
+
+        @return: C{False} if the execution was already done
+        """
+        cancelled = self.future.cancel()
+        self.token.cancel()
+        return cancelled
+
+    def expire(self):
+        """
+        Fail the execution with a C{CommandTimeoutError} and cancel its work.
+
+        Called by the C{Controller} once C{timeout} seconds have elapsed.
+        """
+        self.fail(CommandTimeoutError("%s timed out after %s seconds" % (self.__class__.__name__, self.timeout)))
+        self.token.cancel()
+
+    def futureDone(self, future):
+        """
+        Cancel the C{token} when the C{Future} is cancelled.
+
+        @param future: the C{Future} of the execution
+        """
+        if future.cancelled():
+            self.token.cancel()
+
+    @staticmethod
+    def getSharedExecutor(maxWorkers=None):
+        """
+        Get the thread pool shared by C{AsyncCommand}s without an C{executor}.
+
+        @param maxWorkers: the number of threads, if the pool is not created yet (optional)
+        @return: the C{concurrent.futures.ThreadPoolExecutor}
+        """
+        if AsyncCommand.sharedExecutor is None:
+            with AsyncCommand.sharedExecutorLock:
+                if AsyncCommand.sharedExecutor is None:
+                    AsyncCommand.sharedExecutor = concurrent.futures.ThreadPoolExecutor(
+                        maxWorkers, thread_name_prefix="AsyncCommand")
+        return AsyncCommand.sharedExecutor
+
+
+class AsyncMacroCommand(AsyncCommand):
+    """
+    An C{AsyncCommand} that executes other C{ICommand}s one after the other.
+
+    Like a C{MacroCommand}, your subclass should override the
+    C{initializeMacroCommand} method, calling C{addSubCommand} once for
+    each I{SubCommand} to be executed. A I{SubCommand} that returns a
+    C{Future}, such as an C{AsyncCommand}, is waited for without
+    blocking a thread before the next one is executed, on the thread
+    completing that C{Future}; its own C{timeout} is enforced by the
+    controller of the C{AsyncMacroCommand}'s C{facade}, which sees the
+    I{SubCommands} in progress. The first I{SubCommands} are executed
+    by C{execute}.
+
+    The execution completes once the last I{SubCommand} has; it fails
+    with the exception of the first I{SubCommand} failing, and the
+    remaining ones are not executed. Cancelling it, or its timing out,
+    cancels the I{SubCommand} in progress.
+
+    @see: L{AsyncCommand<puremvc.patterns.command.AsyncCommand>}
+    @see: L{MacroCommand<puremvc.patterns.command.MacroCommand>}
+    """
+
+    def __init__(self):
+        """
+        AsyncMacroCommand Constructor
+
+        You should not need to define a constructor,
+        instead, override the C{initializeMacroCommand}
+        method.
+        """
+        puremvc.patterns.observer.Notifier.__init__(self)
+        self.subCommands = []
+        self.initializeMacroCommand()
+
+    def initializeMacroCommand(self):
+        """
+        Initialize the C{AsyncMacroCommand}.
+
+        In your subclass, override this method to
+        initialize the C{AsyncMacroCommand}'s I{SubCommand}
+        list with C{ICommand} class references.
+        """
+        pass
+
+    def addSubCommand(self, commandClassRef):
+        """
+        Add a I{SubCommand}.
+
+        The I{SubCommands} will be called in First In/First Out (FIFO)
+        order.
+
+        @param commandClassRef: a reference to the C{Class} of the C{ICommand}.
+        """
+        self.subCommands.append(commandClassRef)
+
+    def start(self, notification):
+        """
+        Execute the first I{SubCommand}.
+
+        @param notification: the C{INotification} object to be passed to each I{SubCommand}.
+        """
+        self.executeSubCommands(notification, 0)
+
+    def executeSubCommands(self, notification, index):
+        """
+        Execute the I{SubCommands} from a position on, until one returns a C{Future}.
+
+        @param notification: the C{INotification} object to be passed to each I{SubCommand}
+        @param index: the position of the next I{SubCommand}
+        """
+        controller = getattr(self.facade, 'controller', None)
+        while index < len(self.subCommands):
+            if self.token.isCancelled():
+                return
+            commandClassRef = self.subCommands[index]
+            index += 1
+            try:
+                commandInstance = commandClassRef()
+                hooks = getattr(controller, 'executionHooks', None)
+                if hooks is None:
+                    result = commandInstance.execute(notification)
+                else:
+                    result = puremvc.core.executeWithHooks(hooks, commandClassRef, notification, commandInstance.execute)
+            except Exception as e:
+                self.fail(e)
+                return
+
+            if isinstance(result, concurrent.futures.Future):
+                if controller is not None and getattr(commandInstance, 'asyncCommand', False):
+                    controller.watchCommand(commandInstance, result)
+                self.token.addCallback(result.cancel)
+                result.add_done_callback(lambda future: self.subCommandDone(notification, index, future))
+                return
+        self.complete(None)
+
+    def subCommandDone(self, notification, index, future):
+        """
+        Go on with the next I{SubCommand} once one returning a C{Future} is done.
+
+        @param notification: the C{INotification} object to be passed to each I{SubCommand}
+        @param index: the position of the next I{SubCommand}
+        @param future: the C{Future} of the I{SubCommand} done
+        """
+        self.token.removeCallback(future.cancel)
+        if future.cancelled():
+            self.fail(CommandCancelledError("sub-command of %s cancelled" % self.__class__.__name__))
+        elif future.exception() is not None:
+            self.fail(future.exception())
+        else:
+            self.executeSubCommands(notification, index)
+
+
+class CancellationToken(object):
+    """
+    The cancellation state of an C{AsyncCommand} execution.
+
+    Work in progress checks C{isCancelled}, or calls
+    C{raiseIfCancelled}, at convenient points, and may C{wait} on the
+    token instead of sleeping so as to wake up when it is cancelled.
+    Callbacks added with C{addCallback} are called, once, on
+    cancellation.
+
+    @see: L{AsyncCommand<puremvc.patterns.command.AsyncCommand>}
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self.cancelled = threading.Event()
+        self.callbacks = []
+        self.lock = threading.Lock()
+
+    def cancel(self):
+        """
+        Cancel, calling the callbacks if not cancelled already.
+        """
+        with self.lock:
+            if self.cancelled.is_set():
+                return
+            self.cancelled.set()
+            callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def isCancelled(self):
+        """
+        Check whether cancelled.
+
+        @return: C{True} once cancelled
+        """
+        return self.cancelled.is_set()
+
+    def raiseIfCancelled(self):
+        """
+        Raise a C{CommandCancelledError} if cancelled.
+
+        @raise CommandCancelledError: if cancelled
+        """
+        if self.cancelled.is_set():
+            raise CommandCancelledError("cancelled")
+
+    def wait(self, timeout=None):
+        """
+        Wait until cancelled, or the timeout elapses.
+
+        @param timeout: the time to wait at most, in seconds (optional)
+        @return: C{True} if cancelled
+        """
+        return self.cancelled.wait(timeout)
+
+    def addCallback(self, callback):
+        """
+        Add a callable to call on cancellation; it is called right away if already cancelled.
+
+        @param callback: the callable, taking no argument
+        """
+        with self.lock:
+            if not self.cancelled.is_set():
+                self.callbacks.append(callback)
+                return
+        callback()
+
+    def removeCallback(self, callback):
+        """
+        Remove a callable added with C{addCallback}.
+
+        @param callback: the callable
+        """
+        with self.lock:
+            if callback in self.callbacks:
+                self.callbacks.remove(callback)
+
+
+class ParallelCommandError(Exception):
+    """
+    The failures of the I{SubCommands} of a C{ParallelMacroCommand}.
+
+    C{errors} is the list of C{(commandClassRef, exception)} failures,
+    in the order they completed, and C{skipped} the list of the
+    C{Class}es of the I{SubCommands} skipped because one of their
+    dependencies failed.
+
+    @see: L{ParallelMacroCommand<puremvc.patterns.command.ParallelMacroCommand>}
+    """
+
+    def __init__(self, errors, skipped):
+        """
+        Constructor.
+
+        @param errors: the list of C{(commandClassRef, exception)} failures
+        @param skipped: the list of skipped I{SubCommand} C{Class}es
+        """
+        Exception.__init__(self, "%d sub-command(s) failed, %d skipped: %s" % (
+            len(errors), len(skipped), ", ".join("%s: %r" % (commandClassRef.__name__, error) for commandClassRef, error in errors)))
+        self.errors = errors
+        self.skipped = skipped
+
+
+class CommandCancelledError(Exception):
+    """
+    The failure of an C{AsyncCommand} execution cancelled while in progress.
+
+    @see: L{CancellationToken<puremvc.patterns.command.CancellationToken>}
+    """
+    pass
+
+
+class CommandTimeoutError(CommandCancelledError):
+    """
+    The failure of an C{AsyncCommand} execution taking longer than its C{timeout}.
+
+    @see: L{AsyncCommand<puremvc.patterns.command.AsyncCommand>}
+    """
+    pass
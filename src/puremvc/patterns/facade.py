@@ -4,6 +4,10 @@
  Your reuse is governed by the Creative Commons Attribution 3.0 License
 """
 
+import heapq
+import itertools
+import threading
+
 import puremvc.core
 import puremvc.interfaces
 import puremvc.patterns.observer
@@ -23,6 +27,13 @@ class Facade(puremvc.interfaces.IFacade):
 
     Providing a single point of contact to the application for registering C{Commands} and notifying C{Observers}
 
+    Optionally queueing C{INotification}s by priority and delivering them
+    breadth-first, one at a time, instead of recursively (see C{setQueued}).
+
+    Optionally coalescing repeated C{INotification}s with the same name
+    sent within one dispatch cycle or time window into a single
+    delivery (see C{setCoalescing}).
+
 
     @see: L{Model<org.puremvc.as3.core.model.Model>}
     @see: L{View<org.puremvc.as3.core.view.View>}
@@ -35,19 +46,35 @@ class Facade(puremvc.interfaces.IFacade):
     """
 
     instance = None
+    instanceLock = threading.RLock()
+    initialized = False
     controller = None
     model = None
     view = None
+    notificationQueue = None
+    profiler = None
+
+    DEFAULT_MAX_DEPTH = 100
+
+    COALESCE_LAST = "last"
+    COALESCE_MERGE = "merge"
+    COALESCE_COUNT = "count"
 
     def __new__(cls, *args, **kwargs):
         """
         This C{IFacade} implementation is a Singleton, so you should not call the constructor
         directly, but instead call the static Singleton method C{Facade.getInstance()}
         """
-        if not cls.instance or not isinstance(cls.instance, cls):
-            cls.instance = super(Facade, cls).__new__(cls, *args, **kwargs)
-            cls.instance.initializeFacade()
-        return cls.instance
+        instance = cls.instance
+        if instance is not None and isinstance(instance, cls) and instance.initialized:
+            return instance
+
+        with cls.instanceLock:
+            if not cls.instance or not isinstance(cls.instance, cls):
+                cls.instance = super(Facade, cls).__new__(cls, *args, **kwargs)
+                cls.instance.initializeFacade()
+                cls.instance.initialized = True
+            return cls.instance
 
     @staticmethod
     def getInstance():
@@ -66,6 +93,20 @@ class Facade(puremvc.interfaces.IFacade):
         subclass to do any subclass specific initializations. Be
         sure to call C{Facade.initializeFacade()}, though.
         """
+        self.notificationQueue = None
+        self.queueLock = threading.RLock()
+        self.queueSequence = itertools.count()
+        self.priorityMap = {}
+        self.maxDepth = self.DEFAULT_MAX_DEPTH
+        self.autoFlush = True
+        self.drainingThread = None
+        self.deliveryDepth = 0
+        self.coalesceMap = {}
+        self.coalesceLock = threading.RLock()
+        self.coalesceStats = {}
+        self.cycleState = threading.local()
+        self.windowPending = {}
+        self.windowTimers = {}
         self.initializeController()
         self.initializeModel()
         self.initializeView()
@@ -153,17 +194,28 @@ class Facade(puremvc.interfaces.IFacade):
         Register an C{ICommand} with the C{Controller} by Notification name.
 
         @param notificationName: the name of the C{INotification} to associate the C{ICommand} with
-        @param commandClassRef: a reference to the Class of the C{ICommand}
+        @param commandClassRef: a reference to the Class of the C{ICommand}, or its C{"package.module:ClassName"} import path, imported on first use
         """
         self.controller.registerCommand(notificationName, commandClassRef)
 
-    def removeCommand(self, notificationName):
+    def addCommand(self, notificationName, commandClassRef, priority=0):
+        """
+        Add an C{ICommand} to those the C{Controller} executes for a Notification name.
+
+        @param notificationName: the name of the C{INotification} to associate the C{ICommand} with
+        @param commandClassRef: a reference to the Class of the C{ICommand}, or its C{"package.module:ClassName"} import path, imported on first use
+        @param priority: the C{ICommand}s of higher priority are executed first (optional)
+        """
+        self.controller.addCommand(notificationName, commandClassRef, priority)
+
+    def removeCommand(self, notificationName, commandClassRef=None):
         """
         Remove a previously registered C{ICommand} to C{INotification} mapping from the Controller.
 
         @param notificationName: the name of the C{INotification} to remove the C{ICommand} mapping for
+        @param commandClassRef: the C{ICommand} to remove of those added for the name; all of them by default (optional)
         """
-        self.controller.removeCommand(notificationName)
+        self.controller.removeCommand(notificationName, commandClassRef)
 
     def hasCommand(self, notificationName):
         """
@@ -174,6 +226,56 @@ class Facade(puremvc.interfaces.IFacade):
         """
         return self.controller.hasCommand(notificationName)
 
+    def startProfiling(self, trackAllocations=False):
+        """
+        Start profiling the execution of C{ICommand}s.
+
+        Installs a C{CommandProfiler} as an execution hook of the
+        C{Controller}, replacing the current one, if any.
+
+        @param trackAllocations: whether to record allocation deltas with C{tracemalloc} (optional)
+        @return: the C{CommandProfiler}
+        """
+        self.stopProfiling()
+        profiler = puremvc.core.CommandProfiler(trackAllocations)
+        profiler.start()
+        self.controller.addExecutionHook(profiler)
+        self.profiler = profiler
+        return profiler
+
+    def stopProfiling(self):
+        """
+        Stop profiling the execution of C{ICommand}s.
+
+        @return: the C{CommandProfiler}, holding the report, or C{None} if not profiling
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            self.controller.removeExecutionHook(profiler)
+            profiler.stop()
+            self.profiler = None
+        return profiler
+
+    def getProfileReport(self):
+        """
+        Get the report of the current C{CommandProfiler}.
+
+        @return: a dict of C{ICommand} class name to a dict of statistics, or C{None} if not profiling
+        """
+        if self.profiler is None:
+            return None
+        return self.profiler.getReport()
+
+    def setProcessPool(self, executor):
+        """
+        Set the executor the C{Controller} runs C{runInProcess} C{ICommand}s on.
+
+        Their result C{INotification}s are sent through this C{Facade}.
+
+        @param executor: usually a C{concurrent.futures.ProcessPoolExecutor}, or C{None}
+        """
+        self.controller.setProcessPool(executor, self.notifyObservers if executor is not None else None)
+
     def registerProxy(self, proxy):
         """
         Register an C{IProxy} with the C{Model} by name.
@@ -182,6 +284,16 @@ class Facade(puremvc.interfaces.IFacade):
         """
         self.model.registerProxy(proxy)
 
+    def registerProxyFactory(self, proxyName, factory, idleTimeout=None):
+        """
+        Register with the C{Model} a factory building an C{IProxy} when it is first retrieved.
+
+        @param proxyName: the name of the C{IProxy}
+        @param factory: the callable returning the C{IProxy}, usually its C{Class}
+        @param idleTimeout: the time after which an unused C{IProxy} may be unloaded, in seconds (optional)
+        """
+        self.model.registerProxyFactory(proxyName, factory, idleTimeout)
+
     def retrieveProxy(self, proxyName):
         """
         Retrieve an C{IProxy} from the C{Model} by name.
@@ -259,12 +371,76 @@ class Facade(puremvc.interfaces.IFacade):
         @param notificationName: the name of the notification to send
         @param body: the body of the notification (optional)
         @param noteType: the type of the notification (optional)
+        @return: whatever C{notifyObservers} returns, or C{None} when the notification is coalesced
         """
-        self.notifyObservers(
-            puremvc.patterns.observer.Notification(
-                notificationName, body, noteType
+        if not self.coalesceMap:
+            return self.notifyObservers(
+                puremvc.patterns.observer.Notification(
+                    notificationName, body, noteType
+                )
             )
-        )
+
+        self.beginCycle()
+        try:
+            policy = self.coalesceMap.get(notificationName)
+            notification = puremvc.patterns.observer.Notification(notificationName, body, noteType)
+            if policy is None:
+                return self.notifyObservers(notification)
+            self.coalesceNotification(notification, policy)
+        finally:
+            self.endCycle()
+
+    def sendNotifications(self, notifications):
+        """
+        Create and send a batch of C{INotification}s.
+
+        The batch is broadcast with C{notifyObserversBatch}, so the
+        observers for each run of notifications with the same name are
+        looked up once, and C{Mediator}s and C{SimpleCommand}s handling
+        batches get the whole run in a single call.
+
+        The C{INotification}s with a name set to be coalesced (see
+        C{setCoalescing}) are taken out of the batch and coalesced, as
+        C{sendNotification} would.
+
+        @param notifications: an iterable of C{(name, body, type)} tuples; body and type may be left out
+        """
+        Notification = puremvc.patterns.observer.Notification
+        notifications = [Notification(*item) for item in notifications]
+        if not self.coalesceMap:
+            self.notifyObserversBatch(notifications)
+            return
+
+        self.beginCycle()
+        try:
+            batch = []
+            for notification in notifications:
+                policy = self.coalesceMap.get(notification.getName())
+                if policy is None:
+                    batch.append(notification)
+                else:
+                    self.coalesceNotification(notification, policy)
+            if batch:
+                self.notifyObserversBatch(batch)
+        finally:
+            self.endCycle()
+
+    def notifyObserversBatch(self, notifications):
+        """
+        Notify C{Observer}s of a batch of C{INotification}s.
+
+        When queueing is turned on the batch is queued instead, each run
+        of C{INotification}s with the same name as one entry (see
+        C{enqueueNotificationBatch}).
+
+        @param notifications: the list of C{INotification}s to have the C{View} notify C{Observers} of.
+        """
+        if self.notificationQueue is not None:
+            self.enqueueNotificationBatch(notifications)
+            return
+
+        if self.view is not None:
+            self.view.notifyObserversBatch(notifications)
 
     def notifyObservers(self, notification):
         """
@@ -278,7 +454,420 @@ class Facade(puremvc.interfaces.IFacade):
         and pass the parameters, never having to
         construct the notification yourself.
 
+        When queueing is turned on the C{INotification} is queued instead
+        (see C{setQueued}).
+
         @param notification: the C{INotification} to have the C{View} notify C{Observers} of.
+        @return: the C{FanOutReport} (or its C{Future}) when the C{View} fans the observers out, otherwise C{None}
+        """
+        if self.notificationQueue is not None:
+            self.enqueueNotification(notification)
+            return None
+
+        if self.view is not None:
+            return self.view.notifyObservers(notification)
+
+    def setQueued(self, queued, maxDepth=None, autoFlush=True):
+        """
+        Turn queued, breadth-first delivery on or off.
+
+        By default an C{INotification} sent from a handler is delivered
+        inside the handler's call, before the handler returns, so
+        cascades of notifications recurse ever deeper. When queued, each
+        C{INotification} is pushed on a priority queue instead, and a
+        single drain loop delivers one queued C{INotification} at a time,
+        running all of its observers to completion before taking the
+        next one: highest priority first (see C{setPriority}), then in
+        the order they were sent.
+
+        With C{autoFlush} the C{INotification}s are drained as soon as
+        they are sent from outside a drain; otherwise they wait for
+        C{flush} to be called. Notifications sent from other threads
+        while one thread drains the queue are delivered by that thread.
+
+        @param queued: whether C{notifyObservers} should queue C{INotification}s
+        @param maxDepth: the longest chain of notifications sent from handlers of queued notifications before C{RuntimeError} is raised (optional)
+        @param autoFlush: whether sending outside a drain drains the queue at once (optional)
+        """
+        with self.queueLock:
+            if maxDepth is not None:
+                self.maxDepth = maxDepth
+            self.autoFlush = autoFlush
+            if queued and self.notificationQueue is None:
+                self.notificationQueue = []
+                return
+
+        if not queued and self.notificationQueue is not None:
+            self.flush()
+            self.notificationQueue = None
+
+    def setPriority(self, notificationName, priority):
+        """
+        Set the priority queued C{INotification}s with a given name are delivered with.
+
+        Notifications with a higher priority are delivered first; the
+        default priority is 0.
+
+        @param notificationName: the name of the C{INotification}s
+        @param priority: the priority, or C{None} to go back to the default
+        """
+        with self.queueLock:
+            priorityMap = dict(self.priorityMap)
+            if priority is None:
+                priorityMap.pop(notificationName, None)
+            else:
+                priorityMap[notificationName] = priority
+            self.priorityMap = priorityMap
+
+    def enqueueNotification(self, notification, priority=None):
+        """
+        Queue an C{INotification} for delivery, draining the queue unless already draining.
+
+        @param notification: the C{INotification} to queue
+        @param priority: the priority to deliver it with, overriding the one set for its name (optional)
+        """
+        if priority is None:
+            priority = self.priorityMap.get(notification.getName(), 0)
+
+        with self.queueLock:
+            depth = self.queueDepth(notification.getName())
+            heapq.heappush(self.notificationQueue, (-priority, next(self.queueSequence), depth, notification))
+
+        if self.autoFlush:
+            self.flush()
+
+    def enqueueNotificationBatch(self, notifications):
+        """
+        Queue a batch of C{INotification}s for delivery, draining the queue unless already draining.
+
+        Each run of consecutive C{INotification}s with the same name is
+        queued as one entry, with the priority set for that name, and is
+        delivered with the C{View}'s C{notifyObserversBatch}.
+
+        @param notifications: the list of C{INotification}s to queue
+        """
+        with self.queueLock:
+            start = 0
+            while start < len(notifications):
+                notificationName = notifications[start].getName()
+                end = start + 1
+                while end < len(notifications) and notifications[end].getName() == notificationName:
+                    end += 1
+                depth = self.queueDepth(notificationName)
+                heapq.heappush(self.notificationQueue, (-self.priorityMap.get(notificationName, 0),
+                                                        next(self.queueSequence), depth, notifications[start:end]))
+                start = end
+
+        if self.autoFlush:
+            self.flush()
+
+    def queueDepth(self, notificationName):
+        """
+        Get the depth, in the current cascade, of an C{INotification} being queued.
+
+        The caller must hold the C{queueLock}.
+
+        @param notificationName: the name of the C{INotification}
+        @return: 0 when sent from outside a drain, otherwise one more than the depth of the one being delivered
+        @raise RuntimeError: if the depth exceeds C{maxDepth}
+        """
+        if self.drainingThread != threading.get_ident():
+            return 0
+        depth = self.deliveryDepth + 1
+        if depth > self.maxDepth:
+            raise RuntimeError("Notification cascade deeper than %d while sending %r" %
+                               (self.maxDepth, notificationName))
+        return depth
+
+    def flush(self):
+        """
+        Deliver the queued C{INotification}s.
+
+        Returns once the queue is empty. Does nothing if the queue is
+        already being drained, by this thread (e.g. when called from a
+        handler) or another one, since the ongoing drain delivers them.
+        If a handler raises, the exception propagates and the remaining
+        C{INotification}s stay queued until the next drain.
+        """
+        with self.queueLock:
+            if self.drainingThread is not None or not self.notificationQueue:
+                return
+            self.drainingThread = threading.get_ident()
+
+        try:
+            while True:
+                with self.queueLock:
+                    if not self.notificationQueue:
+                        self.drainingThread = None
+                        self.deliveryDepth = 0
+                        return
+                    priority, sequence, depth, notification = heapq.heappop(self.notificationQueue)
+                    self.deliveryDepth = depth
+
+                if self.view is None:
+                    continue
+                if notification.__class__ is list:
+                    self.view.notifyObserversBatch(notification)
+                else:
+                    self.view.notifyObservers(notification)
+        except BaseException:
+            with self.queueLock:
+                self.drainingThread = None
+                self.deliveryDepth = 0
+            raise
+
+    def setCoalescing(self, notificationName, policy, reducer=None, window=None):
+        """
+        Coalesce the C{INotification}s with a given name sent by C{sendNotification}.
+
+        Instead of being delivered at once, a coalesced C{INotification}
+        is held, and the ones with the same name sent after it are
+        folded into it according to C{policy}:
+
+        C{COALESCE_LAST}: the last C{INotification} sent wins.
+
+        C{COALESCE_MERGE}: the bodies are folded with
+        C{reducer(heldBody, body)}; the type is the last one sent.
+
+        C{COALESCE_COUNT}: the body of the delivered C{INotification} is
+        the number of C{INotification}s folded into it; the type is the
+        last one sent.
+
+        Without a C{window}, the held C{INotification} is delivered when
+        the current dispatch cycle ends: when the outermost
+        C{sendNotification} call on this thread returns, or at the
+        matching C{endCycle}. So everything a handler (and the handlers
+        it triggers) sends is folded into one delivery. With a
+        C{window}, it is delivered C{window} seconds after the first one
+        was sent, from a timer thread, or earlier by C{flushCoalesced}.
+
+        @param notificationName: the name of the C{INotification}s to coalesce
+        @param policy: one of C{COALESCE_LAST}, C{COALESCE_MERGE} and C{COALESCE_COUNT}, or C{None} to stop coalescing (and drop the counters)
+        @param reducer: the function folding two bodies into one, for C{COALESCE_MERGE}
+        @param window: the number of seconds to hold the C{INotification}s for (optional)
+        """
+        if policy not in (None, self.COALESCE_LAST, self.COALESCE_MERGE, self.COALESCE_COUNT):
+            raise ValueError("Unknown coalescing policy %r" % (policy,))
+        if policy == self.COALESCE_MERGE and reducer is None:
+            raise ValueError("The %r coalescing policy needs a reducer" % (policy,))
+
+        with self.coalesceLock:
+            coalesceMap = dict(self.coalesceMap)
+            if policy is None:
+                coalesceMap.pop(notificationName, None)
+            else:
+                coalesceMap[notificationName] = (policy, reducer, window)
+                self.coalesceStats.setdefault(notificationName, [0, 0])
+            self.coalesceMap = coalesceMap
+
+        if policy is None:
+            self.flushCoalesced(notificationName)
+            with self.coalesceLock:
+                self.coalesceStats.pop(notificationName, None)
+
+    def getCoalescingStats(self, notificationName):
+        """
+        Get the coalescing counters for a notification name.
+
+        @param notificationName: the name of the coalesced C{INotification}s
+        @return: a dict with the number of C{INotification}s C{sent}, of deliveries made (C{delivered}) and of deliveries C{saved}
+        """
+        with self.coalesceLock:
+            sent, delivered = self.coalesceStats.get(notificationName, (0, 0))
+            pending = notificationName in self.windowPending or \
+                notificationName in getattr(self.cycleState, 'pending', ())
+        return {'sent': sent, 'delivered': delivered, 'saved': sent - delivered - int(pending)}
+
+    def beginCycle(self):
+        """
+        Begin a dispatch cycle on this thread.
+
+        Coalesced C{INotification}s sent until the matching C{endCycle}
+        are delivered by it. Cycles nest; only the outermost one delivers.
+        C{sendNotification} runs in a cycle of its own while coalescing
+        is in use.
+        """
+        state = self.cycleState
+        state.depth = getattr(state, 'depth', 0) + 1
+        if state.depth == 1:
+            state.pending = {}
+
+    def endCycle(self):
+        """
+        End a dispatch cycle on this thread, delivering the coalesced
+        C{INotification}s held during the outermost one.
+
+        Notifications coalesced while those are being delivered are
+        delivered too, before returning.
+        """
+        state = self.cycleState
+        try:
+            if state.depth == 1:
+                while state.pending:
+                    pending = state.pending
+                    state.pending = {}
+                    for notification in pending.values():
+                        self.deliverCoalesced(notification)
+        finally:
+            state.depth -= 1
+            if state.depth == 0:
+                state.pending = {}
+
+    def coalesceNotification(self, notification, policy):
+        """
+        Fold an C{INotification} into the one held for its name.
+
+        @param notification: the C{INotification} to coalesce
+        @param policy: the C{(policy, reducer, window)} set for its name
+        """
+        name = notification.getName()
+        kind, reducer, window = policy
+        with self.coalesceLock:
+            self.coalesceStats[name][0] += 1
+            pending = self.windowPending if window is not None else self.cycleState.pending
+            held = pending.get(name)
+            if kind == self.COALESCE_COUNT:
+                notification.setBody(held.getBody() + 1 if held is not None else 1)
+            elif kind == self.COALESCE_MERGE and held is not None:
+                notification.setBody(reducer(held.getBody(), notification.getBody()))
+            pending[name] = notification
+
+            if window is not None and name not in self.windowTimers:
+                timer = threading.Timer(window, self.flushCoalesced, [name])
+                timer.daemon = True
+                self.windowTimers[name] = timer
+                timer.start()
+
+    def flushCoalesced(self, notificationName=None):
+        """
+        Deliver the C{INotification}s held for their time window now.
+
+        @param notificationName: the name of the C{INotification} to deliver, or C{None} for all of them (optional)
+        """
+        with self.coalesceLock:
+            if notificationName is None:
+                names = list(self.windowPending)
+            else:
+                names = [notificationName] if notificationName in self.windowPending else []
+            notifications = []
+            for name in names:
+                notifications.append(self.windowPending.pop(name))
+                timer = self.windowTimers.pop(name, None)
+                if timer is not None:
+                    timer.cancel()
+
+        for notification in notifications:
+            self.deliverCoalesced(notification)
+
+    def deliverCoalesced(self, notification):
+        """
+        Deliver a coalesced C{INotification}, counting the delivery.
+
+        @param notification: the C{INotification} to deliver
+        """
+        with self.coalesceLock:
+            stats = self.coalesceStats.get(notification.getName())
+            if stats is not None:
+                stats[1] += 1
+        self.notifyObservers(notification)
+
+
+class AsyncFacade(Facade):
+    """
+    A Singleton C{IFacade} implementation for asyncio applications.
+
+    Initializes the C{AsyncController} and C{AsyncView} Singletons
+    (alongside the shared C{Model}) and makes C{sendNotification} a
+    coroutine, so that C{IMediator}s and C{ICommand}s may handle
+    C{INotification}s with coroutines. Each C{sendNotification} call
+    chooses sequential or concurrent delivery to its observers, and
+    any number of C{sendNotification} calls may be in flight at once.
+
+    Note that the C{facade} of C{Mediator}s, C{Proxy}s and C{Command}s
+    is the C{Facade} Singleton; to send from a coroutine handler, await
+    C{AsyncFacade.getInstance().sendNotification(...)}, or assign the
+    C{AsyncFacade} to their C{facade} and await their C{sendNotification}.
+
+    Queued delivery (C{setQueued}) is not supported: awaiting
+    C{sendNotification} already runs its observers to completion.
+
+    @see: L{AsyncController<puremvc.core.AsyncController>}
+    @see: L{AsyncView<puremvc.core.AsyncView>}
+    """
+
+    instance = None
+
+    @staticmethod
+    def getInstance():
+        """
+        C{AsyncFacade} Singleton Static method.
+
+        @return: the Singleton instance of C{AsyncFacade}
+        """
+        return AsyncFacade()
+
+    def initializeController(self):
+        """
+        Initialize the C{AsyncController}.
+
+        Called by the C{initializeFacade} method.
+        """
+        if self.controller is not None:
+            return
+        self.controller = puremvc.core.AsyncController.getInstance()
+
+    def initializeView(self):
+        """
+        Initialize the C{AsyncView}.
+
+        Called by the C{initializeFacade} method.
+        """
+        if self.view is not None:
+            return
+        self.view = puremvc.core.AsyncView.getInstance()
+
+    async def sendNotification(self, notificationName, body=None, noteType=None, concurrent=False):
+        """
+        Create and send an C{INotification}.
+
+        @param notificationName: the name of the notification to send
+        @param body: the body of the notification (optional)
+        @param noteType: the type of the notification (optional)
+        @param concurrent: whether to await the observers concurrently rather than one after the other (optional)
+        """
+        await self.notifyObservers(
+            puremvc.patterns.observer.Notification(
+                notificationName, body, noteType
+            ),
+            concurrent
+        )
+
+    async def sendNotifications(self, notifications, concurrent=False):
+        """
+        Create and send a batch of C{INotification}s, one after the other.
+
+        @param notifications: an iterable of C{(name, body, type)} tuples; body and type may be left out
+        @param concurrent: whether to await the observers of each notification concurrently (optional)
+        """
+        Notification = puremvc.patterns.observer.Notification
+        await self.notifyObserversBatch([Notification(*item) for item in notifications], concurrent)
+
+    async def notifyObserversBatch(self, notifications, concurrent=False):
+        """
+        Notify C{Observer}s of a batch of C{INotification}s.
+
+        @param notifications: the list of C{INotification}s to have the C{AsyncView} notify C{Observers} of.
+        @param concurrent: whether to await the observers of each notification concurrently (optional)
+        """
+        if self.view is not None:
+            await self.view.notifyObserversBatch(notifications, concurrent)
+
+    async def notifyObservers(self, notification, concurrent=False):
+        """
+        Notify C{Observer}s.
+
+        @param notification: the C{INotification} to have the C{AsyncView} notify C{Observers} of.
+        @param concurrent: whether to await the observers concurrently rather than one after the other (optional)
         """
         if self.view is not None:
-            self.view.notifyObservers(notification)
+            await self.view.notifyObservers(notification, concurrent)
@@ -74,6 +74,20 @@ class Mediator(puremvc.patterns.observer.Notifier, puremvc.interfaces.IMediator,
         """
         pass
 
+    def handleNotificationBatch(self, notifications):
+        """
+        Handle a batch of C{INotification}s sharing the same name.
+
+        Called by the View when a batch is broadcast. By default each
+        C{INotification} is passed to C{handleNotification} in turn;
+        override to handle the whole batch at once (e.g. refreshing
+        the view component a single time).
+
+        @param notifications: the list of C{INotification}s to be handled
+        """
+        for notification in notifications:
+            self.handleNotification(notification)
+
     def onRegister(self):
         """
         Called by the View when the Mediator is registered
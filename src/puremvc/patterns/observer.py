@@ -25,11 +25,14 @@ class Observer(puremvc.interfaces.IObserver):
 
     Provide a method for notifying the interested object.
 
+    Optionally encapsulate a batch notification method, which is handed
+    a whole list of C{INotification}s of the same name in one call.
+
     @see: L{View<org.puremvc.as3.core.view.View>}
     @see: L{Notification<org.puremvc.as3.patterns.observer.Notification>}
     """
 
-    def __init__(self, notifyMethod, notifyContext):
+    def __init__(self, notifyMethod, notifyContext, notifyBatchMethod=None):
         """
         Constructor.
 
@@ -38,12 +41,15 @@ class Observer(puremvc.interfaces.IObserver):
 
         @param notifyMethod: the notification method of the interested object
         @param notifyContext: the notification context of the interested object
+        @param notifyBatchMethod: the batch notification method of the interested object (optional)
         """
         self.notify = None
         self.context = None
+        self.notifyBatch = None
 
         self.setNotifyMethod(notifyMethod)
         self.setNotifyContext(notifyContext)
+        self.setNotifyBatchMethod(notifyBatchMethod)
 
     def setNotifyMethod(self, notifyMethod):
         """
@@ -63,6 +69,25 @@ class Observer(puremvc.interfaces.IObserver):
         """
         self.context = notifyContext
 
+    def setNotifyBatchMethod(self, notifyBatchMethod):
+        """
+        Set the batch notification method.
+
+        The batch notification method should take one parameter, a list of
+        C{INotification}s sharing the same name.
+
+        @param notifyBatchMethod: the batch notification (callback) method of the interested object, or C{None}.
+        """
+        self.notifyBatch = notifyBatchMethod
+
+    def getNotifyBatchMethod(self):
+        """
+        Get the batch notification method.
+
+        @return: the batch notification (callback) method of the interested object, or C{None}.
+        """
+        return self.notifyBatch
+
     def getNotifyMethod(self):
         """
         Get the notification method.
@@ -84,8 +109,26 @@ class Observer(puremvc.interfaces.IObserver):
         Notify the interested object.
 
         @param notification: the C{INotification} to pass to the interested object's notification method.
+        @return: whatever the notification method returns (an awaitable, for a coroutine method)
         """
-        self.getNotifyMethod()(notification)
+        return self.getNotifyMethod()(notification)
+
+    def notifyObserverBatch(self, notifications):
+        """
+        Notify the interested object of a batch of C{INotification}s sharing the same name.
+
+        The batch notification method gets the whole list in one call; without
+        one the notification method is called for each C{INotification} in turn.
+
+        @param notifications: the list of C{INotification}s to pass to the interested object.
+        """
+        if self.notifyBatch is not None:
+            self.notifyBatch(notifications)
+            return
+
+        notifyMethod = self.getNotifyMethod()
+        for notification in notifications:
+            notifyMethod(notification)
 
     def compareNotifyContext(self, obj):
         """
@@ -138,8 +181,18 @@ class Notifier(puremvc.interfaces.INotifier):
         @param notificationName: the name of the notification to send
         @param body: the body of the notification (optional)
         @param noteType: the type of the notification (optional)
+        @return: whatever the facade returns (an awaitable, for an C{AsyncFacade})
+        """
+        return self.facade.sendNotification(notificationName, body, noteType)
+
+    def sendNotifications(self, notifications):
+        """
+        Create and send a batch of C{INotification}s.
+
+        @param notifications: an iterable of C{(name, body, type)} tuples; body and type may be left out
+        @return: whatever the facade returns (an awaitable, for an C{AsyncFacade})
         """
-        self.facade.sendNotification(notificationName, body, noteType)
+        return self.facade.sendNotifications(notifications)
 
 
 class Notification(puremvc.interfaces.INotification):
@@ -4,6 +4,21 @@
  Your reuse is governed by the Creative Commons Attribution 3.0 License
 """
 
+import bisect
+import collections
+import concurrent.futures
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 import puremvc.interfaces
 import puremvc.patterns.observer
 import puremvc.patterns.facade
@@ -80,3 +95,1215 @@ class Proxy(puremvc.patterns.observer.Notifier, puremvc.interfaces.IProxy, purem
         Called by the Model when the Proxy is removed
         """
         pass
+
+
+class CachingProxy(Proxy):
+    """
+    A C{Proxy} caching the values it loads from a slow backend, by key.
+
+    Your subclass should override the C{load} method, which fetches the
+    value of a key from the backend; C{get} returns the cached value
+    when there is one, and otherwise loads and caches it. Concurrent
+    C{get}s missing the same key wait for a single C{load}, and get its
+    value, or its exception.
+
+    The cache is bounded by C{maxEntries} and, if set, by C{maxBytes},
+    the sum of the C{sizeOf} the cached values: beyond either, the least
+    recently used entries are evicted. With a C{ttl}, an entry expires
+    that many seconds after it was loaded.
+
+    Entries are invalidated with C{invalidate}, or by sending one of
+    the C{INotification}s named in C{invalidatedBy} through the
+    C{Facade}: its body is the key to invalidate, or C{None} for all of
+    them (see C{invalidationKeys}). The C{CachingProxy} observes those
+    names while it is registered with the C{Model}, so a subclass
+    overriding C{onRegister} or C{onRemove} must call these.
+
+    C{getCacheStats} reports the hit ratio and the eviction counts.
+
+    @see: L{Proxy<puremvc.patterns.proxy.Proxy>}
+    """
+
+    maxEntries = 128
+    maxBytes = None
+    ttl = None
+    invalidatedBy = ()
+
+    def __init__(self, proxyName=None, data=None):
+        """
+        CachingProxy Constructor
+
+        @param proxyName: the name of the proxy instance (optional)
+        @param data: the proxy data (optional)
+        """
+        Proxy.__init__(self, proxyName, data)
+        self.entries = collections.OrderedDict()
+        self.loading = {}
+        self.cacheLock = threading.Lock()
+        self.generation = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.loadErrors = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def load(self, key):
+        """
+        Fetch the value of a key from the backend.
+
+        Override this method; it is called without the cache lock held,
+        once per miss whatever the number of concurrent C{get}s.
+
+        @param key: the key
+        @return: the value
+        """
+        raise NotImplementedError(self)
+
+    def sizeOf(self, key, value):
+        """
+        Estimate the memory taken by a cached value, for C{maxBytes}.
+
+        Only called when C{maxBytes} is set. Defaults to
+        C{sys.getsizeof(value)}, which does not count the objects a
+        container refers to; override for such values.
+
+        @param key: the key
+        @param value: the value
+        @return: the size in bytes
+        """
+        return sys.getsizeof(value)
+
+    def get(self, key, loader=None):
+        """
+        Get the value of a key, loading it on a miss.
+
+        @param key: the key, which must be hashable
+        @param loader: the callable taking the key to load it with instead of C{load} (optional)
+        @return: the value
+        """
+        with self.cacheLock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] > time.monotonic():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self.removeEntry(key)
+                self.expirations += 1
+
+            self.misses += 1
+            future = self.loading.get(key)
+            if future is not None:
+                waiting = True
+            else:
+                waiting = False
+                future = self.loading[key] = concurrent.futures.Future()
+                generation = self.generation
+
+        if waiting:
+            return future.result()
+
+        try:
+            value = (loader or self.load)(key)
+        except BaseException as e:
+            with self.cacheLock:
+                del self.loading[key]
+                self.loadErrors += 1
+            future.set_exception(e)
+            raise
+
+        with self.cacheLock:
+            del self.loading[key]
+            self.loads += 1
+            if generation == self.generation:
+                self.storeEntry(key, value)
+        future.set_result(value)
+        return value
+
+    def put(self, key, value):
+        """
+        Cache the value of a key, as if loaded.
+
+        @param key: the key, which must be hashable
+        @param value: the value
+        """
+        with self.cacheLock:
+            self.storeEntry(key, value)
+
+    def contains(self, key):
+        """
+        Check whether the value of a key is cached and not expired, without counting a hit or miss.
+
+        @param key: the key
+        @return: whether C{get} would not load it
+        """
+        entry = self.entries.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def invalidate(self, key=None):
+        """
+        Drop the cached value of a key, or all of them.
+
+        A C{load} in progress when called is not cached.
+
+        @param key: the key; all of them by default (optional)
+        @return: the number of entries dropped
+        """
+        with self.cacheLock:
+            self.generation += 1
+            if key is None:
+                dropped = len(self.entries)
+                self.entries.clear()
+                self.bytes = 0
+            else:
+                dropped = 1 if self.removeEntry(key) else 0
+            self.invalidations += dropped
+        return dropped
+
+    def invalidationKeys(self, notification):
+        """
+        Get the keys an invalidating C{INotification} stands for.
+
+        Override to map C{INotification}s to keys some other way.
+
+        @param notification: one of the C{INotification}s named in C{invalidatedBy}
+        @return: the list of keys, or C{None} for all of them
+        """
+        body = notification.getBody()
+        return None if body is None else [body]
+
+    def handleInvalidation(self, notification):
+        """
+        Invalidate the keys of an C{INotification} named in C{invalidatedBy}.
+
+        @param notification: the C{INotification}
+        """
+        keys = self.invalidationKeys(notification)
+        if keys is None:
+            self.invalidate()
+        else:
+            for key in keys:
+                self.invalidate(key)
+
+    def storeEntry(self, key, value):
+        """
+        Cache a value, then evict the least recently used entries beyond the bounds.
+
+        The caller must hold the C{cacheLock}.
+
+        @param key: the key
+        @param value: the value
+        """
+        self.removeEntry(key)
+        size = self.sizeOf(key, value) if self.maxBytes is not None else 0
+        self.entries[key] = (value, time.monotonic() + self.ttl if self.ttl is not None else None, size)
+        self.bytes += size
+        while self.entries and ((self.maxEntries is not None and len(self.entries) > self.maxEntries) or
+                                (self.maxBytes is not None and self.bytes > self.maxBytes)):
+            evictedKey, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted[2]
+            self.evictions += 1
+
+    def removeEntry(self, key):
+        """
+        Drop a cached entry.
+
+        The caller must hold the C{cacheLock}.
+
+        @param key: the key
+        @return: whether there was an entry
+        """
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        self.bytes -= entry[2]
+        return True
+
+    def getCacheStats(self):
+        """
+        Get the statistics of the cache.
+
+        @return: a dict of C{hits}, C{misses}, C{hitRatio}, C{loads}, C{loadErrors}, C{evictions}, C{expirations},
+            C{invalidations}, and the current C{size} and C{bytes}
+        """
+        with self.cacheLock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'hitRatio': self.hits / lookups if lookups else 0.0,
+                    'loads': self.loads, 'loadErrors': self.loadErrors, 'evictions': self.evictions,
+                    'expirations': self.expirations, 'invalidations': self.invalidations,
+                    'size': len(self.entries), 'bytes': self.bytes}
+
+    def onRegister(self):
+        """
+        Observe the C{INotification}s invalidating the cache.
+        """
+        for notificationName in self.invalidatedBy:
+            self.facade.view.registerObserver(notificationName, puremvc.patterns.observer.Observer(self.handleInvalidation, self))
+
+    def onRemove(self):
+        """
+        Stop observing the C{INotification}s invalidating the cache, and empty it.
+        """
+        for notificationName in self.invalidatedBy:
+            self.facade.view.removeObserver(notificationName, self)
+        self.invalidate()
+
+
+class MmapProxy(Proxy):
+    """
+    A C{Proxy} whose data is a file of fixed-size records, memory-mapped rather than loaded.
+
+    Each record is packed with the C{struct} format C{recordFormat}.
+    The file is mapped into memory, so only the pages actually read are
+    resident, and the operating system may drop them again: the table
+    may be larger than RAM. C{getRecords} hands out C{memoryview} slices
+    of the mapping, without copying; C{getRecord} and C{iterRecords}
+    unpack records from it.
+
+    A writable C{MmapProxy} may C{appendRecords} at the end of the file,
+    and C{updateRecord}s in place. Either sends the
+    C{changedNotification}, if set, with the C{(start, stop)} range of
+    the records written as its body and the proxy name as its type, so
+    observers only read those. Slices obtained before an append stay
+    valid, but do not see the records appended.
+
+    The file is closed when the C{MmapProxy} is removed from the
+    C{Model}, or by C{close}; a subclass overriding C{onRemove} must
+    call it.
+
+    @see: L{Proxy<puremvc.patterns.proxy.Proxy>}
+    """
+
+    recordFormat = None
+    changedNotification = None
+
+    def __init__(self, proxyName=None, path=None, recordFormat=None, writable=False):
+        """
+        MmapProxy Constructor
+
+        @param proxyName: the name of the proxy instance (optional)
+        @param path: the path of the file of records, created if missing and C{writable}
+        @param recordFormat: the C{struct} format of a record, instead of the class's C{recordFormat} (optional)
+        @param writable: whether records may be written (optional)
+        @raise ValueError: if there is no record format, or the file size is not a multiple of the record size
+        """
+        Proxy.__init__(self, proxyName)
+        self.recordFormat = recordFormat or self.recordFormat
+        if self.recordFormat is None:
+            raise ValueError("MmapProxy needs a record format")
+        self.recordStruct = struct.Struct(self.recordFormat)
+        self.recordSize = self.recordStruct.size
+        self.path = path
+        self.writable = writable
+        self.writeLock = threading.Lock()
+        if not writable:
+            self.file = open(path, 'rb')
+        else:
+            self.file = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        self.mapping = None
+        self.recordCount = 0
+        self.remap()
+
+    def remap(self):
+        """
+        Map the file, as it is now, into memory.
+
+        The previous mapping is not closed: it is released once no
+        slice of it is referenced any more.
+
+        @raise ValueError: if the file size is not a multiple of the record size
+        """
+        size = os.fstat(self.file.fileno()).st_size
+        if size % self.recordSize:
+            raise ValueError("%s is %d bytes, not a whole number of %d-byte records" % (self.path, size, self.recordSize))
+        self.mapping = mmap.mmap(self.file.fileno(), size, access=mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ) \
+            if size else None
+        self.recordCount = size // self.recordSize
+
+    def getRecordCount(self):
+        """
+        Get the number of records.
+
+        @return: the number of records
+        """
+        return self.recordCount
+
+    def getRecordSize(self):
+        """
+        Get the size of a record.
+
+        @return: the size of a record in bytes
+        """
+        return self.recordSize
+
+    def getData(self):
+        """
+        Get the proxy data: all the records, as a C{memoryview}.
+
+        @return: the C{memoryview} of the records
+        """
+        return self.getRecords()
+
+    def setData(self, data):
+        """
+        Refuse to replace the proxy data: it is the file's records.
+
+        @param data: the proxy data
+        @raise ValueError: always; write records with C{appendRecords} and C{updateRecord}
+        """
+        raise ValueError("The data of MmapProxy %r is its file; use appendRecords or updateRecord" % self.getProxyName())
+
+    def getRecords(self, start=0, stop=None):
+        """
+        Get a range of records as a C{memoryview} of their bytes, without copying them.
+
+        @param start: the index of the first record (optional)
+        @param stop: the index after the last record; the record count by default (optional)
+        @return: the read-only C{memoryview}
+        """
+        start, stop, step = slice(start, stop).indices(self.recordCount)
+        if self.mapping is None or stop <= start:
+            return memoryview(b'')
+        return memoryview(self.mapping)[start * self.recordSize:stop * self.recordSize].toreadonly()
+
+    def getRecord(self, index):
+        """
+        Get a record.
+
+        @param index: the index of the record; a negative one counts from the end
+        @return: the tuple of its fields
+        @raise IndexError: if there is no such record
+        """
+        if index < 0:
+            index += self.recordCount
+        if not 0 <= index < self.recordCount:
+            raise IndexError("record index out of range")
+        return self.recordStruct.unpack_from(self.mapping, index * self.recordSize)
+
+    def iterRecords(self, start=0, stop=None):
+        """
+        Iterate over a range of records.
+
+        @param start: the index of the first record (optional)
+        @param stop: the index after the last record; the record count by default (optional)
+        @return: an iterator of the tuples of their fields
+        """
+        return self.recordStruct.iter_unpack(self.getRecords(start, stop))
+
+    def appendRecords(self, records):
+        """
+        Append records to the file, and send the C{changedNotification} with their range.
+
+        @param records: an iterable of the tuples of the fields of the records
+        @return: the C{(start, stop)} range of the records appended
+        @raise ValueError: if not writable
+        """
+        if not self.writable:
+            raise ValueError("MmapProxy %r is read-only" % self.getProxyName())
+        pack = self.recordStruct.pack
+        data = b''.join([pack(*record) for record in records])
+        with self.writeLock:
+            start = self.recordCount
+            self.file.seek(start * self.recordSize)
+            self.file.write(data)
+            self.file.flush()
+            self.remap()
+            stop = self.recordCount
+        if self.changedNotification is not None and stop > start:
+            self.sendNotification(self.changedNotification, (start, stop), self.getProxyName())
+        return start, stop
+
+    def updateRecord(self, index, record):
+        """
+        Overwrite a record in place, and send the C{changedNotification} with its range.
+
+        @param index: the index of the record; a negative one counts from the end
+        @param record: the tuple of its fields
+        @raise ValueError: if not writable
+        @raise IndexError: if there is no such record
+        """
+        if not self.writable:
+            raise ValueError("MmapProxy %r is read-only" % self.getProxyName())
+        with self.writeLock:
+            if index < 0:
+                index += self.recordCount
+            if not 0 <= index < self.recordCount:
+                raise IndexError("record index out of range")
+            self.recordStruct.pack_into(self.mapping, index * self.recordSize, *record)
+        if self.changedNotification is not None:
+            self.sendNotification(self.changedNotification, (index, index + 1), self.getProxyName())
+
+    def flush(self):
+        """
+        Write the records updated in place back to the file.
+        """
+        if self.writable and self.mapping is not None:
+            self.mapping.flush()
+
+    def close(self):
+        """
+        Close the file.
+
+        The mapping is closed as well, unless slices of it are still
+        referenced, in which case it is released with the last of them.
+        """
+        self.flush()
+        if self.mapping is not None:
+            try:
+                self.mapping.close()
+            except BufferError:
+                pass
+            self.mapping = None
+        self.recordCount = 0
+        self.file.close()
+
+    def onRemove(self):
+        """
+        Close the file.
+        """
+        self.close()
+
+
+class ColumnarProxy(Proxy):
+    """
+    A C{Proxy} holding a collection of records as NumPy columns, queried vectorized.
+
+    Requires NumPy. The data is a dict of column name to one-dimensional
+    array, all of the same length; it may be set from such a dict, from
+    a NumPy structured array (whose fields are used without copying), or
+    from a list of dicts, the records as usually kept in C{Proxy.data}.
+    The columns are read-only: change them with C{appendRecords}, which
+    sends the C{changedNotification}, if set, with the C{(start, stop)}
+    range of the records appended as its body and the proxy name as
+    its type.
+
+    Queries run on whole columns at once, and return a dict of column
+    name to array, which mediators and commands use as is: C{query}
+    filters, projects, sorts and limits, C{topK} gets the records with
+    the largest (or smallest) values of a column, and C{aggregate}
+    groups by a column and reduces others. Conditions are a list of
+    C{(column, operator, value)} triples, all of which a record must
+    match, with the operators in C{OPERATORS}; or a boolean mask; or a
+    callable taking the columns and returning such a mask.
+
+    @see: L{Proxy<puremvc.patterns.proxy.Proxy>}
+    """
+
+    changedNotification = None
+
+    OPERATORS = ('==', '!=', '<', '<=', '>', '>=', 'in', 'between')
+    AGGREGATES = ('count', 'sum', 'mean', 'min', 'max')
+
+    def __init__(self, proxyName=None, data=None):
+        """
+        ColumnarProxy Constructor
+
+        @param proxyName: the name of the proxy instance (optional)
+        @param data: the records, as a dict of columns, a structured array or a list of dicts (optional)
+        @raise ImportError: if NumPy is not installed
+        """
+        if numpy is None:
+            raise ImportError("ColumnarProxy requires NumPy")
+        self.data = {}
+        self.length = 0
+        self.factorized = {}
+        self.writeLock = threading.Lock()
+        Proxy.__init__(self, proxyName, data)
+
+    def setData(self, data):
+        """
+        Set the records.
+
+        Arrays are not copied: the columns are read-only views of them,
+        which leave the arrays themselves writable.
+
+        @param data: a dict of columns, a structured array or a list of dicts
+        @raise ValueError: if the columns are not all of the same length
+        """
+        columns = self.toColumns(data)
+        lengths = set(len(column) for column in columns.values())
+        if len(lengths) > 1:
+            raise ValueError("Columns of different lengths: %s" % sorted(lengths))
+        for name in columns:
+            column = columns[name] = columns[name].view()
+            column.flags.writeable = False
+        self.data = columns
+        self.length = lengths.pop() if lengths else 0
+        self.factorized = {}
+
+    def toColumns(self, data):
+        """
+        Convert records into a dict of one-dimensional arrays.
+
+        @param data: a dict of columns, a structured array or a list of dicts
+        @return: the dict of column name to array
+        """
+        if isinstance(data, numpy.ndarray) and data.dtype.names:
+            return dict((name, data[name]) for name in data.dtype.names)
+        if isinstance(data, dict):
+            return dict((name, numpy.asarray(column)) for name, column in data.items())
+        if not data:
+            return dict((name, column[:0]) for name, column in self.data.items())
+        return dict((name, numpy.array([record[name] for record in data])) for name in data[0])
+
+    def getData(self):
+        """
+        Get the records.
+
+        @return: the dict of column name to read-only array
+        """
+        return self.data
+
+    def getColumn(self, name):
+        """
+        Get a column.
+
+        @param name: the column name
+        @return: the read-only array
+        """
+        return self.data[name]
+
+    def getLength(self):
+        """
+        Get the number of records.
+
+        @return: the number of records
+        """
+        return self.length
+
+    def appendRecords(self, records):
+        """
+        Append records, and send the C{changedNotification} with their range.
+
+        @param records: a dict of columns, a structured array or a list of dicts, with the same columns
+        @return: the C{(start, stop)} range of the records appended
+        @raise ValueError: if the columns differ from those of the proxy
+        """
+        columns = self.toColumns(records)
+        with self.writeLock:
+            if self.data and set(columns) != set(self.data):
+                raise ValueError("Records with columns %s appended to columns %s" % (sorted(columns), sorted(self.data)))
+            start = self.length
+            self.setData(dict((name, numpy.concatenate((self.data[name], column)) if self.data else column)
+                              for name, column in columns.items()))
+            stop = self.length
+        if self.changedNotification is not None and stop > start:
+            self.sendNotification(self.changedNotification, (start, stop), self.getProxyName())
+        return start, stop
+
+    def factorize(self, name):
+        """
+        Get the distinct values of a column, and the position of each record's among them.
+
+        Computed once per column, and kept until the records change.
+
+        @param name: the column name
+        @return: the sorted array of distinct values, and the array of their indices per record
+        """
+        factorized = self.factorized.get(name)
+        if factorized is None:
+            groups, inverse = numpy.unique(self.data[name], return_inverse=True)
+            factorized = self.factorized[name] = (groups, inverse.reshape(-1))
+        return factorized
+
+    def mask(self, where):
+        """
+        Evaluate conditions into a boolean mask of the records matching them.
+
+        @param where: a list of C{(column, operator, value)} triples, a boolean mask, or a callable taking the columns
+        @return: the boolean array
+        @raise ValueError: for an unknown operator
+        """
+        if callable(where):
+            return numpy.asarray(where(self.data), dtype=bool)
+        if isinstance(where, numpy.ndarray):
+            return where
+        mask = numpy.ones(self.length, dtype=bool)
+        for name, operator, value in where:
+            column = self.data[name]
+            if operator == '==':
+                mask &= column == value
+            elif operator == '!=':
+                mask &= column != value
+            elif operator == '<':
+                mask &= column < value
+            elif operator == '<=':
+                mask &= column <= value
+            elif operator == '>':
+                mask &= column > value
+            elif operator == '>=':
+                mask &= column >= value
+            elif operator == 'in':
+                mask &= numpy.isin(column, list(value))
+            elif operator == 'between':
+                mask &= (column >= value[0]) & (column <= value[1])
+            else:
+                raise ValueError("Unknown operator %r, not one of %s" % (operator, ", ".join(self.OPERATORS)))
+        return mask
+
+    def query(self, where=None, columns=None, orderBy=None, descending=False, limit=None):
+        """
+        Filter, project, sort and limit the records.
+
+        Without conditions or order, the columns returned are views of
+        those of the proxy; otherwise they are new arrays.
+
+        @param where: the conditions the records must match (optional)
+        @param columns: the names of the columns to return; all of them by default (optional)
+        @param orderBy: the name of the column to sort by (optional)
+        @param descending: whether to sort in decreasing order (optional)
+        @param limit: the maximum number of records to return (optional)
+        @return: the dict of column name to array
+        """
+        names = list(self.data) if columns is None else columns
+        index = None
+        if where is not None:
+            index = numpy.flatnonzero(self.mask(where))
+        if orderBy is not None:
+            keys = self.data[orderBy] if index is None else self.data[orderBy][index]
+            order = numpy.argsort(keys, kind='stable')
+            if descending:
+                order = order[::-1]
+            index = order if index is None else index[order]
+        if limit is not None:
+            if index is None:
+                return dict((name, self.data[name][:limit]) for name in names)
+            index = index[:limit]
+        if index is None:
+            return dict((name, self.data[name]) for name in names)
+        return dict((name, self.data[name][index]) for name in names)
+
+    def topK(self, orderBy, k, where=None, columns=None, largest=True):
+        """
+        Get the records with the largest, or smallest, values of a column, in order.
+
+        Only those C{k} records are sorted, not the whole column.
+
+        @param orderBy: the name of the column to rank by
+        @param k: the number of records
+        @param where: the conditions the records must match (optional)
+        @param columns: the names of the columns to return; all of them by default (optional)
+        @param largest: whether to get the largest values, rather than the smallest (optional)
+        @return: the dict of column name to array
+        """
+        names = list(self.data) if columns is None else columns
+        index = numpy.arange(self.length) if where is None else numpy.flatnonzero(self.mask(where))
+        keys = self.data[orderBy][index]
+        count = len(keys)
+        if k <= 0:
+            candidates = index[:0]
+        elif k >= count:
+            candidates = numpy.arange(count)
+        elif largest:
+            candidates = numpy.argpartition(keys, count - k)[count - k:]
+        else:
+            candidates = numpy.argpartition(keys, k - 1)[:k]
+        order = numpy.argsort(keys[candidates], kind='stable')
+        if largest:
+            order = order[::-1]
+        index = index[candidates[order]]
+        return dict((name, self.data[name][index]) for name in names)
+
+    def aggregate(self, groupBy, aggregates, where=None):
+        """
+        Group the records by the values of a column, and reduce other columns per group.
+
+        @param groupBy: the name of the column to group by
+        @param aggregates: a dict of result name to C{(column, function)}, with the functions in C{AGGREGATES}
+        @param where: the conditions the records must match (optional)
+        @return: the dict of C{groupBy} to the sorted group keys, and of each result name to its array
+        @raise ValueError: for an unknown function
+        """
+        index = None if where is None else numpy.flatnonzero(self.mask(where))
+        groups, inverse = self.factorize(groupBy)
+        if index is not None:
+            inverse = inverse[index]
+        counts = numpy.bincount(inverse, minlength=len(groups))
+        if index is not None:
+            present = numpy.flatnonzero(counts)
+            if len(present) < len(groups):
+                renumber = numpy.zeros(len(groups), dtype=inverse.dtype)
+                renumber[present] = numpy.arange(len(present))
+                groups, inverse, counts = groups[present], renumber[inverse], counts[present]
+        result = {groupBy: groups}
+        order = starts = None
+        for resultName, (name, function) in aggregates.items():
+            if function == 'count':
+                result[resultName] = counts
+                continue
+            values = self.data[name] if index is None else self.data[name][index]
+            if function == 'sum':
+                result[resultName] = numpy.bincount(inverse, weights=values, minlength=len(groups))
+            elif function == 'mean':
+                result[resultName] = numpy.bincount(inverse, weights=values, minlength=len(groups)) / counts
+            elif function in ('min', 'max'):
+                if order is None:
+                    order = numpy.argsort(inverse, kind='stable')
+                    starts = numpy.concatenate(([0], numpy.cumsum(counts)[:-1]))
+                reduce = numpy.minimum if function == 'min' else numpy.maximum
+                result[resultName] = reduce.reduceat(values[order], starts) if len(groups) else values[:0]
+            else:
+                raise ValueError("Unknown aggregate %r, not one of %s" % (function, ", ".join(self.AGGREGATES)))
+        return result
+
+
+class SortedIndex(object):
+    """
+    A sorted index of an C{IndexedProxy}.
+
+    Its C{(key, primaryKey)} entries are kept in order, split into
+    buckets of C{BUCKET_SIZE} to twice as many entries, each with the
+    keys alone in a parallel list for range lookups. The last entry and
+    key of each bucket are kept too, so an entry is located by bisection
+    among those, then within its bucket: adding or removing one only
+    shifts the entries of that bucket, however large the index grows.
+
+    @see: L{IndexedProxy<puremvc.patterns.proxy.IndexedProxy>}
+    """
+
+    BUCKET_SIZE = 512
+
+    def __init__(self, entries=()):
+        """
+        Constructor.
+
+        @param entries: the sorted list of C{(key, primaryKey)} entries (optional)
+        """
+        entries = list(entries)
+        self.buckets = [entries[start:start + self.BUCKET_SIZE] for start in range(0, len(entries), self.BUCKET_SIZE)]
+        self.keyBuckets = [[key for key, primaryKey in bucket] for bucket in self.buckets]
+        self.maxes = [bucket[-1] for bucket in self.buckets]
+        self.maxKeys = [keys[-1] for keys in self.keyBuckets]
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets)
+
+    def add(self, key, primaryKey):
+        """
+        Add an entry.
+
+        @param key: the key of the record in the index
+        @param primaryKey: the primary key of the record
+        @raise TypeError: if the key cannot be ordered with those of the index; the index is then unchanged
+        """
+        entry = (key, primaryKey)
+        if not self.buckets:
+            self.buckets.append([entry])
+            self.keyBuckets.append([key])
+            self.maxes.append(entry)
+            self.maxKeys.append(key)
+            return
+        index = min(bisect.bisect_left(self.maxes, entry), len(self.buckets) - 1)
+        bucket = self.buckets[index]
+        keys = self.keyBuckets[index]
+        position = bisect.bisect_left(bucket, entry)
+        bucket.insert(position, entry)
+        keys.insert(position, key)
+        self.maxes[index] = bucket[-1]
+        self.maxKeys[index] = keys[-1]
+        if len(bucket) > 2 * self.BUCKET_SIZE:
+            self.buckets.insert(index + 1, bucket[self.BUCKET_SIZE:])
+            self.keyBuckets.insert(index + 1, keys[self.BUCKET_SIZE:])
+            del bucket[self.BUCKET_SIZE:]
+            del keys[self.BUCKET_SIZE:]
+            self.maxes.insert(index, bucket[-1])
+            self.maxKeys.insert(index, keys[-1])
+
+    def remove(self, key, primaryKey):
+        """
+        Remove an entry.
+
+        @param key: the key of the record in the index
+        @param primaryKey: the primary key of the record
+        """
+        entry = (key, primaryKey)
+        index = bisect.bisect_left(self.maxes, entry)
+        bucket = self.buckets[index]
+        keys = self.keyBuckets[index]
+        position = bisect.bisect_left(bucket, entry)
+        del bucket[position]
+        del keys[position]
+        if bucket:
+            self.maxes[index] = bucket[-1]
+            self.maxKeys[index] = keys[-1]
+        else:
+            del self.buckets[index]
+            del self.keyBuckets[index]
+            del self.maxes[index]
+            del self.maxKeys[index]
+
+    def range(self, low=None, high=None, includeLow=True, includeHigh=True):
+        """
+        Get the primary keys of the entries whose key lies within a range, in key order.
+
+        @param low: the lower bound; unbounded if C{None} (optional)
+        @param high: the upper bound; unbounded if C{None} (optional)
+        @param includeLow: whether a key equal to C{low}, or for tuples starting with it, is in range (optional)
+        @param includeHigh: whether a key equal to C{high}, or for tuples starting with it, is in range (optional)
+        @return: the list of primary keys
+        """
+        start = (0, 0) if low is None else \
+            (self.locate if includeLow else self.locateAfter)(low)
+        stop = (len(self.buckets), 0) if high is None else \
+            (self.locateAfter if includeHigh else self.locate)(high)
+        primaryKeys = []
+        for index in range(start[0], min(stop[0] + 1, len(self.buckets))):
+            begin = start[1] if index == start[0] else 0
+            end = stop[1] if index == stop[0] else None
+            primaryKeys.extend(primaryKey for key, primaryKey in self.buckets[index][begin:end])
+        return primaryKeys
+
+    def locate(self, bound):
+        """
+        Find the position of the first key not less than a bound.
+
+        @param bound: the value, or the tuple of values
+        @return: the C{(bucket, position)} pair
+        """
+        index = bisect.bisect_left(self.maxKeys, bound)
+        if index == len(self.buckets):
+            return index, 0
+        return index, bisect.bisect_left(self.keyBuckets[index], bound)
+
+    def locateAfter(self, bound):
+        """
+        Find the position after the keys equal to a bound, or, for tuples, starting with it.
+
+        @param bound: the value, or the tuple of values
+        @return: the C{(bucket, position)} pair
+        """
+        index = bisect.bisect_right(self.maxKeys, bound)
+        while index < len(self.buckets):
+            keys = self.keyBuckets[index]
+            position = bisect.bisect_right(keys, bound)
+            if isinstance(bound, tuple):
+                while position < len(keys) and keys[position][:len(bound)] == bound:
+                    position += 1
+            if position < len(keys):
+                return index, position
+            index += 1
+        return index, 0
+
+
+class IndexedProxy(Proxy):
+    """
+    A C{Proxy} holding a collection of records with secondary indexes.
+
+    The records are dicts, keyed by their C{primaryKey} field. Your
+    subclass declares its indexes once, as class attributes: each
+    entry of C{hashIndexes} (for C{find}, by equality) and of
+    C{sortedIndexes} (for C{findRange}, and C{find}) is a field name, or
+    a tuple of field names for a composite index, whose keys are then
+    the tuples of those fields' values. A record missing a field, or
+    with C{None} in it, is left out of the sorted indexes on it. A
+    sorted index is a L{SortedIndex<puremvc.patterns.proxy.SortedIndex>}
+    of C{(key, primaryKey)} entries, so a record is found in it by
+    bisection however many records share its key.
+
+    The indexes are maintained as records are C{insert}ed, C{update}d
+    and C{delete}d, touching only the indexes on the fields that
+    changed. A record with a value that cannot be indexed, unhashable
+    or not comparable with the other keys of a sorted index, is
+    rejected with a C{TypeError}, leaving the records and indexes as
+    they were. Each of these sends a notification, if set: the
+    C{insertedNotification} and C{deletedNotification} with the record
+    as their body, and the C{updatedNotification} with the
+    C{(oldRecord, newRecord)} pair; all with the proxy name as their
+    type. Mediators can thus apply each change instead of scanning the
+    collection again. Records are replaced, not changed in place, so
+    those handed out stay as they were; they must not be modified.
+
+    @see: L{Proxy<puremvc.patterns.proxy.Proxy>}
+    """
+
+    primaryKey = 'id'
+    hashIndexes = ()
+    sortedIndexes = ()
+    insertedNotification = None
+    updatedNotification = None
+    deletedNotification = None
+
+    def __init__(self, proxyName=None, data=None):
+        """
+        IndexedProxy Constructor
+
+        @param proxyName: the name of the proxy instance (optional)
+        @param data: the initial list of records (optional)
+        """
+        self.records = {}
+        self.hashes = dict((self.indexFields(index), {}) for index in self.hashIndexes)
+        self.sorted = dict((self.indexFields(index), SortedIndex()) for index in self.sortedIndexes)
+        self.indexLock = threading.RLock()
+        Proxy.__init__(self, proxyName, data)
+
+    @staticmethod
+    def indexFields(index):
+        """
+        Normalize an index declaration to the tuple of its fields.
+
+        @param index: a field name, or a tuple of field names
+        @return: the tuple of field names
+        """
+        return index if isinstance(index, tuple) else (index,)
+
+    @staticmethod
+    def indexKey(fields, record):
+        """
+        Get the key of a record in an index.
+
+        @param fields: the tuple of the fields of the index
+        @param record: the record
+        @return: the value of the field, or the tuple of the values of the fields of a composite index
+        """
+        if len(fields) == 1:
+            return record.get(fields[0])
+        return tuple(record.get(field) for field in fields)
+
+    def setData(self, data):
+        """
+        Replace the records, rebuilding the indexes, without sending notifications.
+
+        @param data: the list of records
+        @raise ValueError: if two records have the same primary key
+        @raise TypeError: if a record has a value that cannot be indexed
+        """
+        with self.indexLock:
+            records = {}
+            for record in data:
+                primaryKey = record[self.primaryKey]
+                if primaryKey in records:
+                    raise ValueError("Duplicate primary key %r" % (primaryKey,))
+                records[primaryKey] = record
+            hashes = {}
+            for fields in self.hashes:
+                index = hashes[fields] = {}
+                for primaryKey, record in records.items():
+                    index.setdefault(self.indexKey(fields, record), set()).add(primaryKey)
+            sortedIndexes = {}
+            for fields in self.sorted:
+                sortedIndexes[fields] = SortedIndex(sorted(
+                    (key, primaryKey) for key, primaryKey in
+                    ((self.indexKey(fields, record), primaryKey) for primaryKey, record in records.items())
+                    if self.isSortable(key)))
+            self.records = records
+            self.hashes = hashes
+            self.sorted = sortedIndexes
+
+    def getData(self):
+        """
+        Get the records.
+
+        @return: the dict of primary key to record
+        """
+        return self.records
+
+    def getLength(self):
+        """
+        Get the number of records.
+
+        @return: the number of records
+        """
+        return len(self.records)
+
+    def get(self, primaryKey):
+        """
+        Get a record by its primary key.
+
+        @param primaryKey: the primary key
+        @return: the record, or C{None}
+        """
+        return self.records.get(primaryKey)
+
+    def insert(self, record):
+        """
+        Add a record, and send the C{insertedNotification}.
+
+        @param record: the record
+        @return: the record
+        @raise ValueError: if a record with the same primary key exists
+        @raise TypeError: if the record has a value that cannot be indexed
+        """
+        primaryKey = record[self.primaryKey]
+        with self.indexLock:
+            if primaryKey in self.records:
+                raise ValueError("Duplicate primary key %r" % (primaryKey,))
+            self.addToIndexes(primaryKey, record, None)
+            self.records[primaryKey] = record
+        if self.insertedNotification is not None:
+            self.sendNotification(self.insertedNotification, record, self.getProxyName())
+        return record
+
+    def update(self, primaryKey, changes):
+        """
+        Change fields of a record, and send the C{updatedNotification} if any changed.
+
+        @param primaryKey: the primary key of the record
+        @param changes: the dict of field name to new value; the primary key cannot be changed
+        @return: the new record
+        @raise KeyError: if there is no such record
+        @raise ValueError: if the changes include a new primary key
+        @raise TypeError: if a new value cannot be indexed
+        """
+        if self.primaryKey in changes and changes[self.primaryKey] != primaryKey:
+            raise ValueError("The primary key of record %r cannot be changed" % (primaryKey,))
+        with self.indexLock:
+            oldRecord = self.records[primaryKey]
+            changed = set(field for field, value in changes.items()
+                          if field not in oldRecord or oldRecord[field] != value)
+            if not changed:
+                return oldRecord
+            newRecord = dict(oldRecord)
+            newRecord.update(changes)
+            self.removeFromIndexes(primaryKey, oldRecord, changed)
+            try:
+                self.addToIndexes(primaryKey, newRecord, changed)
+            except Exception:
+                self.addToIndexes(primaryKey, oldRecord, changed)
+                raise
+            self.records[primaryKey] = newRecord
+        if self.updatedNotification is not None:
+            self.sendNotification(self.updatedNotification, (oldRecord, newRecord), self.getProxyName())
+        return newRecord
+
+    def delete(self, primaryKey):
+        """
+        Remove a record, and send the C{deletedNotification}.
+
+        @param primaryKey: the primary key of the record
+        @return: the record removed
+        @raise KeyError: if there is no such record
+        """
+        with self.indexLock:
+            record = self.records.pop(primaryKey)
+            self.removeFromIndexes(primaryKey, record, None)
+        if self.deletedNotification is not None:
+            self.sendNotification(self.deletedNotification, record, self.getProxyName())
+        return record
+
+    def find(self, index, key):
+        """
+        Get the records whose key in an index is equal to a given one.
+
+        @param index: the field name, or tuple of field names, of a declared index
+        @param key: the value, or tuple of values for a composite index
+        @return: the list of records, in primary key order for a sorted index
+        @raise ValueError: if no such index is declared
+        """
+        fields = self.indexFields(index)
+        with self.indexLock:
+            hashIndex = self.hashes.get(fields)
+            if hashIndex is not None:
+                return [self.records[primaryKey] for primaryKey in hashIndex.get(key, ())]
+            if fields in self.sorted:
+                return self.findRange(index, key, key)
+        raise ValueError("No index on %s" % (", ".join(fields),))
+
+    def findRange(self, index, low=None, high=None, includeLow=True, includeHigh=True, descending=False, limit=None):
+        """
+        Get the records whose key in a sorted index lies within a range, in key order.
+
+        For a composite index, C{low} and C{high} are tuples of values,
+        which may be shorter than the key: C{findRange(("region",
+        "price"), ("east",), ("east", 10))} gets the records of the east
+        region up to a price of 10.
+
+        @param index: the field name, or tuple of field names, of a declared sorted index
+        @param low: the lower bound; unbounded by default (optional)
+        @param high: the upper bound; unbounded by default (optional)
+        @param includeLow: whether a key equal to C{low}, or for tuples starting with it, is in range (optional)
+        @param includeHigh: whether a key equal to C{high}, or for tuples starting with it, is in range (optional)
+        @param descending: whether to return the records in decreasing key order (optional)
+        @param limit: the maximum number of records to return (optional)
+        @return: the list of records
+        @raise ValueError: if no such sorted index is declared
+        """
+        fields = self.indexFields(index)
+        with self.indexLock:
+            sortedIndex = self.sorted.get(fields)
+            if sortedIndex is None:
+                raise ValueError("No sorted index on %s" % (", ".join(fields),))
+            selected = sortedIndex.range(low, high, includeLow, includeHigh)
+            if descending:
+                selected.reverse()
+            if limit is not None:
+                selected = selected[:limit]
+            return [self.records[primaryKey] for primaryKey in selected]
+
+    @staticmethod
+    def isSortable(key):
+        """
+        Check whether a key may go in a sorted index.
+
+        @param key: the key
+        @return: C{False} if it is, or contains, C{None}
+        """
+        return key is not None and not (isinstance(key, tuple) and None in key)
+
+    def addToIndexes(self, primaryKey, record, changed):
+        """
+        Add a record to the indexes.
+
+        The caller must hold the C{indexLock}. If a value cannot be
+        indexed, the entries already added are removed again.
+
+        @param primaryKey: the primary key of the record
+        @param record: the record
+        @param changed: the set of fields changed, to only update the indexes on them; all indexes if C{None}
+        @raise TypeError: if a value cannot be indexed
+        """
+        hashed = []
+        ordered = []
+        try:
+            for fields, hashIndex in self.hashes.items():
+                if changed is None or not changed.isdisjoint(fields):
+                    key = self.indexKey(fields, record)
+                    hashIndex.setdefault(key, set()).add(primaryKey)
+                    hashed.append((hashIndex, key))
+            for fields, sortedIndex in self.sorted.items():
+                if changed is None or not changed.isdisjoint(fields):
+                    key = self.indexKey(fields, record)
+                    if self.isSortable(key):
+                        sortedIndex.add(key, primaryKey)
+                        ordered.append((sortedIndex, key))
+        except Exception:
+            for hashIndex, key in hashed:
+                self.discardFromHash(hashIndex, key, primaryKey)
+            for sortedIndex, key in ordered:
+                sortedIndex.remove(key, primaryKey)
+            raise
+
+    def removeFromIndexes(self, primaryKey, record, changed):
+        """
+        Remove a record from the indexes.
+
+        The caller must hold the C{indexLock}.
+
+        @param primaryKey: the primary key of the record
+        @param record: the record, as indexed
+        @param changed: the set of fields changed, to only update the indexes on them; all indexes if C{None}
+        """
+        for fields, hashIndex in self.hashes.items():
+            if changed is None or not changed.isdisjoint(fields):
+                self.discardFromHash(hashIndex, self.indexKey(fields, record), primaryKey)
+        for fields, sortedIndex in self.sorted.items():
+            if changed is None or not changed.isdisjoint(fields):
+                key = self.indexKey(fields, record)
+                if self.isSortable(key):
+                    sortedIndex.remove(key, primaryKey)
+
+    @staticmethod
+    def discardFromHash(hashIndex, key, primaryKey):
+        """
+        Remove a record from a hash index.
+
+        @param hashIndex: the dict of key to set of primary keys
+        @param key: the key of the record in the index
+        @param primaryKey: the primary key of the record
+        """
+        primaryKeys = hashIndex[key]
+        primaryKeys.discard(primaryKey)
+        if not primaryKeys:
+            del hashIndex[key]
@@ -0,0 +1,121 @@
+import sys
+import threading
+import unittest
+
+import puremvc.core
+import puremvc.patterns.observer
+import puremvc.patterns.proxy
+import utils.concurrency
+
+class ConcurrencyTest(unittest.TestCase):
+    """ConcurrencyTest: Test the core actors from many threads"""
+
+    THREADS = 8
+    ROUNDS = 200
+
+    def runThreads(self, target):
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def run(index):
+            try:
+                barrier.wait()
+                target(index)
+            except Exception as e:
+                errors.append(e)
+
+        # switch threads as often as possible to shake out races
+        switchInterval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=run, args=(i,)) for i in range(self.THREADS)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switchInterval)
+        self.assertEqual([], errors)
+
+    def testSingletonCreation(self):
+        """ConcurrencyTest: Test concurrent getInstance() creates and initializes a single instance"""
+        instances = []
+        self.runThreads(lambda index: instances.append(utils.concurrency.ConcurrencyTestView.getInstance()))
+
+        self.assertEqual(self.THREADS, len(instances))
+        self.assertEqual(1, len(set(id(instance) for instance in instances)))
+        self.assertEqual(1, utils.concurrency.ConcurrencyTestView.initializeCount)
+        self.assertEqual(True, instances[0].initialized)
+
+    def testRegisterRemoveAndNotifyMediators(self):
+        """ConcurrencyTest: Test registerMediator(), notifyObservers() and removeMediator() from many threads"""
+        view = puremvc.core.View.getInstance()
+
+        def hammer(index):
+            for i in range(self.ROUNDS):
+                mediator = utils.concurrency.ConcurrencyTestMediator('ConcurrencyTestMediator%d' % index, index)
+                view.registerMediator(mediator)
+
+                view.notifyObservers(puremvc.patterns.observer.Notification('ConcurrencyTestNote%d' % index))
+                view.notifyObservers(puremvc.patterns.observer.Notification('ConcurrencyTest.wildcard.%d' % index))
+                view.notifyObservers(puremvc.patterns.observer.Notification('ConcurrencyTestShared'))
+
+                self.assertEqual(True, view.removeMediator(mediator.getMediatorName()) is mediator)
+
+                # delivered exactly once while registered, never after removal
+                view.notifyObservers(puremvc.patterns.observer.Notification('ConcurrencyTestNote%d' % index))
+                self.assertEqual(1, mediator.counts.get('ConcurrencyTestNote%d' % index))
+                self.assertEqual(1, mediator.counts.get('ConcurrencyTest.wildcard.%d' % index))
+                # other threads broadcast the shared note too
+                self.assertEqual(True, mediator.counts.get('ConcurrencyTestShared') >= 1)
+
+        self.runThreads(hammer)
+
+        for index in range(self.THREADS):
+            self.assertEqual(False, view.hasMediator('ConcurrencyTestMediator%d' % index))
+            self.assertFalse('ConcurrencyTestNote%d' % index in view.observerMap)
+        self.assertFalse('ConcurrencyTestShared' in view.observerMap)
+        self.assertEqual({}, view.patternTrie)
+
+    def testRegisterRemoveAndExecuteCommands(self):
+        """ConcurrencyTest: Test registerCommand(), executeCommand() and removeCommand() from many threads"""
+        controller = puremvc.core.Controller.getInstance()
+        view = puremvc.core.View.getInstance()
+
+        def hammer(index):
+            name = 'ConcurrencyTestCommandNote%d' % index
+            for i in range(self.ROUNDS):
+                controller.registerCommand(name, utils.concurrency.ConcurrencyTestCommand)
+                controller.registerCommand('ConcurrencyTestSharedCommandNote', utils.concurrency.ConcurrencyTestCommand)
+
+                vo = []
+                view.notifyObservers(puremvc.patterns.observer.Notification(name, vo))
+                self.assertEqual([name], vo)
+
+                controller.removeCommand(name)
+                view.notifyObservers(puremvc.patterns.observer.Notification(name, vo))
+                self.assertEqual([name], vo)
+
+        self.runThreads(hammer)
+
+        # a single route for the name registered from every thread
+        self.assertTrue('ConcurrencyTestSharedCommandNote' in view.commandRoutes)
+        self.assertFalse('ConcurrencyTestSharedCommandNote' in view.observerMap)
+        controller.removeCommand('ConcurrencyTestSharedCommandNote')
+        self.assertFalse('ConcurrencyTestSharedCommandNote' in view.commandRoutes)
+
+    def testRegisterRetrieveAndRemoveProxies(self):
+        """ConcurrencyTest: Test registerProxy(), retrieveProxy() and removeProxy() from many threads"""
+        model = puremvc.core.Model.getInstance()
+        removed = []
+
+        def hammer(index):
+            for i in range(self.ROUNDS):
+                name = 'ConcurrencyTestProxy%d.%d' % (index, i)
+                model.registerProxy(puremvc.patterns.proxy.Proxy(name, i))
+                self.assertEqual(i, model.retrieveProxy(name).getData())
+                removed.append(model.removeProxy(name))
+                self.assertEqual(False, model.hasProxy(name))
+
+        self.runThreads(hammer)
+        self.assertEqual(self.THREADS * self.ROUNDS, len(set(id(proxy) for proxy in removed)))
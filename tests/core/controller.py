@@ -1,7 +1,16 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import sys
+import threading
+import time
 import unittest
 import puremvc.interfaces
 import puremvc.patterns.observer
 import puremvc.core
+import puremvc.patterns.command
+import puremvc.patterns.facade
 import utils.controller
 
 class ControllerTest(unittest.TestCase):
@@ -47,6 +56,30 @@ class ControllerTest(unittest.TestCase):
 
         self.assertEqual(True, vo.result == 0)
 
+    def testRegisterWildcardCommand(self):
+        """ControllerTest: Test registerCommand() with a wildcard pattern, notified of a concrete name"""
+        controller = puremvc.core.Controller.getInstance()
+        view = puremvc.core.View.getInstance()
+        controller.registerCommand('ControllerWildcardTest.*', utils.controller.ControllerTestCommand)
+
+        try:
+            for compiled in (False, True):
+                view.setCompiled(compiled)
+                vo = utils.controller.ControllerTestVO(12)
+                view.notifyObservers(puremvc.patterns.observer.Notification('ControllerWildcardTest.created', vo))
+                self.assertEqual(24, vo.result)
+
+                vo = utils.controller.ControllerTestVO(5)
+                view.notifyObserversBatch([puremvc.patterns.observer.Notification('ControllerWildcardTest.updated', vo)])
+                self.assertEqual(10, vo.result)
+        finally:
+            view.setCompiled(False)
+
+        controller.removeCommand('ControllerWildcardTest.*')
+        vo = utils.controller.ControllerTestVO(12)
+        view.notifyObservers(puremvc.patterns.observer.Notification('ControllerWildcardTest.created', vo))
+        self.assertEqual(0, vo.result)
+
     def testHasCommand(self):
         """ControllerTest: Test hasCommand()"""
 
@@ -58,3 +91,443 @@ class ControllerTest(unittest.TestCase):
         controller.removeCommand('hasCommandTest')
 
         self.assertEqual(False, controller.hasCommand('hasCommandTest'))
+
+    def testStatelessCommand(self):
+        """ControllerTest: Test a stateless command is instantiated once"""
+        controller = puremvc.core.Controller.getInstance()
+        controller.registerCommand('ControllerStatelessTest', utils.controller.ControllerTestStatelessCommand)
+
+        calls = []
+        for i in range(3):
+            controller.executeCommand(puremvc.patterns.observer.Notification('ControllerStatelessTest', calls))
+        controller.compileCommand('ControllerStatelessTest')(puremvc.patterns.observer.Notification('ControllerStatelessTest', calls))
+
+        self.assertEqual(4, len(calls))
+        self.assertEqual(1, len(set(map(id, calls))))
+        pool = controller.getCommandPool(utils.controller.ControllerTestStatelessCommand)
+        self.assertEqual(1, pool.created)
+
+        controller.removeCommand('ControllerStatelessTest')
+        self.assertEqual(None, controller.getCommandPool(utils.controller.ControllerTestStatelessCommand))
+
+        # replacing the class drops its pool once no other name uses it
+        controller.registerCommand('ControllerStatelessTest', utils.controller.ControllerTestStatelessCommand)
+        controller.registerCommand('ControllerStatelessTest2', utils.controller.ControllerTestStatelessCommand)
+        controller.registerCommand('ControllerStatelessTest', utils.controller.ControllerTestCommand)
+        self.assertNotEqual(None, controller.getCommandPool(utils.controller.ControllerTestStatelessCommand))
+        controller.registerCommand('ControllerStatelessTest2', utils.controller.ControllerTestCommand)
+        self.assertEqual(None, controller.getCommandPool(utils.controller.ControllerTestStatelessCommand))
+
+        controller.removeCommand('ControllerStatelessTest')
+        controller.removeCommand('ControllerStatelessTest2')
+
+    def testPooledCommand(self):
+        """ControllerTest: Test pooled commands are reused and reset between uses"""
+        controller = puremvc.core.Controller.getInstance()
+        controller.registerCommand('ControllerPooledTest', utils.controller.ControllerTestPooledCommand)
+        pool = controller.getCommandPool(utils.controller.ControllerTestPooledCommand)
+
+        calls = []
+        controller.executeCommand(puremvc.patterns.observer.Notification('ControllerPooledTest', calls, 'first'))
+        controller.executeCommand(puremvc.patterns.observer.Notification('ControllerPooledTest', calls, 'second'))
+        self.assertEqual([(calls[0][0], None), (calls[0][0], None)], calls)
+        self.assertEqual((1, 1), (pool.created, pool.reused))
+
+        # a nested execution gets an instance of its own
+        calls = []
+        controller.executeCommand(puremvc.patterns.observer.Notification('ControllerPooledTest', calls, 'nested'))
+        self.assertEqual(2, len(calls))
+        self.assertNotEqual(calls[0][0], calls[1][0])
+        self.assertEqual([None, None], [seen for command, seen in calls])
+        self.assertEqual(2, pool.created)
+        self.assertEqual(1, len(pool.instances))
+
+        controller.removeCommand('ControllerPooledTest')
+
+    def testProcessCommandWithoutPool(self):
+        """ControllerTest: Test a runInProcess command without a process pool runs in this process"""
+        controller = puremvc.core.Controller.getInstance()
+        controller.registerCommand('ControllerProcessTest', utils.controller.ControllerTestProcessCommand)
+
+        results = []
+        controller.view.registerObserver('ControllerProcessResult', puremvc.patterns.observer.Observer(results.append, self))
+        controller.executeCommand(puremvc.patterns.observer.Notification('ControllerProcessTest', 10))
+
+        self.assertEqual(1, len(results))
+        self.assertEqual((os.getpid(), 285), results[0].getBody())
+        self.assertEqual('ControllerProcessTest', results[0].getType())
+
+        controller.view.removeObserver('ControllerProcessResult', self)
+        controller.removeCommand('ControllerProcessTest')
+
+    def testProcessCommand(self):
+        """ControllerTest: Test a runInProcess command runs on the process pool and sends its result back"""
+        controller = puremvc.core.Controller.getInstance()
+        controller.registerCommand('ControllerProcessTest', utils.controller.ControllerTestProcessCommand)
+
+        results = []
+        done = threading.Semaphore(0)
+        def onResult(note):
+            results.append(note)
+            done.release()
+        controller.view.registerObserver('ControllerProcessResult', puremvc.patterns.observer.Observer(onResult, self))
+        controller.view.registerObserver('ControllerProcessError', puremvc.patterns.observer.Observer(onResult, self))
+
+        executor = concurrent.futures.ProcessPoolExecutor(1)
+        controller.setProcessPool(executor)
+        try:
+            controller.executeCommand(puremvc.patterns.observer.Notification('ControllerProcessTest', 10))
+            self.assertTrue(done.acquire(timeout=30))
+            controller.view.notifyObservers(puremvc.patterns.observer.Notification('ControllerProcessTest', -1))
+            self.assertTrue(done.acquire(timeout=30))
+        finally:
+            controller.setProcessPool(None)
+            executor.shutdown()
+
+        self.assertEqual(['ControllerProcessResult', 'ControllerProcessError'], [note.getName() for note in results])
+        pid, value = results[0].getBody()
+        self.assertNotEqual(os.getpid(), pid)
+        self.assertEqual(285, value)
+        self.assertTrue(isinstance(results[1].getBody(), ValueError))
+
+        controller.view.removeObserver('ControllerProcessResult', self)
+        controller.view.removeObserver('ControllerProcessError', self)
+        controller.removeCommand('ControllerProcessTest')
+
+    def testProcessCommandFailure(self):
+        """ControllerTest: Test a runInProcess command failing without an errorNotification logs the exception"""
+        controller = puremvc.core.Controller.getInstance()
+        controller.registerCommand('ControllerProcessTest', utils.controller.ControllerTestUnreportedProcessCommand)
+
+        executor = concurrent.futures.ThreadPoolExecutor(1)
+        controller.setProcessPool(executor)
+        try:
+            # hold the only worker, so the executions wait in the queue
+            release = threading.Event()
+            executor.submit(release.wait)
+            cancelled = controller.executeCommand(puremvc.patterns.observer.Notification('ControllerProcessTest', 10))
+            failed = controller.executeCommand(puremvc.patterns.observer.Notification('ControllerProcessTest', -1))
+            done = threading.Event()
+            failed.add_done_callback(lambda future: done.set())
+            self.assertTrue(cancelled.cancel())
+
+            with self.assertLogs('puremvc.core', 'ERROR') as logs:
+                release.set()
+                self.assertTrue(done.wait(5))
+        finally:
+            controller.setProcessPool(None)
+            executor.shutdown()
+
+        self.assertEqual(1, len(logs.records))
+        self.assertTrue(isinstance(logs.records[0].exc_info[1], ValueError))
+
+        controller.removeCommand('ControllerProcessTest')
+
+    def testRegisterCommandByImportPath(self):
+        """ControllerTest: Test registerCommand() with an import path, resolved on first executeCommand()"""
+        controller = puremvc.core.Controller.getInstance()
+        sys.modules.pop('utils.lazycommand', None)
+        controller.registerCommand('ControllerLazyTest', 'utils.lazycommand:LazyCommandTestCommand')
+
+        self.assertEqual(True, controller.hasCommand('ControllerLazyTest'))
+        self.assertEqual(False, 'utils.lazycommand' in sys.modules)
+
+        vo = utils.controller.ControllerTestVO(12)
+        controller.executeCommand(puremvc.patterns.observer.Notification('ControllerLazyTest', vo))
+
+        self.assertEqual(36, vo.result)
+        self.assertEqual(sys.modules['utils.lazycommand'].LazyCommandTestCommand, controller.commandMap['ControllerLazyTest'])
+
+        controller.removeCommand('ControllerLazyTest')
+
+    def testRegisterCommandByBadImportPath(self):
+        """ControllerTest: Test registerCommand() with an import path that cannot be resolved"""
+        controller = puremvc.core.Controller.getInstance()
+        self.assertRaises(ValueError, controller.registerCommand, 'ControllerLazyTest', 'utils.lazycommand')
+
+        note = puremvc.patterns.observer.Notification('ControllerLazyTest', utils.controller.ControllerTestVO(12))
+        controller.registerCommand('ControllerLazyTest', 'utils.lazycommand:MissingCommand')
+        self.assertRaises(ImportError, controller.executeCommand, note)
+        controller.registerCommand('ControllerLazyTest', 'utils.missingcommand:MissingCommand')
+        self.assertRaises(ImportError, controller.executeCommand, note)
+
+        controller.removeCommand('ControllerLazyTest')
+
+    def testAddCommand(self):
+        """ControllerTest: Test addCommand() executes several commands per name by priority"""
+        controller = puremvc.core.Controller.getInstance()
+        controller.registerCommand('ControllerMultiTest', utils.controller.ControllerTestAppendCommand)
+        controller.addCommand('ControllerMultiTest', utils.controller.ControllerTestStatelessAppendCommand, priority=10)
+        controller.addCommand('ControllerMultiTest', 'utils.controller:ControllerTestLateAppendCommand', priority=-1)
+
+        log = []
+        controller.view.notifyObservers(puremvc.patterns.observer.Notification('ControllerMultiTest', log))
+        self.assertEqual(['ControllerTestStatelessAppendCommand', 'ControllerTestAppendCommand', 'ControllerTestLateAppendCommand'], log)
+        self.assertEqual((utils.controller.ControllerTestStatelessAppendCommand, utils.controller.ControllerTestAppendCommand,
+                          utils.controller.ControllerTestLateAppendCommand), controller.commandMap['ControllerMultiTest'])
+
+        controller.addCommand('ControllerMultiTest', utils.controller.ControllerTestAppendCommand, priority=20)
+        hook = utils.controller.ControllerTestHook()
+        controller.addExecutionHook(hook)
+        log = []
+        controller.view.notifyObservers(puremvc.patterns.observer.Notification('ControllerMultiTest', log))
+        controller.removeExecutionHook(hook)
+        self.assertEqual(['ControllerTestAppendCommand', 'ControllerTestStatelessAppendCommand', 'ControllerTestLateAppendCommand'], log)
+        self.assertEqual([utils.controller.ControllerTestAppendCommand, utils.controller.ControllerTestStatelessAppendCommand,
+                          utils.controller.ControllerTestLateAppendCommand], [call[1] for call in hook.calls if call[0] == 'before'])
+
+        controller.removeCommand('ControllerMultiTest', utils.controller.ControllerTestStatelessAppendCommand)
+        self.assertEqual(None, controller.getCommandPool(utils.controller.ControllerTestStatelessAppendCommand))
+        controller.removeCommand('ControllerMultiTest', utils.controller.ControllerTestAppendCommand)
+        self.assertEqual(utils.controller.ControllerTestLateAppendCommand, controller.commandMap['ControllerMultiTest'])
+        log = []
+        controller.view.notifyObservers(puremvc.patterns.observer.Notification('ControllerMultiTest', log))
+        self.assertEqual(['ControllerTestLateAppendCommand'], log)
+
+        controller.addCommand('ControllerMultiTest', utils.controller.ControllerTestAppendCommand)
+        controller.registerCommand('ControllerMultiTest', utils.controller.ControllerTestStatelessAppendCommand)
+        self.assertEqual(utils.controller.ControllerTestStatelessAppendCommand, controller.commandMap['ControllerMultiTest'])
+
+        controller.removeCommand('ControllerMultiTest')
+        self.assertEqual(False, controller.hasCommand('ControllerMultiTest'))
+        self.assertEqual(False, 'ControllerMultiTest' in controller.commandPriorities)
+
+    def testMemoizedCommand(self):
+        """ControllerTest: Test memoized command results, LRU eviction and invalidation"""
+        controller = puremvc.core.Controller.getInstance()
+        controller.registerCommand('ControllerMemoTest', utils.controller.ControllerTestMemoCommand)
+        memo = controller.getCommandPool(utils.controller.ControllerTestMemoCommand).memo
+        utils.controller.ControllerTestMemoCommand.executions = 0
+
+        results = []
+        controller.view.registerObserver('ControllerMemoResult', puremvc.patterns.observer.Observer(results.append, self))
+        def send(body):
+            return controller.executeCommand(puremvc.patterns.observer.Notification('ControllerMemoTest', body))
+
+        self.assertEqual(3, send((1, 2)))
+        self.assertEqual(3, send((1, 2)))
+        self.assertEqual(7, send((3, 4)))
+        self.assertEqual(2, utils.controller.ControllerTestMemoCommand.executions)
+        self.assertEqual([3, 3, 7], [note.getBody() for note in results])
+
+        # the least recently used result is evicted
+        send((1, 2))
+        send((5, 6))
+        send((1, 2))
+        send((3, 4))
+        self.assertEqual(4, utils.controller.ControllerTestMemoCommand.executions)
+        self.assertEqual({'hits': 3, 'misses': 4, 'evictions': 2, 'invalidations': 0, 'size': 2}, memo.getStats())
+
+        # unhashable bodies are never cached
+        send([1, 2])
+        send([1, 2])
+        self.assertEqual(6, utils.controller.ControllerTestMemoCommand.executions)
+
+        controller.view.notifyObservers(puremvc.patterns.observer.Notification('ControllerMemoChanged'))
+        send((1, 2))
+        self.assertEqual(7, utils.controller.ControllerTestMemoCommand.executions)
+        self.assertEqual(1, memo.getStats()['invalidations'])
+
+        controller.view.removeObserver('ControllerMemoResult', self)
+        controller.removeCommand('ControllerMemoTest')
+        self.assertEqual(False, 'ControllerMemoChanged' in controller.view.observerMap)
+
+    def testMemoizedCommandKeyAndTTL(self):
+        """ControllerTest: Test memoized command results with a key function and a time to live"""
+        controller = puremvc.core.Controller.getInstance()
+        controller.registerCommand('ControllerMemoTTLTest', utils.controller.ControllerTestMemoTTLCommand)
+        def send(body):
+            return controller.executeCommand(puremvc.patterns.observer.Notification('ControllerMemoTTLTest', body))
+
+        self.assertEqual('a', send({'id': 1, 'value': 'a'}))
+        self.assertEqual('a', send({'id': 1, 'value': 'b'}))
+        time.sleep(0.1)
+        self.assertEqual('c', send({'id': 1, 'value': 'c'}))
+
+        controller.removeCommand('ControllerMemoTTLTest')
+
+    def testExecutionHook(self):
+        """ControllerTest: Test execution hooks around compiled, pooled and failing commands"""
+        controller = puremvc.core.Controller.getInstance()
+        controller.registerCommand('ControllerHookTest', utils.controller.ControllerTestProfiledCommand)
+        hook = utils.controller.ControllerTestHook()
+        commandClassRef = utils.controller.ControllerTestProfiledCommand
+
+        controller.addExecutionHook(hook)
+        controller.view.notifyObservers(puremvc.patterns.observer.Notification('ControllerHookTest'))
+        self.assertRaises(ValueError, controller.view.notifyObservers,
+                          puremvc.patterns.observer.Notification('ControllerHookTest', 'fail'))
+        self.assertEqual(('before', commandClassRef, 'ControllerHookTest'), hook.calls[0])
+        self.assertEqual(('after', commandClassRef, 1, None), hook.calls[1])
+        self.assertEqual(3, hook.calls[3][2])
+        self.assertTrue(isinstance(hook.calls[3][3], ValueError))
+
+        controller.removeExecutionHook(hook)
+        self.assertEqual(None, controller.executionHooks)
+        controller.view.notifyObservers(puremvc.patterns.observer.Notification('ControllerHookTest'))
+        self.assertEqual(4, len(hook.calls))
+        self.assertEqual(controller.getCommandPool(commandClassRef).shared.execute,
+                         controller.view.commandRoutes['ControllerHookTest'])
+
+        controller.removeCommand('ControllerHookTest')
+
+    def testCommandProfiler(self):
+        """ControllerTest: Test profiling commands and macro commands"""
+        controller = puremvc.core.Controller.getInstance()
+        controller.registerCommand('ControllerProfileTest', utils.controller.ControllerTestProfiledMacroCommand)
+        profiler = puremvc.core.CommandProfiler(trackAllocations=True)
+        profiler.start()
+        controller.addExecutionHook(profiler)
+
+        controller.executeCommand(puremvc.patterns.observer.Notification('ControllerProfileTest'))
+        controller.executeCommand(puremvc.patterns.observer.Notification('ControllerProfileTest'))
+        controller.removeExecutionHook(profiler)
+        profiler.stop()
+
+        report = profiler.getReport()
+        macro = report['utils.controller.ControllerTestProfiledMacroCommand']
+        command = report['utils.controller.ControllerTestProfiledCommand']
+        self.assertEqual(2, macro['calls'])
+        self.assertEqual(4, command['calls'])
+        self.assertEqual(0, command['errors'])
+        self.assertTrue(command['maxTime'] >= 0.01)
+        self.assertTrue(command['totalTime'] >= 0.04)
+        self.assertTrue(macro['totalTime'] >= command['totalTime'])
+        self.assertTrue(macro['selfTime'] < 0.01)
+        self.assertEqual(report, json.loads(profiler.toJSON()))
+
+        profiler.reset()
+        self.assertEqual({}, profiler.getReport())
+        controller.removeCommand('ControllerProfileTest')
+
+    def testAsyncCommand(self):
+        """ControllerTest: Test AsyncCommands are tracked, timed out and cancelled by the Controller"""
+        controller = puremvc.core.Controller.getInstance()
+        self.assertRaises(ValueError, controller.registerCommand, 'ControllerAsyncTest', utils.controller.ControllerTestMemoAsyncCommand)
+        self.assertEqual(False, controller.hasCommand('ControllerAsyncTest'))
+        controller.registerCommand('ControllerAsyncTest', utils.controller.ControllerTestAsyncCommand)
+        outcomes = []
+        sent = threading.Semaphore(0)
+        def onOutcome(note):
+            outcomes.append((note.getName(), note.getBody(), note.getType()))
+            sent.release()
+        controller.view.registerObserver('ControllerAsyncResult', puremvc.patterns.observer.Observer(onOutcome, self))
+        controller.view.registerObserver('ControllerAsyncError', puremvc.patterns.observer.Observer(onOutcome, self))
+
+        future = controller.executeCommand(puremvc.patterns.observer.Notification('ControllerAsyncTest', 0))
+        self.assertEqual(0, future.result(5))
+        self.assertTrue(sent.acquire(timeout=5))
+        self.assertEqual(('ControllerAsyncResult', 0, 'ControllerAsyncTest'), outcomes[0])
+
+        future = controller.executeCommand(puremvc.patterns.observer.Notification('ControllerAsyncTest', 5))
+        self.assertEqual(1, len(controller.getPendingCommands(utils.controller.ControllerTestAsyncCommand)))
+        self.assertTrue(isinstance(future.exception(5), puremvc.patterns.command.CommandTimeoutError))
+        self.assertTrue(sent.acquire(timeout=5))
+        self.assertEqual('ControllerAsyncError', outcomes[1][0])
+        self.assertEqual([], controller.getPendingCommands())
+
+        future = controller.executeCommand(puremvc.patterns.observer.Notification('ControllerAsyncTest', 5))
+        self.assertEqual(1, controller.cancelPendingCommands())
+        self.assertEqual(True, future.cancelled())
+        self.assertEqual([], controller.getPendingCommands())
+        self.assertEqual(2, len(outcomes))
+
+        controller.view.removeObserver('ControllerAsyncResult', self)
+        controller.view.removeObserver('ControllerAsyncError', self)
+        controller.removeCommand('ControllerAsyncTest')
+
+    def testAsyncCommandFailure(self):
+        """ControllerTest: Test an AsyncCommand failing without an errorNotification logs the exception"""
+        controller = puremvc.core.Controller.getInstance()
+        controller.registerCommand('ControllerAsyncTest', utils.controller.ControllerTestUnreportedAsyncCommand)
+
+        with self.assertLogs('puremvc.core', 'ERROR') as logs:
+            future = controller.executeCommand(puremvc.patterns.observer.Notification('ControllerAsyncTest', 5))
+            done = threading.Event()
+            future.add_done_callback(lambda future: done.set())
+            self.assertTrue(done.wait(5))
+
+        self.assertEqual(1, len(logs.records))
+        self.assertTrue(isinstance(logs.records[0].exc_info[1], puremvc.patterns.command.CommandTimeoutError))
+
+        controller.removeCommand('ControllerAsyncTest')
+
+class AsyncControllerTest(unittest.TestCase):
+    """AsyncControllerTest: Test AsyncController Singleton"""
+
+    def testAssertIController(self):
+        """AsyncControllerTest: Test instance implements IController and is separate from the Controller"""
+        controller = puremvc.core.AsyncController.getInstance()
+        self.assertEqual(True, isinstance(controller, puremvc.interfaces.IController))
+        self.assertEqual(True, controller is puremvc.core.AsyncController.getInstance())
+        self.assertEqual(False, controller is puremvc.core.Controller.getInstance())
+        self.assertEqual(True, controller.view is puremvc.core.AsyncView.getInstance())
+
+        # a new AsyncController does not create the View
+        view = puremvc.core.View.instance
+        puremvc.core.View.instance = None
+        puremvc.core.AsyncController.instance = None
+        try:
+            self.assertEqual(False, puremvc.core.AsyncController.getInstance() is controller)
+            self.assertEqual(None, puremvc.core.View.instance)
+        finally:
+            puremvc.core.View.instance = view
+            puremvc.core.AsyncController.instance = controller
+
+    def testRegisterAndExecuteCommand(self):
+        """AsyncControllerTest: Test registerCommand() and executeCommand() with coroutine and plain Commands"""
+        controller = puremvc.core.AsyncController.getInstance()
+        controller.registerCommand('AsyncControllerTest', utils.controller.AsyncControllerTestCommand)
+        controller.registerCommand('AsyncControllerSyncTest', utils.controller.ControllerTestCommand)
+
+        vo = utils.controller.ControllerTestVO(12)
+        asyncio.run(controller.executeCommand(puremvc.patterns.observer.Notification('AsyncControllerTest', vo)))
+        self.assertEqual(True, vo.result == 24)
+
+        vo = utils.controller.ControllerTestVO(5)
+        asyncio.run(controller.executeCommand(puremvc.patterns.observer.Notification('AsyncControllerSyncTest', vo)))
+        self.assertEqual(True, vo.result == 10)
+
+        controller.removeCommand('AsyncControllerTest')
+        controller.removeCommand('AsyncControllerSyncTest')
+        self.assertEqual(False, controller.hasCommand('AsyncControllerTest'))
+
+    def testAsyncCommand(self):
+        """AsyncControllerTest: Test executeCommand() awaits AsyncCommands and enforces their timeout"""
+        controller = puremvc.core.AsyncController.getInstance()
+        self.assertRaises(ValueError, controller.addCommand, 'AsyncControllerAsyncTest', utils.controller.ControllerTestMemoAsyncCommand)
+        controller.registerCommand('AsyncControllerAsyncTest', utils.controller.ControllerTestAsyncCommand)
+        outcomes = []
+        controller.view.registerObserver('ControllerAsyncResult', puremvc.patterns.observer.Observer(outcomes.append, self))
+        controller.view.registerObserver('ControllerAsyncError', puremvc.patterns.observer.Observer(outcomes.append, self))
+
+        self.assertEqual(0.01, asyncio.run(controller.executeCommand(puremvc.patterns.observer.Notification('AsyncControllerAsyncTest', 0.01))))
+        self.assertEqual(None, asyncio.run(controller.executeCommand(puremvc.patterns.observer.Notification('AsyncControllerAsyncTest', 5))))
+        self.assertEqual(['ControllerAsyncResult', 'ControllerAsyncError'], [note.getName() for note in outcomes])
+        self.assertTrue(isinstance(outcomes[1].getBody(), puremvc.patterns.command.CommandTimeoutError))
+        self.assertEqual([], controller.getPendingCommands())
+
+        controller.view.removeObserver('ControllerAsyncResult', self)
+        controller.view.removeObserver('ControllerAsyncError', self)
+        controller.removeCommand('AsyncControllerAsyncTest')
+
+    def testMacroCommandSubCommands(self):
+        """AsyncControllerTest: Test the sub-commands of macro commands bound to the AsyncFacade are seen by the AsyncController"""
+        controller = puremvc.core.AsyncController.getInstance()
+
+        future = utils.controller.AsyncControllerTestMacroCommand().execute(
+            puremvc.patterns.observer.Notification('AsyncControllerMacroTest', 5))
+        self.assertEqual(1, len(controller.getPendingCommands(utils.controller.ControllerTestAsyncCommand)))
+        self.assertEqual([], puremvc.core.Controller.getInstance().getPendingCommands())
+        self.assertTrue(isinstance(future.exception(5), puremvc.patterns.command.CommandTimeoutError))
+        self.assertEqual([], controller.getPendingCommands())
+
+        hook = utils.controller.ControllerTestHook()
+        command = utils.controller.ControllerTestProfiledMacroCommand()
+        command.facade = puremvc.patterns.facade.AsyncFacade.getInstance()
+        controller.addExecutionHook(hook)
+        try:
+            command.execute(puremvc.patterns.observer.Notification('AsyncControllerMacroTest'))
+        finally:
+            controller.removeExecutionHook(hook)
+        self.assertEqual(['before', 'after', 'before', 'after'], [call[0] for call in hook.calls])
@@ -1,3 +1,5 @@
+import threading
+import time
 import unittest
 
 import puremvc.interfaces
@@ -72,3 +74,77 @@ class ModelTest(unittest.TestCase):
         model.removeProxy(utils.model.ModelTestProxy.NAME)
 
         self.assertEqual(True, testProxy.getData() == utils.model.ModelTestProxy.ON_REMOVE_CALLED)
+
+    def testRegisterProxyFactory(self):
+        """ModelTest: Test registerProxyFactory() builds the proxy on first retrieveProxy()"""
+        model = puremvc.core.Model.getInstance()
+        utils.model.ModelTestLazyProxy.constructed = 0
+        model.registerProxyFactory(utils.model.ModelTestLazyProxy.NAME, utils.model.ModelTestLazyProxy)
+
+        self.assertEqual(True, model.hasProxy(utils.model.ModelTestLazyProxy.NAME))
+        self.assertEqual(0, utils.model.ModelTestLazyProxy.constructed)
+
+        testProxy = model.retrieveProxy(utils.model.ModelTestLazyProxy.NAME)
+        self.assertEqual(1000, len(testProxy.getData()))
+        self.assertEqual(True, testProxy is model.retrieveProxy(utils.model.ModelTestLazyProxy.NAME))
+        self.assertEqual(1, utils.model.ModelTestLazyProxy.constructed)
+
+        self.assertEqual(True, testProxy is model.removeProxy(utils.model.ModelTestLazyProxy.NAME))
+        self.assertEqual(None, testProxy.getData())
+        self.assertEqual(False, model.hasProxy(utils.model.ModelTestLazyProxy.NAME))
+
+        model.registerProxyFactory('ModelTestMisnamedProxy', utils.model.ModelTestLazyProxy)
+        self.assertRaises(ValueError, model.retrieveProxy, 'ModelTestMisnamedProxy')
+        self.assertEqual(None, model.removeProxy('ModelTestMisnamedProxy'))
+
+    def testProxyFactoryIdleEviction(self):
+        """ModelTest: Test evictIdleProxies() unloads proxies built by factories once idle"""
+        model = puremvc.core.Model.getInstance()
+        utils.model.ModelTestLazyProxy.constructed = 0
+        utils.model.ModelTestLazyProxy.removed = 0
+        model.registerProxyFactory(utils.model.ModelTestLazyProxy.NAME, utils.model.ModelTestLazyProxy, idleTimeout=0.05)
+
+        testProxy = model.retrieveProxy(utils.model.ModelTestLazyProxy.NAME)
+        self.assertEqual([], model.evictIdleProxies())
+        time.sleep(0.1)
+        self.assertEqual([utils.model.ModelTestLazyProxy.NAME], model.evictIdleProxies())
+        self.assertEqual(1, utils.model.ModelTestLazyProxy.removed)
+        self.assertEqual(None, testProxy.getData())
+        self.assertEqual(True, model.hasProxy(utils.model.ModelTestLazyProxy.NAME))
+
+        self.assertEqual(False, testProxy is model.retrieveProxy(utils.model.ModelTestLazyProxy.NAME))
+        factory = model.getProxyFactory(utils.model.ModelTestLazyProxy.NAME)
+        self.assertEqual((2, 1), (factory.loads, factory.evictions))
+
+        # retrieving any proxy sweeps idle ones, at most once per EVICTION_INTERVAL
+        model.registerProxy(puremvc.patterns.proxy.Proxy('ModelTestSweepProxy'))
+        model.EVICTION_INTERVAL = 0.05
+        try:
+            self.assertEqual([], model.evictIdleProxies())
+            time.sleep(0.1)
+            model.retrieveProxy('ModelTestSweepProxy')
+            self.assertEqual((2, 2), (factory.loads, factory.evictions))
+        finally:
+            del model.EVICTION_INTERVAL
+            model.removeProxy('ModelTestSweepProxy')
+
+        model.removeProxy(utils.model.ModelTestLazyProxy.NAME)
+
+    def testProxyFactoryConcurrentRetrieve(self):
+        """ModelTest: Test concurrent retrieveProxy() calls build a factory proxy once"""
+        model = puremvc.core.Model.getInstance()
+        utils.model.ModelTestLazyProxy.constructed = 0
+        model.registerProxyFactory(utils.model.ModelTestLazyProxy.NAME, utils.model.ModelTestLazyProxy)
+
+        proxies = []
+        def retrieve():
+            proxies.append(model.retrieveProxy(utils.model.ModelTestLazyProxy.NAME))
+        threads = [threading.Thread(target=retrieve) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, utils.model.ModelTestLazyProxy.constructed)
+        self.assertEqual(8, len([proxy for proxy in proxies if proxy is proxies[0] and proxy.getData() is not None]))
+        model.removeProxy(utils.model.ModelTestLazyProxy.NAME)
@@ -1,3 +1,6 @@
+import asyncio
+import concurrent.futures
+import time
 import unittest
 
 import puremvc.interfaces
@@ -231,3 +234,336 @@ class ViewTest(unittest.TestCase):
         self.assertTrue(self.NOTE5 in view.observerMap)
         view.notifyObservers(puremvc.patterns.observer.Notification(self.NOTE5))
         self.assertFalse(self.NOTE5 in view.observerMap)
+
+    def testRegisterObserverDuringNotify(self):
+        """ViewTest: Test observers registered during notifyObservers() are not notified until the next broadcast"""
+        view = puremvc.core.View.getInstance()
+
+        self.viewTestCalls = []
+        def lateMethod(note):
+            self.viewTestCalls.append('late')
+
+        def earlyMethod(note):
+            self.viewTestCalls.append('early')
+            view.registerObserver('ViewTestReentrantNote', puremvc.patterns.observer.Observer(lateMethod, lateMethod))
+
+        view.registerObserver('ViewTestReentrantNote', puremvc.patterns.observer.Observer(earlyMethod, self))
+        snapshot = view.observerMap['ViewTestReentrantNote']
+
+        view.notifyObservers(puremvc.patterns.observer.Notification('ViewTestReentrantNote'))
+
+        self.assertEqual(['early'], self.viewTestCalls)
+        self.assertEqual(1, len(snapshot))
+        self.assertEqual(2, len(view.observerMap['ViewTestReentrantNote']))
+
+        view.removeObserver('ViewTestReentrantNote', self)
+        view.removeObserver('ViewTestReentrantNote', lateMethod)
+        self.assertFalse('ViewTestReentrantNote' in view.observerMap)
+
+    def testRemoveMediatorKeepsOtherObservers(self):
+        """ViewTest: Test removeMediator() only removes the observers of that Mediator, preserving order"""
+        view = puremvc.core.View.getInstance()
+
+        self.viewTestCalls = []
+        def firstMethod(note):
+            self.viewTestCalls.append('first')
+
+        def lastMethod(note):
+            self.viewTestCalls.append('last')
+
+        view.registerObserver(self.NOTE5, puremvc.patterns.observer.Observer(firstMethod, firstMethod))
+        view.registerMediator(utils.view.ViewTestMediator5(self))
+        view.registerObserver(self.NOTE5, puremvc.patterns.observer.Observer(lastMethod, lastMethod))
+
+        self.counter = 0
+        view.notifyObservers(puremvc.patterns.observer.Notification(self.NOTE5))
+        self.assertEqual(['first', 'last'], self.viewTestCalls)
+        self.assertEqual(1, self.counter)
+
+        view.removeMediator(utils.view.ViewTestMediator5.NAME)
+        self.assertEqual(2, len(view.observerMap[self.NOTE5]))
+
+        self.viewTestCalls = []
+        view.notifyObservers(puremvc.patterns.observer.Notification(self.NOTE5))
+        self.assertEqual(['first', 'last'], self.viewTestCalls)
+        self.assertEqual(1, self.counter)
+
+        # removing an observer that was never registered is a no-op
+        view.removeObserver(self.NOTE5, self)
+        self.assertEqual(2, len(view.observerMap[self.NOTE5]))
+
+        view.removeObserver(self.NOTE5, firstMethod)
+        view.removeObserver(self.NOTE5, lastMethod)
+        self.assertFalse(self.NOTE5 in view.observerMap)
+        self.assertFalse(id(firstMethod) in view.contextMap)
+
+    def testCompiledDispatch(self):
+        """ViewTest: Test notifyObservers() with compiled dispatch plans"""
+        view = puremvc.core.View.getInstance()
+        controller = puremvc.core.Controller.getInstance()
+        view.setCompiled(True)
+        try:
+            self.assertEqual(True, view.isCompiled())
+
+            calls = []
+            def viewTestMethod(note):
+                note.getBody().append('observer')
+
+            controller.registerCommand('ViewTestCompiledNote', utils.view.ViewTestCommand)
+            view.registerObserver('ViewTestCompiledNote', puremvc.patterns.observer.Observer(viewTestMethod, self))
+
+            view.notifyObservers(puremvc.patterns.observer.Notification('ViewTestCompiledNote', calls))
+            self.assertEqual(['ViewTestCommand', 'observer'], calls)
+            self.assertEqual(True, 'ViewTestCompiledNote' in view.dispatchPlans)
+
+            # replacing the Command invalidates the plan
+            controller.registerCommand('ViewTestCompiledNote', utils.view.ViewTestCommand2)
+            self.assertEqual(False, 'ViewTestCompiledNote' in view.dispatchPlans)
+
+            calls = []
+            view.notifyObservers(puremvc.patterns.observer.Notification('ViewTestCompiledNote', calls))
+            self.assertEqual(['ViewTestCommand2', 'observer'], calls)
+
+            # so does removing an observer
+            view.removeObserver('ViewTestCompiledNote', self)
+            calls = []
+            view.notifyObservers(puremvc.patterns.observer.Notification('ViewTestCompiledNote', calls))
+            self.assertEqual(['ViewTestCommand2'], calls)
+
+            controller.removeCommand('ViewTestCompiledNote')
+            calls = []
+            view.notifyObservers(puremvc.patterns.observer.Notification('ViewTestCompiledNote', calls))
+            self.assertEqual([], calls)
+
+            # mediators removing themselves mid-dispatch keep working
+            view.registerMediator(utils.view.ViewTestMediator2(self))
+            view.registerMediator(utils.view.ViewTestMediator3(self))
+            view.notifyObservers(puremvc.patterns.observer.Notification(self.NOTE5))
+            self.assertFalse(self.NOTE5 in view.observerMap)
+            self.assertEqual(self.NOTE5, self.lastNotification)
+        finally:
+            view.setCompiled(False)
+
+        # plans for names nobody observes do not pile up
+        view.DISPATCH_CACHE_SIZE = 10
+        view.setCompiled(True)
+        try:
+            for i in range(25):
+                view.notifyObservers(puremvc.patterns.observer.Notification('ViewTestUnobserved%d' % i))
+            self.assertTrue(len(view.dispatchPlans) <= 10)
+        finally:
+            view.setCompiled(False)
+            del view.DISPATCH_CACHE_SIZE
+
+        self.assertEqual(False, view.isCompiled())
+
+    def testCommandRoutes(self):
+        """ViewTest: Test notifyObservers() with command routes before or after the observers"""
+        view = puremvc.core.View.getInstance()
+        controller = puremvc.core.Controller.getInstance()
+
+        def viewTestMethod(note):
+            note.getBody().append('observer')
+        view.registerObserver('ViewTestRouteNote', puremvc.patterns.observer.Observer(viewTestMethod, self))
+        controller.registerCommand('ViewTestRouteNote', utils.view.ViewTestCommand)
+        self.assertEqual(True, 'ViewTestRouteNote' in view.commandRoutes)
+        self.assertEqual(1, len(view.observerMap['ViewTestRouteNote']))
+
+        try:
+            for order, expected in ((view.COMMANDS_FIRST, ['ViewTestCommand', 'observer']),
+                                    (view.COMMANDS_LAST, ['observer', 'ViewTestCommand'])):
+                view.setCommandOrder(order)
+                for compiled in (False, True):
+                    view.setCompiled(compiled)
+                    calls = []
+                    view.notifyObservers(puremvc.patterns.observer.Notification('ViewTestRouteNote', calls))
+                    self.assertEqual(expected, calls)
+
+                    calls = []
+                    view.notifyObserversBatch([puremvc.patterns.observer.Notification('ViewTestRouteNote', calls)])
+                    self.assertEqual(expected, calls)
+        finally:
+            view.setCompiled(False)
+            view.setCommandOrder(view.COMMANDS_FIRST)
+
+        self.assertRaises(ValueError, view.setCommandOrder, 'middle')
+
+        controller.removeCommand('ViewTestRouteNote')
+        self.assertEqual(False, 'ViewTestRouteNote' in view.commandRoutes)
+        calls = []
+        view.notifyObservers(puremvc.patterns.observer.Notification('ViewTestRouteNote', calls))
+        self.assertEqual(['observer'], calls)
+
+        view.removeObserver('ViewTestRouteNote', self)
+
+    def testFanOutExecutor(self):
+        """ViewTest: Test notifyObservers() fanning observers out onto an executor"""
+        view = puremvc.core.View.getInstance()
+        executor = concurrent.futures.ThreadPoolExecutor(8)
+
+        calls = []
+        def slowMethod(note):
+            time.sleep(0.05)
+            calls.append(note.getBody())
+
+        def failingMethod(note):
+            raise ValueError(note.getBody())
+
+        contexts = [object() for i in range(8)]
+        for context in contexts:
+            view.registerObserver('ViewTestFanOutNote', puremvc.patterns.observer.Observer(slowMethod, context))
+        view.registerObserver('ViewTestFanOutNote', puremvc.patterns.observer.Observer(failingMethod, self))
+
+        view.setFanOutExecutor('ViewTestFanOutNote', executor)
+        try:
+            start = time.perf_counter()
+            report = view.notifyObservers(puremvc.patterns.observer.Notification('ViewTestFanOutNote', 1))
+            elapsed = time.perf_counter() - start
+
+            self.assertEqual([1] * 8, calls)
+            self.assertEqual(True, elapsed < 0.05 * 8 / 2)
+            self.assertEqual(9, len(report.timings))
+            self.assertEqual(True, report.hasErrors())
+            self.assertEqual(True, report.errors[0][1].args == (1,))
+
+            view.setFanOutExecutor('ViewTestFanOutNote', executor, False)
+            future = view.notifyObservers(puremvc.patterns.observer.Notification('ViewTestFanOutNote', 2))
+            report = future.result(5)
+            self.assertEqual([1] * 8 + [2] * 8, calls)
+            self.assertEqual(9, len(report.timings))
+
+            view.removeFanOutExecutor('ViewTestFanOutNote')
+            self.assertRaises(ValueError, view.notifyObservers, puremvc.patterns.observer.Notification('ViewTestFanOutNote', 3))
+            self.assertEqual([1] * 8 + [2] * 8 + [3] * 8, calls)
+        finally:
+            executor.shutdown()
+            for context in contexts:
+                view.removeObserver('ViewTestFanOutNote', context)
+            view.removeObserver('ViewTestFanOutNote', self)
+
+    def testWildcardSubscriptions(self):
+        """ViewTest: Test registerObserver() and notifyObservers() with wildcard patterns"""
+        view = puremvc.core.View.getInstance()
+        view.registerMediator(utils.view.ViewTestMediator6(self))
+
+        self.notifications = []
+        for name in ('order.created', 'order.shipped', 'order.line.added', 'order', 'audit', 'audit.login.failed', 'other'):
+            view.notifyObservers(puremvc.patterns.observer.Notification(name))
+
+        # 'order.created' matches both an exact name and a pattern but is delivered once
+        self.assertEqual(['order.created', 'order.shipped', 'audit', 'audit.login.failed'], self.notifications)
+        self.assertFalse('order.*' in view.observerMap)
+
+        # exact and wildcard observers are notified in registration order
+        def viewTestMethod(note):
+            self.notifications.append('exact')
+        view.registerObserver('order.shipped', puremvc.patterns.observer.Observer(viewTestMethod, self))
+
+        self.notifications = []
+        view.notifyObservers(puremvc.patterns.observer.Notification('order.shipped'))
+        self.assertEqual(['order.shipped', 'exact'], self.notifications)
+
+        view.removeMediator(utils.view.ViewTestMediator6.NAME)
+        self.assertEqual({}, view.patternTrie)
+
+        self.notifications = []
+        view.notifyObservers(puremvc.patterns.observer.Notification('order.shipped'))
+        view.notifyObservers(puremvc.patterns.observer.Notification('audit.login'))
+        self.assertEqual(['exact'], self.notifications)
+
+        view.removeObserver('order.shipped', self)
+
+        # an observer registered twice for a name is notified twice, whatever patterns exist
+        obsvr = puremvc.patterns.observer.Observer(viewTestMethod, self)
+        view.registerObserver('order.shipped', obsvr)
+        view.registerObserver('order.shipped', obsvr)
+        for pattern in (None, 'zz.*'):
+            if pattern is not None:
+                view.registerObserver(pattern, puremvc.patterns.observer.Observer(viewTestMethod, self))
+            self.notifications = []
+            view.notifyObservers(puremvc.patterns.observer.Notification('order.shipped'))
+            self.assertEqual(['exact', 'exact'], self.notifications)
+
+        view.removeObserver('zz.*', self)
+        view.removeObserver('order.shipped', self)
+        view.removeObserver('order.shipped', self)
+
+    def testWildcardSubscriptionsCompiled(self):
+        """ViewTest: Test wildcard patterns registered and removed with compiled dispatch"""
+        view = puremvc.core.View.getInstance()
+        view.setCompiled(True)
+        try:
+            self.notifications = []
+            view.notifyObservers(puremvc.patterns.observer.Notification('order.created'))
+
+            view.registerMediator(utils.view.ViewTestMediator6(self))
+            view.notifyObservers(puremvc.patterns.observer.Notification('order.created'))
+            view.notifyObservers(puremvc.patterns.observer.Notification('audit.x.y'))
+            self.assertEqual(['order.created', 'audit.x.y'], self.notifications)
+
+            view.removeMediator(utils.view.ViewTestMediator6.NAME)
+            view.notifyObservers(puremvc.patterns.observer.Notification('order.created'))
+            self.assertEqual(['order.created', 'audit.x.y'], self.notifications)
+        finally:
+            view.setCompiled(False)
+
+    def testMatchPatterns(self):
+        """ViewTest: Test matchPatterns()"""
+        view = puremvc.core.View.getInstance()
+        patterns = ('a.*', 'a.**', '*.b', '**.c', 'a.*.c', 'a.b.c')
+        for pattern in patterns:
+            view.addPattern(pattern)
+        try:
+            self.assertEqual(set(['a.*', 'a.**', '*.b']), view.matchPatterns('a.b'))
+            self.assertEqual(set(['a.**', '**.c', 'a.*.c', 'a.b.c']), view.matchPatterns('a.b.c'))
+            self.assertEqual(set(['a.**']), view.matchPatterns('a'))
+            self.assertEqual(set(['**.c']), view.matchPatterns('c'))
+            self.assertEqual(set(), view.matchPatterns('b.a'))
+        finally:
+            for pattern in patterns:
+                view.removePattern(pattern)
+        self.assertEqual({}, view.patternTrie)
+
+class AsyncViewTest(unittest.TestCase):
+    """AsyncViewTest: Test AsyncView Singleton"""
+
+    def setUp(self):
+        view = puremvc.core.AsyncView.getInstance()
+        view.registerMediator(utils.view.AsyncViewTestMediator('first', self, 0.02))
+        view.registerMediator(utils.view.AsyncViewTestMediator('second', self, 0))
+
+        self.calls = []
+        def asyncViewTestMethod(note):
+            note.getBody().append(('plain', None))
+        view.registerObserver('AsyncViewTestNote', puremvc.patterns.observer.Observer(asyncViewTestMethod, self))
+
+    def tearDown(self):
+        view = puremvc.core.AsyncView.getInstance()
+        view.removeMediator('first')
+        view.removeMediator('second')
+        view.removeObserver('AsyncViewTestNote', self)
+
+    def testAssertIView(self):
+        """AsyncViewTest: Test instance implements IView and is separate from the View"""
+        view = puremvc.core.AsyncView.getInstance()
+        self.assertEqual(True, isinstance(view, puremvc.interfaces.IView))
+        self.assertEqual(False, view is puremvc.core.View.getInstance())
+        self.assertEqual(False, 'AsyncViewTestNote' in puremvc.core.View.getInstance().observerMap)
+
+    def testSequentialNotify(self):
+        """AsyncViewTest: Test notifyObservers() awaiting each observer in turn"""
+        view = puremvc.core.AsyncView.getInstance()
+        asyncio.run(view.notifyObservers(puremvc.patterns.observer.Notification('AsyncViewTestNote', self.calls)))
+
+        self.assertEqual([('start', 'first'), ('end', 'first'),
+                          ('start', 'second'), ('end', 'second'),
+                          ('plain', None)], self.calls)
+
+    def testConcurrentNotify(self):
+        """AsyncViewTest: Test notifyObservers() awaiting all observers together"""
+        view = puremvc.core.AsyncView.getInstance()
+        asyncio.run(view.notifyObservers(puremvc.patterns.observer.Notification('AsyncViewTestNote', self.calls), True))
+
+        # plain observers run as they are notified, coroutines once they are all gathered
+        self.assertEqual([('plain', None), ('start', 'first'), ('start', 'second'),
+                          ('end', 'second'), ('end', 'first')], self.calls)
@@ -6,6 +6,7 @@ import sys
 sys.path.insert(1, "src")
 
 # Normal imports
+import core.concurrency
 import core.controller
 import core.model
 import core.view
@@ -19,12 +20,16 @@ import unittest
 
 if __name__ == '__main__':
     # List of test cases classes
-    testCases = (core.controller.ControllerTest,
+    testCases = (core.concurrency.ConcurrencyTest,
+                 core.controller.ControllerTest,
+                 core.controller.AsyncControllerTest,
                  core.model.ModelTest,
                  core.view.ViewTest,
+                 core.view.AsyncViewTest,
 
                  patterns.command.CommandTest,
                  patterns.facade.FacadeTest,
+                 patterns.facade.AsyncFacadeTest,
                  patterns.mediator.MediatorTest,
                  patterns.observer.ObserverTest,
                  patterns.proxy.ProxyTest)
@@ -1,5 +1,10 @@
+import asyncio
+import threading
+import time
 import unittest
 
+import puremvc.patterns.command
+import puremvc.patterns.facade
 import puremvc.patterns.observer
 import utils.command
 
@@ -17,6 +22,160 @@ class CommandTest(unittest.TestCase):
         self.assertEqual(True, vo.result1 == 10)
         self.assertEqual(True, vo.result2 == 25)
 
+    def testMacroCommandPlan(self):
+        """CommandTest: Test MacroCommand sub-commands are resolved once per class, nested macros inlined"""
+        MacroCommandTestOuterCommand = utils.command.MacroCommandTestOuterCommand
+        MacroCommandTestInnerCommand = utils.command.MacroCommandTestInnerCommand
+
+        calls = []
+        note = puremvc.patterns.observer.Notification('MacroCommandTest', calls)
+        for i in range(3):
+            MacroCommandTestOuterCommand().execute(note)
+        MacroCommandTestInnerCommand().execute(note)
+
+        self.assertEqual(1, MacroCommandTestInnerCommand.initializations)
+        self.assertEqual((MacroCommandTestInnerCommand, utils.command.MacroCommandTestAppendCommand, MacroCommandTestInnerCommand),
+                         MacroCommandTestOuterCommand().subCommands)
+        self.assertEqual(5, len(MacroCommandTestOuterCommand().plan[1]))
+        self.assertEqual(['MacroCommandTestAppendCommand'] * 3, [call for call in calls[:5] if isinstance(call, str)])
+        stateless = [call for call in calls if not isinstance(call, str)]
+        self.assertEqual(7, len(stateless))
+        self.assertEqual(1, len(set(map(id, stateless))))
+
+    def testMacroCommandWithoutPlan(self):
+        """CommandTest: Test MacroCommand instances with sub-commands of their own"""
+        calls = []
+        note = puremvc.patterns.observer.Notification('MacroCommandTest', calls)
+
+        command = utils.command.MacroCommandTestInnerCommand()
+        command.addSubCommand(utils.command.MacroCommandTestAppendCommand)
+        command.execute(note)
+        self.assertEqual(['MacroCommandTestAppendCommand', 'MacroCommandTestAppendCommand'],
+                         [call for call in calls if isinstance(call, str)])
+        self.assertEqual(2, len(utils.command.MacroCommandTestInnerCommand().subCommands))
+
+        calls[:] = []
+        utils.command.MacroCommandTestDynamicCommand().execute(note)
+        utils.command.MacroCommandTestDynamicCommand().execute(note)
+        self.assertEqual(['MacroCommandTestAppendCommand'] * 3, calls)
+
+    def testParallelMacroCommandExecute(self):
+        """CommandTest: Test ParallelMacroCommand execute() runs independent sub-commands concurrently"""
+        facade = puremvc.patterns.facade.Facade.getInstance()
+        completions = []
+        def onComplete(note):
+            completions.append((note.getBody(), note.getType()))
+        facade.view.registerObserver('ParallelMacroCommandTestComplete', puremvc.patterns.observer.Observer(onComplete, self))
+
+        vo = utils.command.ParallelMacroCommandTestVO()
+        note = puremvc.patterns.observer.Notification('ParallelMacroCommandTest', vo)
+        utils.command.ParallelMacroCommandTestCommand().execute(note)
+
+        self.assertEqual(['A', 'B', 'join'], sorted(vo.log[:2]) + vo.log[2:])
+        self.assertEqual([([], 'ParallelMacroCommandTest')], completions)
+
+        facade.view.removeObserver('ParallelMacroCommandTestComplete', self)
+
+    def testParallelMacroCommandErrors(self):
+        """CommandTest: Test ParallelMacroCommand aggregates failures and skips dependent sub-commands"""
+        facade = puremvc.patterns.facade.Facade.getInstance()
+        completions = []
+        def onComplete(note):
+            completions.append(note.getBody())
+        facade.view.registerObserver('ParallelMacroCommandTestComplete', puremvc.patterns.observer.Observer(onComplete, self))
+
+        vo = utils.command.ParallelMacroCommandTestVO(fail='A')
+        note = puremvc.patterns.observer.Notification('ParallelMacroCommandTest', vo)
+        try:
+            utils.command.ParallelMacroCommandTestCommand().execute(note)
+            self.fail("ParallelCommandError not raised")
+        except puremvc.patterns.command.ParallelCommandError as e:
+            self.assertEqual([utils.command.ParallelMacroCommandTestLoadACommand], [cls for cls, error in e.errors])
+            self.assertEqual([utils.command.ParallelMacroCommandTestJoinCommand], e.skipped)
+        self.assertEqual(['B'], vo.log)
+        self.assertEqual(1, len(completions))
+        self.assertTrue(isinstance(completions[0][0][1], ValueError))
+
+        self.assertRaises(ValueError, utils.command.ParallelMacroCommandTestCommand().addSubCommand,
+                          utils.command.ParallelMacroCommandTestJoinCommand, dependsOn=(utils.command.SimpleCommandTestCommand,))
+
+        facade.view.removeObserver('ParallelMacroCommandTestComplete', self)
+
+    def testParallelMacroCommandAsyncio(self):
+        """CommandTest: Test ParallelMacroCommand execute() with asyncio tasks"""
+        vo = utils.command.ParallelMacroCommandTestVO()
+        vo.barrier = threading.Barrier(1)
+        note = puremvc.patterns.observer.Notification('ParallelMacroCommandTest', vo)
+        async def executeCommand():
+            await utils.command.ParallelMacroCommandTestAsyncCommand().execute(note)
+        asyncio.run(executeCommand())
+
+        self.assertEqual(['async start', 'B', 'async end', 'join'], vo.log)
+
+        # with no event loop running, execute runs the tasks itself
+        vo = utils.command.ParallelMacroCommandTestVO()
+        vo.barrier = threading.Barrier(1)
+        note = puremvc.patterns.observer.Notification('ParallelMacroCommandTest', vo)
+        self.assertEqual(None, utils.command.ParallelMacroCommandTestAsyncCommand().execute(note))
+        self.assertEqual(['async start', 'B', 'async end', 'join'], vo.log)
+
+        vo = utils.command.ParallelMacroCommandTestVO()
+        vo.barrier = threading.Barrier(1)
+        note = puremvc.patterns.observer.Notification('ParallelMacroCommandTest', vo)
+        utils.command.ParallelMacroCommandTestNestedAsyncCommand().execute(note)
+        self.assertEqual(['async start', 'B', 'async end', 'join'], vo.log)
+
+    def testAsyncCommandExecute(self):
+        """CommandTest: Test AsyncCommand returns the future of its result"""
+        vo = utils.command.AsyncCommandTestVO(3)
+        future = utils.command.AsyncCommandTestCommand().execute(puremvc.patterns.observer.Notification('AsyncCommandTest', vo))
+        self.assertEqual(6, future.result(5))
+        self.assertEqual(['run'], vo.log)
+
+        future = utils.command.AsyncCommandTestTimerCommand().execute(puremvc.patterns.observer.Notification('AsyncCommandTest', vo))
+        self.assertEqual(4, future.result(5))
+
+        vo = utils.command.AsyncCommandTestVO(3, fail='x')
+        future = utils.command.AsyncCommandTestCommand().execute(puremvc.patterns.observer.Notification('AsyncCommandTest', vo))
+        self.assertTrue(isinstance(future.exception(5), ValueError))
+
+    def testAsyncCommandCancel(self):
+        """CommandTest: Test cancelling an AsyncCommand stops its work"""
+        vo = utils.command.AsyncCommandTestVO(3, delay=5)
+        command = utils.command.AsyncCommandTestCommand()
+        future = command.execute(puremvc.patterns.observer.Notification('AsyncCommandTest', vo))
+        self.assertEqual(True, command.cancel())
+        self.assertEqual(True, future.cancelled())
+        self.assertEqual(True, command.token.isCancelled())
+        self.assertEqual(False, command.complete(6))
+        self.assertRaises(puremvc.patterns.command.CommandCancelledError, command.token.raiseIfCancelled)
+
+        command = utils.command.AsyncCommandTestCommand()
+        future = command.execute(puremvc.patterns.observer.Notification('AsyncCommandTest', vo))
+        future.cancel()
+        self.assertEqual(True, command.token.isCancelled())
+
+    def testAsyncMacroCommand(self):
+        """CommandTest: Test AsyncMacroCommand waits for asynchronous sub-commands in turn"""
+        vo = utils.command.AsyncCommandTestVO(3)
+        future = utils.command.AsyncMacroCommandTestCommand().execute(puremvc.patterns.observer.Notification('AsyncMacroCommandTest', vo))
+        self.assertEqual(None, future.result(5))
+        self.assertEqual(['sync', 'run', 'sync'], vo.log)
+
+        vo = utils.command.AsyncCommandTestVO(3, delay=5)
+        command = utils.command.AsyncMacroCommandTestCommand()
+        future = command.execute(puremvc.patterns.observer.Notification('AsyncMacroCommandTest', vo))
+        self.assertEqual(['sync'], vo.log)
+        command.cancel()
+        self.assertEqual(True, future.cancelled())
+        time.sleep(0.05)
+        self.assertEqual(['sync'], [entry for entry in vo.log if entry != 'cancelled'])
+
+        vo = utils.command.AsyncCommandTestVO(3, fail='x')
+        future = utils.command.AsyncMacroCommandTestCommand().execute(puremvc.patterns.observer.Notification('AsyncMacroCommandTest', vo))
+        self.assertTrue(isinstance(future.exception(5), ValueError))
+        self.assertEqual(['sync'], vo.log)
+
     def testSimpleCommandExecute(self):
         """CommandTest: Test SimpleCommand execute()"""
 
@@ -1,9 +1,13 @@
+import asyncio
+import threading
 import unittest
 
+import puremvc.core
 import puremvc.interfaces
 import puremvc.patterns.proxy
 import puremvc.patterns.mediator
 import puremvc.patterns.facade
+import puremvc.patterns.observer
 import utils.facade
 
 class FacadeTest(unittest.TestCase):
@@ -121,3 +125,287 @@ class FacadeTest(unittest.TestCase):
         fcde.removeCommand('facadeHasCommandTest')
 
         self.assertEqual(False, fcde.hasCommand('facadeHasCommandTest'))
+
+    def testSendNotifications(self):
+        """FacadeTest: Test sendNotifications()"""
+        fcde = puremvc.patterns.facade.Facade.getInstance()
+        fcde.registerCommand('FacadeTestNote', utils.facade.FacadeTestCommand)
+        fcde.registerCommand('FacadeTestBatchNote', utils.facade.FacadeTestBatchCommand)
+        mediator = utils.facade.FacadeTestMediator(['FacadeTestNote', 'FacadeTestBatchNote'])
+        fcde.registerMediator(mediator)
+
+        vos = [utils.facade.FacadeTestVO(i) for i in range(3)]
+        calls = []
+        fcde.sendNotifications([('FacadeTestNote', vos[0]),
+                                ('FacadeTestNote', vos[1]),
+                                ('FacadeTestBatchNote', calls, 'a'),
+                                ('FacadeTestBatchNote', calls, 'b'),
+                                ('FacadeTestNote', vos[2])])
+
+        self.assertEqual([0, 2, 4], [vo.result for vo in vos])
+        self.assertEqual([('executeBatch', ['a', 'b'])], calls)
+        self.assertEqual([['FacadeTestNote', 'FacadeTestNote'],
+                          ['FacadeTestBatchNote', 'FacadeTestBatchNote'],
+                          ['FacadeTestNote']], mediator.batches)
+
+        fcde.removeMediator(utils.facade.FacadeTestMediator.NAME)
+        fcde.removeCommand('FacadeTestNote')
+        fcde.removeCommand('FacadeTestBatchNote')
+
+    def testSendNotificationsWithoutBatchHandlers(self):
+        """FacadeTest: Test sendNotifications() to observers handling one notification at a time"""
+        fcde = puremvc.patterns.facade.Facade.getInstance()
+
+        calls = []
+        def facadeTestMethod(note):
+            calls.append(note.getBody())
+        fcde.view.registerObserver('FacadeTestNote', puremvc.patterns.observer.Observer(facadeTestMethod, self))
+
+        fcde.sendNotifications((('FacadeTestNote', i) for i in range(3)))
+        self.assertEqual([0, 1, 2], calls)
+
+        fcde.view.removeObserver('FacadeTestNote', self)
+
+    def testQueuedBreadthFirst(self):
+        """FacadeTest: Test queued notifications are delivered breadth-first"""
+        fcde = puremvc.patterns.facade.Facade.getInstance()
+        mediator = utils.facade.FacadeTestQueueMediator({'Start': ['A', 'B'], 'A': ['A1'], 'B': ['B1']})
+        fcde.registerMediator(mediator)
+
+        fcde.setQueued(True)
+        try:
+            fcde.sendNotification('Start')
+        finally:
+            fcde.setQueued(False)
+        self.assertEqual(['Start', 'A', 'B', 'A1', 'B1'], mediator.handled)
+
+        mediator.handled = []
+        fcde.sendNotification('Start')
+        self.assertEqual(['Start', 'A', 'A1', 'B', 'B1'], mediator.handled)
+
+        fcde.removeMediator(utils.facade.FacadeTestQueueMediator.NAME)
+
+    def testQueuedPriority(self):
+        """FacadeTest: Test queued notifications are delivered by priority"""
+        fcde = puremvc.patterns.facade.Facade.getInstance()
+        mediator = utils.facade.FacadeTestQueueMediator({'Start': ['A', 'B', 'C']})
+        fcde.registerMediator(mediator)
+
+        fcde.setQueued(True)
+        fcde.setPriority('C', 10)
+        fcde.setPriority('A', -1)
+        try:
+            fcde.sendNotification('Start')
+        finally:
+            fcde.setPriority('C', None)
+            fcde.setPriority('A', None)
+            fcde.setQueued(False)
+        self.assertEqual(['Start', 'C', 'B', 'A'], mediator.handled)
+
+        fcde.removeMediator(utils.facade.FacadeTestQueueMediator.NAME)
+
+    def testQueuedFlush(self):
+        """FacadeTest: Test queued notifications wait for flush() without autoFlush"""
+        fcde = puremvc.patterns.facade.Facade.getInstance()
+        mediator = utils.facade.FacadeTestQueueMediator({'Start': ['A']})
+        fcde.registerMediator(mediator)
+
+        fcde.setQueued(True, autoFlush=False)
+        try:
+            fcde.sendNotification('Start')
+            fcde.sendNotification('B')
+            self.assertEqual([], mediator.handled)
+
+            fcde.flush()
+            self.assertEqual(['Start', 'B', 'A'], mediator.handled)
+        finally:
+            fcde.setQueued(False)
+
+        fcde.removeMediator(utils.facade.FacadeTestQueueMediator.NAME)
+
+    def testQueuedSendNotifications(self):
+        """FacadeTest: Test sendNotifications() from a handler of a queued notification is queued too"""
+        fcde = puremvc.patterns.facade.Facade.getInstance()
+
+        handled = []
+        def facadeTestMethod(note):
+            handled.append(note.getName())
+            if note.getName() == 'Start':
+                fcde.sendNotifications([('A',), ('B',), ('B',)])
+                handled.append('after-send')
+        for name in ('Start', 'A', 'B'):
+            fcde.view.registerObserver(name, puremvc.patterns.observer.Observer(facadeTestMethod, self))
+
+        fcde.setQueued(True)
+        fcde.setPriority('B', 1)
+        try:
+            fcde.sendNotification('Start')
+        finally:
+            fcde.setPriority('B', None)
+            fcde.setQueued(False)
+        self.assertEqual(['Start', 'after-send', 'B', 'B', 'A'], handled)
+
+        for name in ('Start', 'A', 'B'):
+            fcde.view.removeObserver(name, self)
+
+    def testQueuedMaxDepth(self):
+        """FacadeTest: Test a queued notification cascade deeper than maxDepth raises RuntimeError"""
+        fcde = puremvc.patterns.facade.Facade.getInstance()
+        mediator = utils.facade.FacadeTestQueueMediator({'Start': ['Start']})
+        fcde.registerMediator(mediator)
+
+        fcde.setQueued(True, maxDepth=5)
+        try:
+            self.assertRaises(RuntimeError, fcde.sendNotification, 'Start')
+            self.assertEqual(['Start'] * 6, mediator.handled)
+        finally:
+            fcde.setQueued(False, maxDepth=puremvc.patterns.facade.Facade.DEFAULT_MAX_DEPTH)
+
+        fcde.removeMediator(utils.facade.FacadeTestQueueMediator.NAME)
+
+    def testCoalescingWithinCycle(self):
+        """FacadeTest: Test coalescing notifications sent within one dispatch cycle"""
+        fcde = puremvc.patterns.facade.Facade.getInstance()
+        mediator = utils.facade.FacadeTestCoalesceMediator()
+        fcde.registerMediator(mediator)
+
+        fcde.setCoalescing('Changed', puremvc.patterns.facade.Facade.COALESCE_LAST)
+        fcde.setCoalescing('Merged', puremvc.patterns.facade.Facade.COALESCE_MERGE, lambda a, b: a + b)
+        fcde.setCoalescing('Counted', puremvc.patterns.facade.Facade.COALESCE_COUNT)
+        try:
+            fcde.sendNotification('Update', 3)
+            self.assertEqual([('Update', 3), ('Changed', 2), ('Merged', [0, 1, 2]), ('Counted', 3)],
+                             mediator.handled)
+
+            mediator.handled = []
+            fcde.beginCycle()
+            fcde.sendNotification('Changed', 'a', 'first')
+            fcde.sendNotification('Changed', 'b', 'second')
+            self.assertEqual([], mediator.handled)
+            fcde.endCycle()
+            self.assertEqual([('Changed', 'b')], mediator.handled)
+
+            self.assertEqual({'sent': 5, 'delivered': 2, 'saved': 3}, fcde.getCoalescingStats('Changed'))
+            self.assertEqual({'sent': 3, 'delivered': 1, 'saved': 2}, fcde.getCoalescingStats('Counted'))
+        finally:
+            fcde.setCoalescing('Changed', None)
+            fcde.setCoalescing('Merged', None)
+            fcde.setCoalescing('Counted', None)
+
+        mediator.handled = []
+        fcde.sendNotification('Update', 2)
+        self.assertEqual([('Update', 2), ('Changed', 0), ('Merged', [0]), ('Counted', None),
+                          ('Changed', 1), ('Merged', [1]), ('Counted', None)], mediator.handled)
+
+        fcde.removeMediator(utils.facade.FacadeTestCoalesceMediator.NAME)
+
+    def testCoalescingSendNotifications(self):
+        """FacadeTest: Test sendNotifications() coalesces the notifications set to be coalesced"""
+        fcde = puremvc.patterns.facade.Facade.getInstance()
+        mediator = utils.facade.FacadeTestCoalesceMediator()
+        fcde.registerMediator(mediator)
+
+        fcde.setCoalescing('Changed', puremvc.patterns.facade.Facade.COALESCE_LAST)
+        try:
+            fcde.sendNotifications([('Changed', 'a'), ('Merged', [0]), ('Changed', 'b')])
+            self.assertEqual([('Merged', [0]), ('Changed', 'b')], mediator.handled)
+            self.assertEqual({'sent': 2, 'delivered': 1, 'saved': 1}, fcde.getCoalescingStats('Changed'))
+        finally:
+            fcde.setCoalescing('Changed', None)
+
+        fcde.removeMediator(utils.facade.FacadeTestCoalesceMediator.NAME)
+
+    def testCoalescingWindow(self):
+        """FacadeTest: Test coalescing notifications sent within a time window"""
+        fcde = puremvc.patterns.facade.Facade.getInstance()
+        mediator = utils.facade.FacadeTestCoalesceMediator()
+        fcde.registerMediator(mediator)
+
+        fcde.setCoalescing('Changed', puremvc.patterns.facade.Facade.COALESCE_LAST, window=60)
+        try:
+            fcde.sendNotification('Changed', 'a')
+            fcde.sendNotification('Changed', 'b')
+            self.assertEqual([], mediator.handled)
+            self.assertEqual({'sent': 2, 'delivered': 0, 'saved': 1}, fcde.getCoalescingStats('Changed'))
+
+            fcde.flushCoalesced()
+            self.assertEqual([('Changed', 'b')], mediator.handled)
+
+            fcde.setCoalescing('Changed', puremvc.patterns.facade.Facade.COALESCE_LAST, window=0.01)
+            done = threading.Event()
+            mediator.handled = []
+            mediator.done = done
+            fcde.sendNotification('Changed', 'c')
+            fcde.sendNotification('Changed', 'd')
+            self.assertTrue(done.wait(5))
+            self.assertEqual([('Changed', 'd')], mediator.handled)
+        finally:
+            fcde.setCoalescing('Changed', None)
+
+        self.assertRaises(ValueError, fcde.setCoalescing, 'Changed', 'first')
+        self.assertRaises(ValueError, fcde.setCoalescing, 'Changed', puremvc.patterns.facade.Facade.COALESCE_MERGE)
+
+        fcde.removeMediator(utils.facade.FacadeTestCoalesceMediator.NAME)
+
+    def testProfiling(self):
+        """FacadeTest: Test profiling the commands executed for notifications"""
+        fcde = puremvc.patterns.facade.Facade.getInstance()
+        fcde.registerCommand('FacadeProfileTest', utils.facade.FacadeTestCommand)
+
+        self.assertEqual(None, fcde.getProfileReport())
+        profiler = fcde.startProfiling()
+        fcde.sendNotification('FacadeProfileTest', utils.facade.FacadeTestVO(2))
+        fcde.sendNotification('FacadeProfileTest', utils.facade.FacadeTestVO(3))
+        self.assertEqual(2, fcde.getProfileReport()['utils.facade.FacadeTestCommand']['calls'])
+
+        self.assertEqual(profiler, fcde.stopProfiling())
+        self.assertEqual(None, fcde.getProfileReport())
+        fcde.sendNotification('FacadeProfileTest', utils.facade.FacadeTestVO(4))
+        self.assertEqual(2, profiler.getReport()['utils.facade.FacadeTestCommand']['calls'])
+
+        fcde.removeCommand('FacadeProfileTest')
+
+class AsyncFacadeTest(unittest.TestCase):
+    """AsyncFacadeTest: Test AsyncFacade Pattern"""
+
+    def testAssertIFacade(self):
+        """AsyncFacadeTest: Test instance implements IFacade and uses the asyncio core"""
+        fcde = puremvc.patterns.facade.AsyncFacade.getInstance()
+        self.assertEqual(True, isinstance(fcde, puremvc.interfaces.IFacade))
+        self.assertEqual(False, fcde is puremvc.patterns.facade.Facade.getInstance())
+        self.assertEqual(True, fcde.controller is puremvc.core.AsyncController.getInstance())
+        self.assertEqual(True, fcde.view is puremvc.core.AsyncView.getInstance())
+        self.assertEqual(True, fcde.model is puremvc.core.Model.getInstance())
+
+    def testRegisterCommandAndSendNotification(self):
+        """AsyncFacadeTest: Test registerCommand() and concurrent sendNotification()s"""
+        fcde = puremvc.patterns.facade.AsyncFacade.getInstance()
+        fcde.registerCommand('AsyncFacadeTestNote', utils.facade.AsyncFacadeTestCommand)
+
+        vos = [utils.facade.FacadeTestVO(i) for i in range(100)]
+
+        async def sendAll():
+            await asyncio.gather(*[fcde.sendNotification('AsyncFacadeTestNote', vo) for vo in vos])
+        asyncio.run(sendAll())
+
+        self.assertEqual([2 * i for i in range(100)], [vo.result for vo in vos])
+        fcde.removeCommand('AsyncFacadeTestNote')
+
+    def testSendNotifications(self):
+        """AsyncFacadeTest: Test sendNotifications()"""
+        fcde = puremvc.patterns.facade.AsyncFacade.getInstance()
+        fcde.registerCommand('AsyncFacadeTestNote', utils.facade.AsyncFacadeTestCommand)
+
+        vos = [utils.facade.FacadeTestVO(i) for i in range(3)]
+        asyncio.run(fcde.sendNotifications([('AsyncFacadeTestNote', vo) for vo in vos]))
+
+        self.assertEqual([0, 2, 4], [vo.result for vo in vos])
+
+        # through a Notifier bound to the AsyncFacade
+        notifier = puremvc.patterns.observer.Notifier()
+        notifier.facade = fcde
+        vos = [utils.facade.FacadeTestVO(i) for i in range(3, 5)]
+        asyncio.run(notifier.sendNotifications([('AsyncFacadeTestNote', vo) for vo in vos]))
+
+        self.assertEqual([6, 8], [vo.result for vo in vos])
+        fcde.removeCommand('AsyncFacadeTestNote')
@@ -1,6 +1,14 @@
+import os
+import random
+import tempfile
+import threading
+import time
 import unittest
 
+import puremvc.patterns.facade
+import puremvc.patterns.observer
 import puremvc.patterns.proxy
+import utils.proxy
 
 class ProxyTest(unittest.TestCase):
     """ProxyTest: Test Proxy Pattern"""
@@ -45,3 +53,304 @@ class ProxyTest(unittest.TestCase):
             proxy = puremvc.patterns.proxy.Proxy("empty", value)
 
             self.assertEqual(proxy.data, value)
+
+    def testCachingProxyGet(self):
+        """ProxyTest: Test CachingProxy loads on a miss and evicts the least recently used entries"""
+        prxy = utils.proxy.CachingProxyTestProxy()
+        self.assertEqual(2, prxy.get(1))
+        self.assertEqual(2, prxy.get(1))
+        self.assertEqual(4, prxy.get(2))
+        self.assertEqual(6, prxy.get(3))
+        prxy.get(1)
+        self.assertEqual(8, prxy.get(4))
+        self.assertEqual([1, 2, 3, 4], prxy.calls)
+        self.assertEqual(False, prxy.contains(2))
+        self.assertEqual(True, prxy.contains(1))
+
+        self.assertRaises(KeyError, prxy.get, 'missing')
+        self.assertEqual(10, prxy.get(5, lambda key: key * 2))
+
+        stats = prxy.getCacheStats()
+        self.assertEqual((2, 6, 2, 1, 3), (stats['hits'], stats['misses'], stats['evictions'], stats['loadErrors'], stats['size']))
+        self.assertEqual(0.25, stats['hitRatio'])
+
+    def testCachingProxyBudgetAndTTL(self):
+        """ProxyTest: Test CachingProxy keeps within its byte budget and expires entries"""
+        prxy = utils.proxy.CachingProxyTestBudgetProxy('CachingProxyTestBudgetProxy')
+        prxy.get(40)
+        prxy.get(40)
+        prxy.get(50)
+        self.assertEqual(90, prxy.getCacheStats()['bytes'])
+        prxy.get(30)
+        self.assertEqual(False, prxy.contains(40))
+        self.assertEqual(80, prxy.getCacheStats()['bytes'])
+        prxy.get(200)
+        self.assertEqual((0, 0), (prxy.getCacheStats()['size'], prxy.getCacheStats()['bytes']))
+
+        prxy.ttl = 0.05
+        prxy.get(10)
+        time.sleep(0.1)
+        self.assertEqual(False, prxy.contains(10))
+        prxy.get(10)
+        self.assertEqual(1, prxy.getCacheStats()['expirations'])
+
+    def testCachingProxySingleFlight(self):
+        """ProxyTest: Test concurrent CachingProxy misses trigger a single load"""
+        prxy = utils.proxy.CachingProxyTestProxy()
+        prxy.gate = threading.Event()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(prxy.get(7))) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        while prxy.getCacheStats()['misses'] < 8:
+            time.sleep(0.001)
+        prxy.gate.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([7], prxy.calls)
+        self.assertEqual([14] * 8, results)
+
+    def testCachingProxyInvalidation(self):
+        """ProxyTest: Test CachingProxy entries are invalidated by notifications"""
+        facade = puremvc.patterns.facade.Facade.getInstance()
+        prxy = utils.proxy.CachingProxyTestProxy()
+        facade.registerProxy(prxy)
+        prxy.get(1)
+        prxy.get(2)
+
+        facade.sendNotification('CachingProxyTestChanged', 1)
+        self.assertEqual((False, True), (prxy.contains(1), prxy.contains(2)))
+        facade.sendNotification('CachingProxyTestChanged')
+        self.assertEqual(False, prxy.contains(2))
+        self.assertEqual(2, prxy.getCacheStats()['invalidations'])
+
+        facade.removeProxy(utils.proxy.CachingProxyTestProxy.NAME)
+        prxy.get(1)
+        facade.sendNotification('CachingProxyTestChanged')
+        self.assertEqual(True, prxy.contains(1))
+
+    def testMmapProxy(self):
+        """ProxyTest: Test MmapProxy appends records and hands out zero-copy slices"""
+        facade = puremvc.patterns.facade.Facade.getInstance()
+        changes = []
+        facade.view.registerObserver('MmapProxyTestChanged', puremvc.patterns.observer.Observer(changes.append, self))
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'records.bin')
+
+        prxy = utils.proxy.MmapProxyTestProxy(utils.proxy.MmapProxyTestProxy.NAME, path, writable=True)
+        facade.registerProxy(prxy)
+        self.assertEqual(0, prxy.getRecordCount())
+        self.assertEqual(0, len(prxy.getData()))
+
+        self.assertEqual((0, 3), prxy.appendRecords([(i, i * i, i / 2) for i in range(3)]))
+        before = prxy.getRecords()
+        self.assertEqual((3, 5), prxy.appendRecords([(i, i * i, i / 2) for i in range(3, 5)]))
+        self.assertEqual([(0, 3, 'MmapProxyTestProxy'), (3, 5, 'MmapProxyTestProxy')],
+                         [note.getBody() + (note.getType(),) for note in changes])
+
+        self.assertEqual(5, prxy.getRecordCount())
+        self.assertEqual(3 * prxy.getRecordSize(), len(before))
+        self.assertEqual((4, 16, 2.0), prxy.getRecord(-1))
+        self.assertEqual([(2, 4, 1.0), (3, 9, 1.5)], list(prxy.iterRecords(2, 4)))
+        self.assertEqual(True, prxy.getRecords(1, 2).readonly)
+
+        prxy.updateRecord(1, (1, 100, 0.0))
+        self.assertEqual((1, 2), changes[-1].getBody())
+        self.assertEqual((1, 100, 0.0), prxy.getRecord(1))
+        self.assertRaises(IndexError, prxy.getRecord, 5)
+        prxy.updateRecord(-1, (4, 400, 0.0))
+        self.assertEqual((4, 5), changes[-1].getBody())
+        self.assertEqual((4, 400, 0.0), prxy.getRecord(4))
+        self.assertRaises(IndexError, prxy.updateRecord, -6, (0, 0, 0.0))
+        self.assertRaises(ValueError, prxy.setData, b'')
+
+        facade.removeProxy(utils.proxy.MmapProxyTestProxy.NAME)
+        del before
+        facade.view.removeObserver('MmapProxyTestChanged', self)
+
+        prxy = utils.proxy.MmapProxyTestProxy(utils.proxy.MmapProxyTestProxy.NAME, path)
+        self.assertEqual((5, (1, 100, 0.0)), (prxy.getRecordCount(), prxy.getRecord(1)))
+        self.assertRaises(ValueError, prxy.appendRecords, [(5, 25, 2.5)])
+        prxy.close()
+        self.assertRaises(ValueError, puremvc.patterns.proxy.MmapProxy, 'MmapProxyTest', path)
+        os.remove(path)
+        os.rmdir(directory)
+
+    @unittest.skipIf(puremvc.patterns.proxy.numpy is None, "NumPy is not installed")
+    def testColumnarProxyQuery(self):
+        """ProxyTest: Test ColumnarProxy filters, projects, sorts and ranks records"""
+        prxy = puremvc.patterns.proxy.ColumnarProxy('ColumnarProxyTest', utils.proxy.COLUMNAR_RECORDS)
+        self.assertEqual(6, prxy.getLength())
+        self.assertEqual(False, prxy.getColumn('price').flags.writeable)
+
+        result = prxy.query(where=[('region', '==', 'east'), ('price', '>', 10)], columns=['id', 'price'])
+        self.assertEqual(['id', 'price'], list(result))
+        self.assertEqual([2, 5], result['id'].tolist())
+
+        result = prxy.query(where=[('region', 'in', ('east', 'north'))], orderBy='price', descending=True, limit=2)
+        self.assertEqual([6, 5], result['id'].tolist())
+        self.assertEqual([1, 2, 3, 4], prxy.query(where=[('price', 'between', (5, 20))], orderBy='id')['id'].tolist())
+        self.assertEqual([1, 2], prxy.query(limit=2)['id'].tolist())
+        self.assertEqual([3], prxy.query(where=lambda columns: columns['price'] == 7.5)['id'].tolist())
+        self.assertRaises(ValueError, prxy.query, [('price', '~', 1)])
+
+        self.assertEqual([6, 5], prxy.topK('price', 2, columns=['id'])['id'].tolist())
+        self.assertEqual([1, 3], prxy.topK('price', 2, largest=False)['id'].tolist())
+        self.assertEqual([5, 2], prxy.topK('price', 5, where=[('region', '==', 'east')])['id'].tolist())
+
+        # the caller's arrays stay writable
+        price = puremvc.patterns.proxy.numpy.array([1.0, 2.0])
+        prxy.setData({'price': price})
+        self.assertEqual(False, prxy.getColumn('price').flags.writeable)
+        price[0] = 3.0
+        self.assertEqual(True, price.flags.writeable)
+
+    @unittest.skipIf(puremvc.patterns.proxy.numpy is None, "NumPy is not installed")
+    def testColumnarProxyAggregateAndAppend(self):
+        """ProxyTest: Test ColumnarProxy group-by aggregates and appended records"""
+        facade = puremvc.patterns.facade.Facade.getInstance()
+        changes = []
+        facade.view.registerObserver('ColumnarProxyTestChanged', puremvc.patterns.observer.Observer(changes.append, self))
+        prxy = utils.proxy.ColumnarProxyTestProxy(utils.proxy.COLUMNAR_RECORDS)
+
+        result = prxy.aggregate('region', {'n': ('id', 'count'), 'total': ('price', 'sum'), 'average': ('price', 'mean'),
+                                           'cheapest': ('price', 'min'), 'dearest': ('price', 'max')})
+        self.assertEqual(['east', 'north', 'west'], result['region'].tolist())
+        self.assertEqual([2, 1, 3], result['n'].tolist())
+        self.assertEqual([42.0, 40.0, 22.5], result['total'].tolist())
+        self.assertEqual([21.0, 40.0, 7.5], result['average'].tolist())
+        self.assertEqual([12.0, 40.0, 5.0], result['cheapest'].tolist())
+        self.assertEqual([30.0, 40.0, 10.0], result['dearest'].tolist())
+        result = prxy.aggregate('region', {'total': ('price', 'sum')}, where=[('price', '<', 20)])
+        self.assertEqual((['east', 'west'], [12.0, 22.5]), (result['region'].tolist(), result['total'].tolist()))
+        self.assertRaises(ValueError, prxy.aggregate, 'region', {'x': ('price', 'median')})
+
+        self.assertEqual((6, 8), prxy.appendRecords([{'id': 7, 'region': 'north', 'price': 1.0},
+                                                     {'id': 8, 'region': 'south', 'price': 2.0}]))
+        self.assertEqual([(6, 8)], [note.getBody() for note in changes])
+        self.assertEqual(8, prxy.getLength())
+        self.assertEqual([7], prxy.query(where=[('region', '==', 'north'), ('price', '<', 5)])['id'].tolist())
+        self.assertRaises(ValueError, prxy.appendRecords, [{'id': 9}])
+
+        facade.view.removeObserver('ColumnarProxyTestChanged', self)
+
+    def testIndexedProxyLookups(self):
+        """ProxyTest: Test IndexedProxy hash, sorted and composite index lookups"""
+        prxy = utils.proxy.IndexedProxyTestProxy(utils.proxy.INDEXED_RECORDS)
+        def ids(records):
+            return [record['id'] for record in records]
+
+        self.assertEqual([2, 4, 5], sorted(ids(prxy.find('region', 'east'))))
+        self.assertEqual([2, 5], sorted(ids(prxy.find(('region', 'status'), ('east', 'open')))))
+        self.assertEqual([], prxy.find('region', 'south'))
+        self.assertEqual([2, 4], ids(prxy.find('price', 12.0)))
+        self.assertRaises(ValueError, prxy.find, 'status', 'open')
+
+        self.assertEqual([3, 2, 4], ids(prxy.findRange('price', 6, 12)))
+        self.assertEqual([3], ids(prxy.findRange('price', 5, 12, includeLow=False, includeHigh=False)))
+        self.assertEqual([4, 2], ids(prxy.findRange('price', low=10, descending=True)))
+        self.assertEqual([1], ids(prxy.findRange('price', limit=1)))
+        self.assertEqual([2, 4], ids(prxy.findRange(('region', 'price'), ('east',), ('east',))))
+        self.assertEqual([1], ids(prxy.findRange(('region', 'price'), ('west',), ('west', 6))))
+        self.assertRaises(ValueError, prxy.findRange, 'region')
+        self.assertRaises(ValueError, prxy.setData, utils.proxy.INDEXED_RECORDS + [{'id': 1}])
+
+    def testIndexedProxyChanges(self):
+        """ProxyTest: Test IndexedProxy maintains its indexes and notifies each change"""
+        facade = puremvc.patterns.facade.Facade.getInstance()
+        changes = []
+        for name in ('IndexedProxyTestInserted', 'IndexedProxyTestUpdated', 'IndexedProxyTestDeleted'):
+            facade.view.registerObserver(name, puremvc.patterns.observer.Observer(changes.append, self))
+        prxy = utils.proxy.IndexedProxyTestProxy(utils.proxy.INDEXED_RECORDS)
+        def ids(records):
+            return sorted(record['id'] for record in records)
+
+        prxy.insert({'id': 6, 'region': 'north', 'status': 'open', 'price': 3.0})
+        self.assertRaises(ValueError, prxy.insert, {'id': 6})
+        self.assertEqual([6], ids(prxy.find('region', 'north')))
+        self.assertEqual([6, 1], [record['id'] for record in prxy.findRange('price', high=5)])
+
+        old = prxy.get(2)
+        new = prxy.update(2, {'region': 'north', 'price': 1.0})
+        self.assertEqual('east', old['region'])
+        self.assertEqual([2, 6], ids(prxy.find('region', 'north')))
+        self.assertEqual([4, 5], ids(prxy.find('region', 'east')))
+        self.assertEqual([2, 6], ids(prxy.find(('region', 'status'), ('north', 'open'))))
+        self.assertEqual([2, 6, 1], [record['id'] for record in prxy.findRange('price', high=5)])
+        self.assertEqual(True, new is prxy.update(2, {'price': 1.0}))
+        self.assertRaises(ValueError, prxy.update, 2, {'id': 7})
+
+        prxy.update(5, {'price': 20.0})
+        self.assertEqual([5], [record['id'] for record in prxy.findRange('price', low=15)])
+
+        self.assertEqual(6, prxy.delete(6)['id'])
+        self.assertRaises(KeyError, prxy.delete, 6)
+        self.assertEqual([2], ids(prxy.find('region', 'north')))
+        self.assertEqual([2, 1], [record['id'] for record in prxy.findRange('price', high=5)])
+
+        self.assertEqual(['IndexedProxyTestInserted', 'IndexedProxyTestUpdated', 'IndexedProxyTestUpdated', 'IndexedProxyTestDeleted'],
+                         [note.getName() for note in changes])
+        self.assertEqual((old, new), changes[1].getBody())
+        self.assertEqual('IndexedProxyTestProxy', changes[3].getType())
+
+        for name in ('IndexedProxyTestInserted', 'IndexedProxyTestUpdated', 'IndexedProxyTestDeleted'):
+            facade.view.removeObserver(name, self)
+
+    def testIndexedProxyRejectedValues(self):
+        """ProxyTest: Test IndexedProxy leaves its records and indexes unchanged for a value it cannot index"""
+        prxy = utils.proxy.IndexedProxyTestProxy(utils.proxy.INDEXED_RECORDS)
+        def ids(records):
+            return sorted(record['id'] for record in records)
+
+        self.assertRaises(TypeError, prxy.insert, {'id': 6, 'region': 'north', 'status': 'open', 'price': 'cheap'})
+        self.assertEqual(None, prxy.get(6))
+        self.assertEqual([], prxy.find('region', 'north'))
+        self.assertEqual([], prxy.find(('region', 'status'), ('north', 'open')))
+        self.assertRaises(TypeError, prxy.insert, {'id': 6, 'region': ['north'], 'price': 3.0})
+        self.assertEqual(None, prxy.get(6))
+        self.assertEqual([1, 3, 2, 4], [record['id'] for record in prxy.findRange('price')])
+
+        old = prxy.get(2)
+        self.assertRaises(TypeError, prxy.update, 2, {'region': 'north', 'price': 'cheap'})
+        self.assertEqual(True, old is prxy.get(2))
+        self.assertEqual([2, 4, 5], ids(prxy.find('region', 'east')))
+        self.assertEqual([], prxy.find('region', 'north'))
+        self.assertEqual([2, 4], ids(prxy.findRange(('region', 'price'), ('east',), ('east',))))
+        self.assertEqual([1, 3, 2, 4], [record['id'] for record in prxy.findRange('price')])
+
+        self.assertRaises(TypeError, prxy.setData, utils.proxy.INDEXED_RECORDS + [{'id': 6, 'region': {}}])
+        self.assertEqual(5, prxy.getLength())
+
+    def testSortedIndex(self):
+        """ProxyTest: Test SortedIndex splits and merges its buckets and finds ranges across them"""
+        class SmallSortedIndex(puremvc.patterns.proxy.SortedIndex):
+            BUCKET_SIZE = 2
+
+        generator = random.Random(7)
+        entries = sorted((generator.randrange(20), primaryKey) for primaryKey in range(30))
+        index = SmallSortedIndex(entries)
+        for primaryKey in range(30, 60):
+            entry = (generator.randrange(20), primaryKey)
+            index.add(*entry)
+            entries.append(entry)
+        for entry in generator.sample(entries, 40):
+            index.remove(*entry)
+            entries.remove(entry)
+        entries.sort()
+
+        self.assertEqual(len(entries), len(index))
+        self.assertTrue(max(len(bucket) for bucket in index.buckets) <= 4)
+        self.assertEqual([primaryKey for key, primaryKey in entries], index.range())
+        for low, high in ((3, 12), (0, 0), (5, 5), (12, 3), (19, 25), (-1, 2)):
+            self.assertEqual([primaryKey for key, primaryKey in entries if low <= key <= high], index.range(low, high))
+            self.assertEqual([primaryKey for key, primaryKey in entries if low < key < high],
+                             index.range(low, high, includeLow=False, includeHigh=False))
+
+        index = SmallSortedIndex()
+        for primaryKey, key in enumerate([('a', 1), ('b', 1), ('b', 2), ('b', 3), ('b', 4), ('b', 5), ('c', 1)]):
+            index.add(key, primaryKey)
+        self.assertEqual([1, 2, 3, 4, 5], index.range(('b',), ('b',)))
+        self.assertEqual([6], index.range(('b',), includeLow=False))
+        self.assertRaises(TypeError, index.add, 'b', 7)
+        self.assertEqual(7, len(index))
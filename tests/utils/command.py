@@ -1,3 +1,6 @@
+import asyncio
+import threading
+
 import puremvc.patterns.command
 
 class MacroCommandTestCommand(puremvc.patterns.command.MacroCommand):
@@ -36,3 +39,132 @@ class SimpleCommandTestVO(object):
 
     def __init__(self, input_):
         self.input = input_
+
+class MacroCommandTestInnerCommand(puremvc.patterns.command.MacroCommand):
+
+    cachePlan = True
+    initializations = 0
+
+    def initializeMacroCommand(self):
+        MacroCommandTestInnerCommand.initializations += 1
+        self.addSubCommand(MacroCommandTestAppendCommand)
+        self.addSubCommand(MacroCommandTestStatelessCommand)
+
+class MacroCommandTestOuterCommand(puremvc.patterns.command.MacroCommand):
+
+    cachePlan = True
+
+    def initializeMacroCommand(self):
+        self.addSubCommand(MacroCommandTestInnerCommand)
+        self.addSubCommand(MacroCommandTestAppendCommand)
+        self.addSubCommand(MacroCommandTestInnerCommand)
+
+class MacroCommandTestDynamicCommand(puremvc.patterns.command.MacroCommand):
+
+    count = 0
+
+    def initializeMacroCommand(self):
+        MacroCommandTestDynamicCommand.count += 1
+        for i in range(MacroCommandTestDynamicCommand.count):
+            self.addSubCommand(MacroCommandTestAppendCommand)
+
+class MacroCommandTestAppendCommand(puremvc.patterns.command.SimpleCommand):
+    def execute(self, note):
+        note.getBody().append(self.__class__.__name__)
+
+class MacroCommandTestStatelessCommand(puremvc.patterns.command.SimpleCommand):
+
+    stateless = True
+
+    def execute(self, note):
+        note.getBody().append(self)
+
+class ParallelMacroCommandTestCommand(puremvc.patterns.command.ParallelMacroCommand):
+
+    completeNotification = 'ParallelMacroCommandTestComplete'
+
+    def initializeMacroCommand(self):
+        self.addSubCommand(ParallelMacroCommandTestLoadACommand)
+        self.addSubCommand(ParallelMacroCommandTestLoadBCommand)
+        self.addSubCommand(ParallelMacroCommandTestJoinCommand,
+                           dependsOn=(ParallelMacroCommandTestLoadACommand, ParallelMacroCommandTestLoadBCommand))
+
+class ParallelMacroCommandTestLoadACommand(puremvc.patterns.command.SimpleCommand):
+    def execute(self, note):
+        vo = note.getBody()
+        # both loads must be running at once to get past the barrier
+        vo.barrier.wait()
+        if vo.fail == 'A':
+            raise ValueError('A')
+        vo.log.append('A')
+
+class ParallelMacroCommandTestLoadBCommand(puremvc.patterns.command.SimpleCommand):
+    def execute(self, note):
+        vo = note.getBody()
+        vo.barrier.wait()
+        vo.log.append('B')
+
+class ParallelMacroCommandTestJoinCommand(puremvc.patterns.command.SimpleCommand):
+    def execute(self, note):
+        vo = note.getBody()
+        vo.log.append('join')
+
+class ParallelMacroCommandTestAsyncCommand(puremvc.patterns.command.ParallelMacroCommand):
+
+    useAsyncio = True
+
+    def initializeMacroCommand(self):
+        self.addSubCommand(ParallelMacroCommandTestAsyncLoadCommand)
+        self.addSubCommand(ParallelMacroCommandTestLoadBCommand)
+        self.addSubCommand(ParallelMacroCommandTestJoinCommand, dependsOn=(ParallelMacroCommandTestAsyncLoadCommand,))
+
+class ParallelMacroCommandTestNestedAsyncCommand(puremvc.patterns.command.MacroCommand):
+    def initializeMacroCommand(self):
+        self.addSubCommand(ParallelMacroCommandTestAsyncCommand)
+
+class ParallelMacroCommandTestAsyncLoadCommand(puremvc.patterns.command.SimpleCommand):
+    async def execute(self, note):
+        vo = note.getBody()
+        vo.log.append('async start')
+        await asyncio.sleep(0.01)
+        vo.log.append('async end')
+
+class ParallelMacroCommandTestVO(object):
+
+    def __init__(self, fail=None):
+        self.barrier = threading.Barrier(2, timeout=5)
+        self.fail = fail
+        self.log = []
+
+class AsyncCommandTestCommand(puremvc.patterns.command.AsyncCommand):
+    def run(self, note):
+        vo = note.getBody()
+        if self.token.wait(vo.delay):
+            vo.log.append('cancelled')
+            return None
+        if vo.fail is not None:
+            raise ValueError(vo.fail)
+        vo.log.append('run')
+        return 2 * vo.input
+
+class AsyncCommandTestTimerCommand(puremvc.patterns.command.AsyncCommand):
+    def start(self, note):
+        threading.Timer(0.01, lambda: self.complete(note.getBody().input + 1)).start()
+
+class AsyncCommandTestLogCommand(puremvc.patterns.command.SimpleCommand):
+    def execute(self, note):
+        note.getBody().log.append('sync')
+
+class AsyncMacroCommandTestCommand(puremvc.patterns.command.AsyncMacroCommand):
+    def initializeMacroCommand(self):
+        self.addSubCommand(AsyncCommandTestLogCommand)
+        self.addSubCommand(AsyncCommandTestCommand)
+        self.addSubCommand(AsyncCommandTestLogCommand)
+
+class AsyncCommandTestVO(object):
+
+    def __init__(self, input_, delay=0, fail=None):
+        self.input = input_
+        self.delay = delay
+        self.fail = fail
+        self.log = []
@@ -0,0 +1,34 @@
+import puremvc.core
+import puremvc.interfaces
+import puremvc.patterns.command
+import puremvc.patterns.mediator
+
+class ConcurrencyTestView(puremvc.core.View):
+
+    instance = None
+    initializeCount = 0
+
+    def initializeView(self):
+        ConcurrencyTestView.initializeCount += 1
+        puremvc.core.View.initializeView(self)
+
+    @staticmethod
+    def getInstance():
+        return ConcurrencyTestView()
+
+class ConcurrencyTestMediator(puremvc.patterns.mediator.Mediator, puremvc.interfaces.IMediator):
+
+    def __init__(self, mediatorName, index):
+        puremvc.patterns.mediator.Mediator.__init__(self, mediatorName)
+        self.index = index
+        self.counts = {}
+
+    def listNotificationInterests(self):
+        return ['ConcurrencyTestNote%d' % self.index, 'ConcurrencyTest.*.%d' % self.index, 'ConcurrencyTestShared']
+
+    def handleNotification(self, notification):
+        self.counts[notification.getName()] = self.counts.get(notification.getName(), 0) + 1
+
+class ConcurrencyTestCommand(puremvc.patterns.command.SimpleCommand):
+    def execute(self, note):
+        note.getBody().append(note.getName())
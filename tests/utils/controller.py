@@ -1,4 +1,9 @@
+import asyncio
+import os
+import time
+
 import puremvc.patterns.command
+import puremvc.patterns.facade
 
 class ControllerTestCommand(puremvc.patterns.command.SimpleCommand):
 
@@ -13,3 +18,140 @@ class ControllerTestVO(object):
 
     def __init__(self, num=0):
         self.input = num
+
+class AsyncControllerTestCommand(puremvc.patterns.command.SimpleCommand):
+
+    async def execute(self, note):
+        vo = note.getBody()
+        await asyncio.sleep(0)
+        vo.result = 2 * vo.input
+
+class ControllerTestStatelessCommand(puremvc.patterns.command.SimpleCommand):
+
+    stateless = True
+
+    def execute(self, note):
+        note.getBody().append(self)
+
+class ControllerTestPooledCommand(puremvc.patterns.command.SimpleCommand):
+
+    poolSize = 1
+
+    def __init__(self):
+        puremvc.patterns.command.SimpleCommand.__init__(self)
+        self.seen = None
+
+    def execute(self, note):
+        calls = note.getBody()
+        calls.append((self, self.seen))
+        self.seen = note.getType()
+        if note.getType() == 'nested':
+            self.facade.sendNotification(note.getName(), calls, 'inner')
+
+    def reset(self):
+        self.seen = None
+
+class ControllerTestProcessCommand(puremvc.patterns.command.SimpleCommand):
+
+    runInProcess = True
+    resultNotification = 'ControllerProcessResult'
+    errorNotification = 'ControllerProcessError'
+
+    def execute(self, note):
+        if note.getBody() < 0:
+            raise ValueError(note.getBody())
+        return os.getpid(), sum(i * i for i in range(note.getBody()))
+
+class ControllerTestUnreportedProcessCommand(ControllerTestProcessCommand):
+
+    errorNotification = None
+
+class ControllerTestMemoCommand(puremvc.patterns.command.SimpleCommand):
+
+    memoize = True
+    memoSize = 2
+    memoInvalidatedBy = ('ControllerMemoChanged',)
+    resultNotification = 'ControllerMemoResult'
+    executions = 0
+
+    def execute(self, note):
+        ControllerTestMemoCommand.executions += 1
+        return sum(note.getBody())
+
+class ControllerTestMemoTTLCommand(puremvc.patterns.command.SimpleCommand):
+
+    memoize = True
+    memoTTL = 0.05
+
+    def memoKey(name, body, noteType):
+        return body['id']
+
+    def execute(self, note):
+        return note.getBody()['value']
+
+class ControllerTestProfiledCommand(puremvc.patterns.command.SimpleCommand):
+
+    stateless = True
+
+    def execute(self, note):
+        time.sleep(0.01)
+        if note.getBody() == 'fail':
+            raise ValueError(note.getBody())
+
+class ControllerTestProfiledMacroCommand(puremvc.patterns.command.MacroCommand):
+
+    def initializeMacroCommand(self):
+        self.addSubCommand(ControllerTestProfiledCommand)
+        self.addSubCommand(ControllerTestProfiledCommand)
+
+class ControllerTestHook(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def beforeExecute(self, commandClassRef, note):
+        self.calls.append(('before', commandClassRef, note.getName()))
+        return len(self.calls)
+
+    def afterExecute(self, commandClassRef, note, token, error):
+        self.calls.append(('after', commandClassRef, token, error))
+
+class ControllerTestAsyncCommand(puremvc.patterns.command.AsyncCommand):
+
+    timeout = 0.05
+    resultNotification = 'ControllerAsyncResult'
+    errorNotification = 'ControllerAsyncError'
+
+    def run(self, note):
+        if self.token.wait(note.getBody()):
+            return None
+        return note.getBody()
+
+class AsyncControllerTestMacroCommand(puremvc.patterns.command.AsyncMacroCommand):
+
+    def __init__(self):
+        puremvc.patterns.command.AsyncMacroCommand.__init__(self)
+        self.facade = puremvc.patterns.facade.AsyncFacade.getInstance()
+
+    def initializeMacroCommand(self):
+        self.addSubCommand(ControllerTestAsyncCommand)
+
+class ControllerTestUnreportedAsyncCommand(ControllerTestAsyncCommand):
+
+    errorNotification = None
+
+class ControllerTestMemoAsyncCommand(ControllerTestAsyncCommand):
+
+    memoize = True
+
+class ControllerTestAppendCommand(puremvc.patterns.command.SimpleCommand):
+
+    def execute(self, note):
+        note.getBody().append(self.__class__.__name__)
+
+class ControllerTestStatelessAppendCommand(ControllerTestAppendCommand):
+
+    stateless = True
+
+class ControllerTestLateAppendCommand(ControllerTestAppendCommand):
+    pass
@@ -1,3 +1,6 @@
+import asyncio
+
+import puremvc.patterns.mediator
 import puremvc.patterns.command
 
 class FacadeTestCommand(puremvc.patterns.command.SimpleCommand):
@@ -12,3 +15,72 @@ class FacadeTestVO(object):
 
     def __init__(self,input):
         self.input = input
+
+class FacadeTestBatchCommand(puremvc.patterns.command.SimpleCommand):
+    def execute(self, note):
+        note.getBody().append(('execute', note.getType()))
+
+    def executeBatch(self, notes):
+        notes[0].getBody().append(('executeBatch', [note.getType() for note in notes]))
+
+class FacadeTestMediator(puremvc.patterns.mediator.Mediator):
+
+    NAME = 'FacadeTestMediator'
+
+    def __init__(self, interests):
+        puremvc.patterns.mediator.Mediator.__init__(self, FacadeTestMediator.NAME)
+        self.interests = interests
+        self.batches = []
+
+    def listNotificationInterests(self):
+        return self.interests
+
+    def handleNotificationBatch(self, notes):
+        self.batches.append([note.getName() for note in notes])
+
+class FacadeTestQueueMediator(puremvc.patterns.mediator.Mediator):
+
+    NAME = 'FacadeTestQueueMediator'
+
+    def __init__(self, sends):
+        puremvc.patterns.mediator.Mediator.__init__(self, FacadeTestQueueMediator.NAME)
+        self.sends = sends
+        self.handled = []
+
+    def listNotificationInterests(self):
+        return ['Start', 'A', 'B', 'C', 'A1', 'B1']
+
+    def handleNotification(self, note):
+        self.handled.append(note.getName())
+        for name in self.sends.get(note.getName(), []):
+            self.sendNotification(name)
+
+class FacadeTestCoalesceMediator(puremvc.patterns.mediator.Mediator):
+
+    NAME = 'FacadeTestCoalesceMediator'
+
+    def __init__(self):
+        puremvc.patterns.mediator.Mediator.__init__(self, FacadeTestCoalesceMediator.NAME)
+        self.handled = []
+        self.done = None
+
+    def listNotificationInterests(self):
+        return ['Update', 'Changed', 'Merged', 'Counted']
+
+    def handleNotification(self, note):
+        if note.getName() == 'Update':
+            self.handled.append(('Update', note.getBody()))
+            for i in range(note.getBody()):
+                self.sendNotification('Changed', i)
+                self.sendNotification('Merged', [i])
+                self.sendNotification('Counted')
+        else:
+            self.handled.append((note.getName(), note.getBody()))
+            if self.done is not None:
+                self.done.set()
+
+class AsyncFacadeTestCommand(puremvc.patterns.command.SimpleCommand):
+    async def execute(self, note):
+        vo = note.getBody()
+        await asyncio.sleep(0.01)
+        vo.result = 2 * vo.input
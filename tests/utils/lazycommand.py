@@ -0,0 +1,7 @@
+import puremvc.patterns.command
+
+class LazyCommandTestCommand(puremvc.patterns.command.SimpleCommand):
+
+    def execute(self, note):
+        vo = note.getBody()
+        vo.result = 3 * vo.input
@@ -13,3 +13,20 @@ class ModelTestProxy(puremvc.patterns.proxy.Proxy):
 
     def onRemove(self):
         self.setData(ModelTestProxy.ON_REMOVE_CALLED)
+
+class ModelTestLazyProxy(puremvc.patterns.proxy.Proxy):
+    NAME = 'ModelTestLazyProxy'
+
+    constructed = 0
+    removed = 0
+
+    def __init__(self):
+        puremvc.patterns.proxy.Proxy.__init__(self, ModelTestLazyProxy.NAME)
+        ModelTestLazyProxy.constructed += 1
+
+    def onRegister(self):
+        self.setData(list(range(1000)))
+
+    def onRemove(self):
+        ModelTestLazyProxy.removed += 1
+        self.setData(None)
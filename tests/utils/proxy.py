@@ -0,0 +1,74 @@
+import puremvc.patterns.proxy
+
+class CachingProxyTestProxy(puremvc.patterns.proxy.CachingProxy):
+    NAME = 'CachingProxyTestProxy'
+
+    maxEntries = 3
+    invalidatedBy = ('CachingProxyTestChanged',)
+
+    def __init__(self):
+        puremvc.patterns.proxy.CachingProxy.__init__(self, CachingProxyTestProxy.NAME)
+        self.calls = []
+        self.gate = None
+
+    def load(self, key):
+        self.calls.append(key)
+        if self.gate is not None:
+            self.gate.wait(5)
+        if key == 'missing':
+            raise KeyError(key)
+        return key * 2
+
+class CachingProxyTestBudgetProxy(puremvc.patterns.proxy.CachingProxy):
+
+    maxEntries = None
+    maxBytes = 100
+
+    def sizeOf(self, key, value):
+        return len(value)
+
+    def load(self, key):
+        return 'x' * key
+
+class MmapProxyTestProxy(puremvc.patterns.proxy.MmapProxy):
+    NAME = 'MmapProxyTestProxy'
+
+    recordFormat = '<iid'
+    changedNotification = 'MmapProxyTestChanged'
+
+COLUMNAR_RECORDS = [
+    {'id': 1, 'region': 'west', 'price': 5.0},
+    {'id': 2, 'region': 'east', 'price': 12.0},
+    {'id': 3, 'region': 'west', 'price': 7.5},
+    {'id': 4, 'region': 'west', 'price': 10.0},
+    {'id': 5, 'region': 'east', 'price': 30.0},
+    {'id': 6, 'region': 'north', 'price': 40.0},
+]
+
+class ColumnarProxyTestProxy(puremvc.patterns.proxy.ColumnarProxy):
+    NAME = 'ColumnarProxyTestProxy'
+
+    changedNotification = 'ColumnarProxyTestChanged'
+
+    def __init__(self, data=None):
+        puremvc.patterns.proxy.ColumnarProxy.__init__(self, ColumnarProxyTestProxy.NAME, data)
+
+class IndexedProxyTestProxy(puremvc.patterns.proxy.IndexedProxy):
+    NAME = 'IndexedProxyTestProxy'
+
+    hashIndexes = ('region', ('region', 'status'))
+    sortedIndexes = ('price', ('region', 'price'))
+    insertedNotification = 'IndexedProxyTestInserted'
+    updatedNotification = 'IndexedProxyTestUpdated'
+    deletedNotification = 'IndexedProxyTestDeleted'
+
+    def __init__(self, data=None):
+        puremvc.patterns.proxy.IndexedProxy.__init__(self, IndexedProxyTestProxy.NAME, data)
+
+INDEXED_RECORDS = [
+    {'id': 1, 'region': 'west', 'status': 'open', 'price': 5.0},
+    {'id': 2, 'region': 'east', 'status': 'open', 'price': 12.0},
+    {'id': 3, 'region': 'west', 'status': 'closed', 'price': 7.5},
+    {'id': 4, 'region': 'east', 'status': 'closed', 'price': 12.0},
+    {'id': 5, 'region': 'east', 'status': 'open', 'price': None},
+]
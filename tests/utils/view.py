@@ -1,6 +1,9 @@
+import asyncio
+
 import puremvc.patterns.observer
 import puremvc.interfaces
 import puremvc.patterns.mediator
+import puremvc.patterns.command
 
 class ViewTestNote(puremvc.patterns.observer.Notification, puremvc.interfaces.INotification):
 
@@ -85,3 +88,40 @@ class ViewTestMediator5(puremvc.patterns.mediator.Mediator, puremvc.interfaces.I
 
     def handleNotification(self, notification):
         self.viewComponent.counter += 1
+
+class ViewTestCommand(puremvc.patterns.command.SimpleCommand):
+    def execute(self, notification):
+        notification.getBody().append('ViewTestCommand')
+
+class ViewTestCommand2(puremvc.patterns.command.SimpleCommand):
+    def execute(self, notification):
+        notification.getBody().append('ViewTestCommand2')
+
+class ViewTestMediator6(puremvc.patterns.mediator.Mediator, puremvc.interfaces.IMediator):
+
+    NAME = 'ViewTestMediator6'
+
+    def __init__(self, view):
+        puremvc.patterns.mediator.Mediator.__init__(self, ViewTestMediator6.NAME, view)
+
+    def listNotificationInterests(self):
+        return ['order.*', 'order.created', 'audit.**']
+
+    def handleNotification(self, notification):
+        self.viewComponent.notifications.append(notification.getName())
+
+class AsyncViewTestMediator(puremvc.patterns.mediator.Mediator, puremvc.interfaces.IMediator):
+
+    NAME = 'AsyncViewTestMediator'
+
+    def __init__(self, mediatorName, view, delay):
+        puremvc.patterns.mediator.Mediator.__init__(self, mediatorName, view)
+        self.delay = delay
+
+    def listNotificationInterests(self):
+        return ['AsyncViewTestNote']
+
+    async def handleNotification(self, notification):
+        notification.getBody().append(('start', self.mediatorName))
+        await asyncio.sleep(self.delay)
+        notification.getBody().append(('end', self.mediatorName))